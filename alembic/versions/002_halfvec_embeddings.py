@@ -0,0 +1,61 @@
+"""Store chunk embeddings as halfvec.
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-01-15
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import context, op
+
+from propertyrag.db.vector_index import configure_hnsw_params
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The index is bound to the column type, so rebuild it around the ALTER
+    op.execute("DROP INDEX IF EXISTS ix_chunks_embedding")
+    op.execute(
+        "ALTER TABLE chunks ALTER COLUMN embedding TYPE halfvec(1536) "
+        "USING embedding::halfvec(1536)"
+    )
+
+    # Sized for the chunks already stored unless HNSW_M / HNSW_EF_CONSTRUCTION are set
+    vector_count = (
+        0
+        if context.is_offline_mode()
+        else op.get_bind().scalar(sa.text("SELECT count(*) FROM chunks"))
+    )
+    params = configure_hnsw_params(vector_count)
+
+    op.execute("SET maintenance_work_mem = '2GB'")
+    op.execute(
+        f"""
+        CREATE INDEX ix_chunks_embedding ON chunks
+        USING hnsw (embedding halfvec_cosine_ops)
+        WITH (m = {params.m}, ef_construction = {params.ef_construction})
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_chunks_embedding")
+    op.execute(
+        "ALTER TABLE chunks ALTER COLUMN embedding TYPE vector(1536) "
+        "USING embedding::vector(1536)"
+    )
+
+    # Back to the IVFFlat index of the initial schema
+    op.execute(
+        """
+        CREATE INDEX ix_chunks_embedding ON chunks
+        USING ivfflat (embedding vector_cosine_ops)
+        WITH (lists = 100)
+        """
+    )
@@ -0,0 +1,44 @@
+"""Denormalize project_id onto chunks.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-01-22
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "chunks",
+        sa.Column(
+            "project_id",
+            sa.UUID(),
+            sa.ForeignKey("projects.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+
+    # Backfill from the owning document
+    op.execute(
+        """
+        UPDATE chunks SET project_id = d.project_id
+        FROM documents d
+        WHERE d.id = chunks.document_id AND d.project_id IS NOT NULL
+        """
+    )
+
+    op.create_index("ix_chunks_project_id", "chunks", ["project_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chunks_project_id")
+    op.drop_column("chunks", "project_id")
@@ -0,0 +1,42 @@
+"""Add a binary-quantized HNSW index on chunk embeddings.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-01-29
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import context, op
+
+from propertyrag.db.vector_index import configure_hnsw_params
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One bit per dimension (192 bytes per row) for the candidate stage;
+    # the expression must match the one in ChunkRepository.search_similar
+    vector_count = (
+        0
+        if context.is_offline_mode()
+        else op.get_bind().scalar(sa.text("SELECT count(*) FROM chunks"))
+    )
+    params = configure_hnsw_params(vector_count)
+
+    op.execute("SET maintenance_work_mem = '2GB'")
+    op.execute(
+        f"""
+        CREATE INDEX ix_chunks_embedding_bq ON chunks
+        USING hnsw ((binary_quantize(embedding)::bit(1536)) bit_hamming_ops)
+        WITH (m = {params.m}, ef_construction = {params.ef_construction})
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_chunks_embedding_bq")
@@ -0,0 +1,35 @@
+"""Add embedding cache keyed by content hash.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-02-05
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from pgvector.sqlalchemy import HALFVEC
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_cache",
+        sa.Column("model", sa.String(100), primary_key=True),
+        sa.Column("content_hash", sa.LargeBinary(), primary_key=True),
+        sa.Column("embedding", HALFVEC(1536), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("embedding_cache")
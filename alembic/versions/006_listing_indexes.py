@@ -0,0 +1,44 @@
+"""Composite indexes for ordered document and chunk listings.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-02-12
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Newest-first keyset pagination, per project and overall
+    op.create_index(
+        "ix_documents_project_created",
+        "documents",
+        ["project_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    op.create_index(
+        "ix_documents_created",
+        "documents",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    op.drop_index("ix_documents_project_id", table_name="documents")
+
+    # Chunks of a document in reading order
+    op.create_index("ix_chunks_document_chunk", "chunks", ["document_id", "chunk_index"])
+    op.drop_index("ix_chunks_document_id", table_name="chunks")
+
+
+def downgrade() -> None:
+    op.create_index("ix_chunks_document_id", "chunks", ["document_id"])
+    op.drop_index("ix_chunks_document_chunk", table_name="chunks")
+
+    op.create_index("ix_documents_project_id", "documents", ["project_id"])
+    op.drop_index("ix_documents_created", table_name="documents")
+    op.drop_index("ix_documents_project_created", table_name="documents")
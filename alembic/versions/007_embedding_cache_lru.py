@@ -0,0 +1,34 @@
+"""Track last use of cached embeddings for LRU eviction.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-02-19
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "embedding_cache",
+        sa.Column(
+            "last_used_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_embedding_cache_last_used", "embedding_cache", ["last_used_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_embedding_cache_last_used", table_name="embedding_cache")
+    op.drop_column("embedding_cache", "last_used_at")
@@ -0,0 +1,24 @@
+"""Store parsed document text for re-extraction.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2024-02-26
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("documents", sa.Column("full_text", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("documents", "full_text")
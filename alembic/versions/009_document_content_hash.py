@@ -0,0 +1,28 @@
+"""Store a hash of each PDF to skip re-ingesting identical uploads.
+
+Revision ID: 009
+Revises: 008
+Create Date: 2024-03-04
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("documents", sa.Column("content_hash", sa.LargeBinary(), nullable=True))
+    op.create_index(
+        "ix_documents_project_content_hash", "documents", ["project_id", "content_hash"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_project_content_hash", table_name="documents")
+    op.drop_column("documents", "content_hash")
@@ -0,0 +1,57 @@
+"""Default primary keys to time-ordered UUIDv7.
+
+Revision ID: 010
+Revises: 009
+Create Date: 2024-03-11
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables whose id column gets the database-side default
+TABLES = ("projects", "documents", "chunks", "extracted_data")
+
+
+def upgrade() -> None:
+    # Same layout as db.ids.uuid7: 48-bit millisecond timestamp, then random
+    # bits with the version (7) and variant set
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+        DECLARE
+            unix_ms bigint := floor(extract(epoch FROM clock_timestamp()) * 1000);
+        BEGIN
+            RETURN encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            PLACING substring(int8send(unix_ms) FROM 3)
+                            FROM 1 FOR 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid;
+        END
+        $$ LANGUAGE plpgsql VOLATILE
+        """
+    )
+
+    # Rows inserted outside the application are time-ordered too
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT uuid_generate_v7()")
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT")
+    op.execute("DROP FUNCTION IF EXISTS uuid_generate_v7()")
@@ -0,0 +1,30 @@
+"""Index extracted data with the jsonb_path_ops operator class.
+
+Revision ID: 011
+Revises: 010
+Create Date: 2024-03-12
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Smaller and faster for the containment (@>) lookups in find_by_data;
+    # the default jsonb_ops also indexes keys, which nothing queries by
+    op.execute("DROP INDEX IF EXISTS ix_extracted_data_data")
+    op.execute(
+        "CREATE INDEX ix_extracted_data_data ON extracted_data "
+        "USING gin (data jsonb_path_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_extracted_data_data")
+    op.execute("CREATE INDEX ix_extracted_data_data ON extracted_data USING gin (data)")
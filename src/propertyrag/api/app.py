@@ -11,7 +11,11 @@ from propertyrag.api.routes import documents, projects, query
 from propertyrag.api.schemas import HealthResponse
 from propertyrag.core.config import get_settings
 from propertyrag.core.logging import get_logger, setup_logging
+from propertyrag.core.openai_client import close_openai_client
 from propertyrag.db.session import engine
+from propertyrag.services.classifier import get_classifier
+from propertyrag.services.extractor import get_extractor
+from propertyrag.workers.ingest import fail_stale_documents
 
 logger = get_logger(__name__)
 
@@ -22,11 +26,21 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Startup
     setup_logging()
     logger.info("application_starting", version=__version__)
+    # Build the shared services up front so the first request doesn't pay for
+    # client and tokenizer setup (the extractor also builds the embedder)
+    get_classifier()
+    get_extractor()
+    # Ingestion jobs don't survive a restart, so settle the ones left behind
+    try:
+        await fail_stale_documents()
+    except Exception as e:
+        logger.error("stale_ingestion_sweep_failed", error=e)
 
     yield
 
     # Shutdown
     logger.info("application_stopping")
+    await close_openai_client()
     await engine.dispose()
 
 
@@ -39,18 +53,21 @@ def create_app() -> FastAPI:
         description="RAG system for real estate document analysis",
         version=__version__,
         lifespan=lifespan,
-        docs_url="/docs",
-        redoc_url="/redoc",
+        # Interactive docs and the OpenAPI schema are only served in debug mode
+        docs_url="/docs" if settings.debug else None,
+        redoc_url="/redoc" if settings.debug else None,
+        openapi_url="/openapi.json" if settings.debug else None,
     )
 
-    # CORS middleware
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],  # Configure appropriately for production
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
+    # CORS middleware, only needed for browser clients
+    if settings.debug or settings.cors_enabled:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=settings.cors_origins,
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
 
     # Include routers
     app.include_router(documents.router, prefix="/api/v1")
@@ -78,7 +95,7 @@ def create_app() -> FastAPI:
         return {
             "name": "PropertyRAG",
             "version": __version__,
-            "docs": "/docs",
+            "docs": app.docs_url,
         }
 
     return app
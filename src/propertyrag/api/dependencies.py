@@ -2,9 +2,13 @@
 
 from collections.abc import AsyncGenerator
 
+from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from propertyrag.db.session import async_session_maker
+from propertyrag.services.classifier import DocumentClassifier, get_classifier
+from propertyrag.services.embedder import Embedder, get_embedder
+from propertyrag.services.extractor import DataExtractor, get_extractor
 from propertyrag.services.ingestion import IngestionPipeline
 from propertyrag.services.rag import RAGService
 
@@ -20,15 +24,31 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             raise
 
 
-async def get_ingestion_pipeline(
-    session: AsyncSession,
+async def get_db_ro() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Yield a database session for read-only requests.
+
+    Nothing is committed: closing the session rolls back the transaction,
+    which skips the COMMIT round-trip and never assigns a transaction ID.
+    """
+    async with async_session_maker() as session:
+        yield session
+
+
+def get_ingestion_pipeline(
+    session: AsyncSession = Depends(get_db),
+    embedder: Embedder = Depends(get_embedder),
+    classifier: DocumentClassifier = Depends(get_classifier),
+    extractor: DataExtractor = Depends(get_extractor),
 ) -> IngestionPipeline:
-    """Get an ingestion pipeline instance."""
-    return IngestionPipeline(session)
+    """Get an ingestion pipeline instance built on the shared services."""
+    return IngestionPipeline(
+        session, embedder=embedder, classifier=classifier, extractor=extractor
+    )
 
 
-async def get_rag_service(
-    session: AsyncSession,
+def get_rag_service(
+    session: AsyncSession = Depends(get_db_ro),
 ) -> RAGService:
     """Get a RAG service instance."""
     return RAGService(session)
@@ -1,11 +1,28 @@
 """Document API routes."""
 
+import base64
+import hashlib
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    UploadFile,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from propertyrag.api.dependencies import get_db, get_ingestion_pipeline
+from propertyrag.api.dependencies import get_db, get_db_ro, get_ingestion_pipeline
 from propertyrag.api.schemas import (
     DocumentListResponse,
     DocumentResponse,
@@ -13,38 +30,104 @@ from propertyrag.api.schemas import (
     ExtractedDataResponse,
 )
 from propertyrag.core.models import DocumentType, ProcessingStatus
+from propertyrag.db.models import DocumentModel, ExtractedDataModel
 from propertyrag.db.repository import DocumentRepository, ExtractedDataRepository
-from propertyrag.services.ingestion import IngestionError, IngestionPipeline
+from propertyrag.services.ingestion import IngestionPipeline
+from propertyrag.services.qvcache import invalidate_on_commit
+from propertyrag.workers.ingest import ingest_document
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
 
+def _encode_cursor(created_at: datetime, document_id: UUID) -> str:
+    """Encode a keyset position as an opaque cursor string."""
+    raw = f"{created_at.isoformat()}|{document_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a cursor string back into a keyset position."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, document_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(document_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from e
+
+
+def _document_response(document: DocumentModel) -> DocumentResponse:
+    """Build a response from a stored row without re-validating its fields."""
+    return DocumentResponse.model_construct(
+        id=document.id,
+        filename=document.filename,
+        document_type=document.document_type,
+        status=document.status,
+        page_count=document.page_count,
+        project_id=document.project_id,
+        created_at=document.created_at,
+        updated_at=document.updated_at,
+    )
+
+
+def _extracted_data_response(extracted: ExtractedDataModel) -> ExtractedDataResponse:
+    """Build a response from a stored row without re-validating its fields."""
+    return ExtractedDataResponse.model_construct(
+        document_id=extracted.document_id,
+        document_type=extracted.document_type,
+        data=extracted.data,
+        extraction_confidence=extracted.extraction_confidence,
+        extracted_at=extracted.extracted_at,
+    )
+
+
+def _save_upload(fp: BinaryIO) -> tuple[Path, bytes]:
+    """Copy an upload to a temporary file that outlives the request, hashing it on the way."""
+    digest = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        while block := fp.read(1 << 20):
+            digest.update(block)
+            tmp.write(block)
+    return Path(tmp.name), digest.digest()
+
+
 @router.post(
     "/upload",
     response_model=DocumentUploadResponse,
-    status_code=status.HTTP_201_CREATED,
+    status_code=status.HTTP_202_ACCEPTED,
 )
 async def upload_document(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     document_type: DocumentType = Form(default=DocumentType.UNKNOWN),
     project_id: UUID | None = Form(default=None),
     auto_extract: bool = Form(default=True),
+    overwrite: bool = Form(default=False),
     session: AsyncSession = Depends(get_db),
 ) -> DocumentUploadResponse:
     """
     Upload a PDF document for processing.
 
-    The document will be:
+    The document is recorded as PENDING and the response is returned
+    immediately. In the background it will be:
     1. Parsed to extract text
     2. Classified (if type is UNKNOWN)
     3. Chunked and embedded
     4. Optionally: structured data extracted
 
+    Poll ``GET /documents/{id}`` for the final status (COMPLETED or FAILED).
+
+    A byte-identical PDF already ingested into the same project is not
+    processed again; its existing document is returned instead.
+
     Args:
         file: PDF file to upload.
         document_type: Type of document. If UNKNOWN, will be auto-classified.
         project_id: Optional project to associate with.
         auto_extract: Whether to extract structured data automatically.
+        overwrite: Process the upload even if an identical PDF exists.
 
     Returns:
         Upload response with document ID and status.
@@ -56,71 +139,98 @@ async def upload_document(
             detail="Only PDF files are supported",
         )
 
-    # Read file content
-    content = await file.read()
-    if not content:
+    if not file.size:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Empty file",
         )
 
-    # Process document
-    pipeline = await get_ingestion_pipeline(session)
+    # The spooled upload is closed with the request, so keep a copy for the worker
+    await file.seek(0)
+    file_path, content_hash = await run_in_threadpool(_save_upload, file.file)
 
+    repo = DocumentRepository(session)
     try:
-        document_id = await pipeline.ingest_bytes(
-            content=content,
+        if not overwrite:
+            existing = await repo.get_by_content_hash(content_hash, project_id)
+            if existing:
+                file_path.unlink(missing_ok=True)
+                return DocumentUploadResponse(
+                    id=existing.id,
+                    filename=existing.filename,
+                    status=existing.status,
+                    message="Identical document already ingested",
+                )
+
+        document = await repo.create(
             filename=file.filename,
             document_type=document_type,
             project_id=project_id,
-            auto_extract=auto_extract,
-        )
-
-        return DocumentUploadResponse(
-            id=document_id,
-            filename=file.filename,
-            status=ProcessingStatus.COMPLETED,
-            message="Document processed successfully",
+            content_hash=content_hash,
         )
+        # The worker uses its own session and must see the row
+        await session.commit()
+    except Exception:
+        file_path.unlink(missing_ok=True)
+        raise
+
+    background_tasks.add_task(
+        ingest_document,
+        document.id,
+        file_path,
+        document_type=document_type,
+        project_id=project_id,
+        auto_extract=auto_extract,
+    )
 
-    except IngestionError as e:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail=str(e),
-        )
+    return DocumentUploadResponse(
+        id=document.id,
+        filename=file.filename,
+        status=ProcessingStatus.PENDING,
+        message="Document accepted for processing",
+    )
 
 
 @router.get("", response_model=DocumentListResponse)
 async def list_documents(
     project_id: UUID | None = None,
-    session: AsyncSession = Depends(get_db),
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_db_ro),
 ) -> DocumentListResponse:
     """
-    List all documents, optionally filtered by project.
+    List documents, newest first, optionally filtered by project.
+
+    Results are paginated; pass the returned ``next_cursor`` to get the next page.
 
     Args:
         project_id: Optional project ID to filter by.
+        limit: Maximum number of documents per page.
+        cursor: Cursor from a previous response.
 
     Returns:
-        List of documents.
+        One page of documents.
     """
     repo = DocumentRepository(session)
 
-    if project_id:
-        documents = await repo.get_by_project(project_id)
-    else:
-        documents = await repo.get_all()
+    documents, next_key = await repo.list_page(
+        limit=limit,
+        cursor=_decode_cursor(cursor) if cursor else None,
+        project_id=project_id,
+    )
 
-    return DocumentListResponse(
-        documents=[DocumentResponse.model_validate(doc) for doc in documents],
+    # Rows come straight from the database, so skip re-validating every field
+    return DocumentListResponse.model_construct(
+        documents=[_document_response(doc) for doc in documents],
         total=len(documents),
+        next_cursor=_encode_cursor(*next_key) if next_key else None,
     )
 
 
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: UUID,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_db_ro),
 ) -> DocumentResponse:
     """
     Get a document by ID.
@@ -140,7 +250,7 @@ async def get_document(
             detail="Document not found",
         )
 
-    return DocumentResponse.model_validate(document)
+    return _document_response(document)
 
 
 @router.delete("/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -163,11 +273,13 @@ async def delete_document(
             detail="Document not found",
         )
 
+    invalidate_on_commit(session)
+
 
 @router.get("/{document_id}/extracted", response_model=ExtractedDataResponse)
 async def get_extracted_data(
     document_id: UUID,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_db_ro),
 ) -> ExtractedDataResponse:
     """
     Get extracted structured data for a document.
@@ -187,14 +299,14 @@ async def get_extracted_data(
             detail="No extracted data found for this document",
         )
 
-    return ExtractedDataResponse.model_validate(extracted)
+    return _extracted_data_response(extracted)
 
 
 @router.post("/{document_id}/extract", response_model=ExtractedDataResponse)
 async def extract_document_data(
     document_id: UUID,
     force: bool = False,
-    session: AsyncSession = Depends(get_db),
+    pipeline: IngestionPipeline = Depends(get_ingestion_pipeline),
 ) -> ExtractedDataResponse:
     """
     Extract or re-extract structured data from a document.
@@ -206,17 +318,12 @@ async def extract_document_data(
     Returns:
         Extracted data.
     """
-    pipeline = await get_ingestion_pipeline(session)
-    data = await pipeline.extract_document(document_id, force=force)
+    extracted = await pipeline.extract_document(document_id, force=force)
 
-    if data is None:
+    if extracted is None:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Extraction failed or document type unknown",
         )
 
-    # Get the full extracted data record
-    repo = ExtractedDataRepository(session)
-    extracted = await repo.get_by_document(document_id)
-
-    return ExtractedDataResponse.model_validate(extracted)
+    return _extracted_data_response(extracted)
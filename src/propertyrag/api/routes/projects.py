@@ -5,9 +5,10 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from propertyrag.api.dependencies import get_db
+from propertyrag.api.dependencies import get_db, get_db_ro
 from propertyrag.api.schemas import ProjectCreate, ProjectResponse, ProjectUpdate
 from propertyrag.db.repository import DocumentRepository, ProjectRepository
+from propertyrag.services.qvcache import invalidate_on_commit
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
@@ -46,7 +47,7 @@ async def create_project(
 
 @router.get("", response_model=list[ProjectResponse])
 async def list_projects(
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_db_ro),
 ) -> list[ProjectResponse]:
     """
     List all projects.
@@ -55,31 +56,27 @@ async def list_projects(
         List of projects with document counts.
     """
     project_repo = ProjectRepository(session)
-    doc_repo = DocumentRepository(session)
 
-    projects = await project_repo.get_all()
-
-    result = []
-    for project in projects:
-        docs = await doc_repo.get_by_project(project.id)
-        result.append(
-            ProjectResponse(
-                id=project.id,
-                name=project.name,
-                description=project.description,
-                document_count=len(docs),
-                created_at=project.created_at,
-                updated_at=project.updated_at,
-            )
+    projects = await project_repo.list_with_counts()
+
+    # Rows come straight from the database, so skip re-validating every field
+    return [
+        ProjectResponse.model_construct(
+            id=project.id,
+            name=project.name,
+            description=project.description,
+            document_count=document_count,
+            created_at=project.created_at,
+            updated_at=project.updated_at,
         )
-
-    return result
+        for project, document_count in projects
+    ]
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: UUID,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_db_ro),
 ) -> ProjectResponse:
     """
     Get a project by ID.
@@ -101,13 +98,13 @@ async def get_project(
             detail="Project not found",
         )
 
-    docs = await doc_repo.get_by_project(project_id)
+    document_count = await doc_repo.count_by_project(project_id)
 
     return ProjectResponse(
         id=project.id,
         name=project.name,
         description=project.description,
-        document_count=len(docs),
+        document_count=document_count,
         created_at=project.created_at,
         updated_at=project.updated_at,
     )
@@ -147,14 +144,16 @@ async def update_project(
         project.description = request.description
 
     await session.flush()
+    # Reload the server-generated updated_at
+    await session.refresh(project)
 
-    docs = await doc_repo.get_by_project(project_id)
+    document_count = await doc_repo.count_by_project(project_id)
 
     return ProjectResponse(
         id=project.id,
         name=project.name,
         description=project.description,
-        document_count=len(docs),
+        document_count=document_count,
         created_at=project.created_at,
         updated_at=project.updated_at,
     )
@@ -181,3 +180,5 @@ async def delete_project(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
+
+    invalidate_on_commit(session)
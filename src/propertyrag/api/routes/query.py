@@ -1,9 +1,8 @@
 """Query API routes."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from propertyrag.api.dependencies import get_db, get_rag_service
+from propertyrag.api.dependencies import get_rag_service
 from propertyrag.api.schemas import QueryRequest, QueryResponse, SourceResponse
 from propertyrag.core.models import QueryRequest as CoreQueryRequest
 from propertyrag.services.rag import RAGError, RAGService
@@ -14,7 +13,7 @@ router = APIRouter(prefix="/query", tags=["query"])
 @router.post("", response_model=QueryResponse)
 async def query_documents(
     request: QueryRequest,
-    session: AsyncSession = Depends(get_db),
+    rag_service: RAGService = Depends(get_rag_service),
 ) -> QueryResponse:
     """
     Query documents using natural language.
@@ -30,11 +29,9 @@ async def query_documents(
     Returns:
         Answer with source references.
     """
-    rag_service = await get_rag_service(session)
-
     try:
-        # Convert to core model
-        core_request = CoreQueryRequest(
+        # Convert to core model (the API schema has already validated it)
+        core_request = CoreQueryRequest.model_construct(
             question=request.question,
             project_id=request.project_id,
             document_ids=request.document_ids,
@@ -43,9 +40,10 @@ async def query_documents(
 
         result = await rag_service.query(core_request)
 
-        # Convert sources to response format
+        # Convert sources to response format; the service built them from
+        # stored rows, so skip re-validation
         sources = [
-            SourceResponse(
+            SourceResponse.model_construct(
                 document_id=source.document_id,
                 filename=source.filename,
                 page_number=source.page_number,
@@ -55,7 +53,7 @@ async def query_documents(
             for source in result.sources
         ]
 
-        return QueryResponse(
+        return QueryResponse.model_construct(
             answer=result.answer,
             sources=sources,
             query=result.query,
@@ -67,7 +67,8 @@ class DocumentListResponse(BaseModel):
     """List of documents response."""
 
     documents: list[DocumentResponse]
-    total: int
+    total: int  # documents in this page
+    next_cursor: str | None = None
 
 
 class DocumentUploadResponse(BaseModel):
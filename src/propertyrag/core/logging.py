@@ -2,12 +2,30 @@
 
 import logging
 import sys
+from pathlib import PurePath
+from uuid import UUID
 
 import structlog
+from structlog.typing import EventDict, WrappedLogger
 
 from propertyrag.core.config import get_settings
 
 
+def stringify_values(
+    logger: WrappedLogger, method_name: str, event_dict: EventDict
+) -> EventDict:
+    """
+    Render UUIDs, paths and exceptions as plain strings.
+
+    Call sites pass these objects as-is, so the conversion only happens for
+    events that pass the level filter.
+    """
+    for key, value in event_dict.items():
+        if isinstance(value, (UUID, PurePath, BaseException)):
+            event_dict[key] = str(value)
+    return event_dict
+
+
 def setup_logging() -> None:
     """Configure structured logging with structlog."""
     settings = get_settings()
@@ -23,6 +41,7 @@ def setup_logging() -> None:
             structlog.processors.StackInfoRenderer(),
             structlog.dev.set_exc_info,
             structlog.processors.TimeStamper(fmt="iso"),
+            stringify_values,
             (
                 structlog.dev.ConsoleRenderer()
                 if settings.debug
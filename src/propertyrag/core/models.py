@@ -3,10 +3,10 @@
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Annotated
+from typing import Annotated, Any, Literal
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class DocumentType(str, Enum):
@@ -107,6 +107,7 @@ class Partei(BaseModel):
 class MietvertragData(BaseModel):
     """Extracted data from a rental contract."""
 
+    kind: Literal["mietvertrag"] = Field(default="mietvertrag", exclude=True)
     vermieter: Partei | None = None
     mieter: Partei | None = None
     objekt_adresse: str | None = None
@@ -121,12 +122,13 @@ class MietvertragData(BaseModel):
     kuendigungsfrist_monate: int | None = None
     indexierung: str | None = None
     kaution_eur: Decimal | None = None
-    sondervereinbarungen: list[str] = Field(default_factory=list)
+    sondervereinbarungen: tuple[str, ...] = ()
 
 
 class GutachtenData(BaseModel):
     """Extracted data from a property valuation report."""
 
+    kind: Literal["gutachten"] = Field(default="gutachten", exclude=True)
     gutachter: str | None = None
     bewertungsstichtag: date | None = None
     verkehrswert_eur: Decimal | None = None
@@ -151,13 +153,14 @@ class Belastung(BaseModel):
 class GrundbuchauszugData(BaseModel):
     """Extracted data from a land register extract."""
 
+    kind: Literal["grundbuchauszug"] = Field(default="grundbuchauszug", exclude=True)
     grundbuchamt: str | None = None
     blatt_nummer: str | None = None
     flurnummer: str | None = None
     gemarkung: str | None = None
     grundstuecksgroesse_qm: Decimal | None = None
-    eigentuemer: list[str] = Field(default_factory=list)
-    belastungen: list[Belastung] = Field(default_factory=list)
+    eigentuemer: tuple[str, ...] = ()
+    belastungen: tuple[Belastung, ...] = ()
     stand_datum: date | None = None
 
 
@@ -172,6 +175,7 @@ class NebenkostenPosition(BaseModel):
 class NebenkostenabrechnungData(BaseModel):
     """Extracted data from a utility bill."""
 
+    kind: Literal["nebenkostenabrechnung"] = Field(default="nebenkostenabrechnung", exclude=True)
     abrechnungszeitraum_von: date | None = None
     abrechnungszeitraum_bis: date | None = None
     objekt_adresse: str | None = None
@@ -180,13 +184,14 @@ class NebenkostenabrechnungData(BaseModel):
     vorauszahlungen_eur: Decimal | None = None
     nachzahlung_eur: Decimal | None = None
     guthaben_eur: Decimal | None = None
-    positionen: list[NebenkostenPosition] = Field(default_factory=list)
+    positionen: tuple[NebenkostenPosition, ...] = ()
 
 
-# Union type for extracted data
-ExtractedData = (
-    MietvertragData | GutachtenData | GrundbuchauszugData | NebenkostenabrechnungData
-)
+# Union type for extracted data, dispatched on ``kind`` (the document type value)
+ExtractedData = Annotated[
+    MietvertragData | GutachtenData | GrundbuchauszugData | NebenkostenabrechnungData,
+    Field(discriminator="kind"),
+]
 
 
 class ExtractedDocument(BaseModel):
@@ -201,6 +206,20 @@ class ExtractedDocument(BaseModel):
     class Config:
         from_attributes = True
 
+    @model_validator(mode="before")
+    @classmethod
+    def _tag_data(cls, values: Any) -> Any:
+        """Tag stored data with its document type so the union needs one validator."""
+        if not isinstance(values, dict):
+            values = {name: getattr(values, name, None) for name in cls.model_fields}
+        data, document_type = values.get("data"), values.get("document_type")
+        if isinstance(data, dict) and "kind" not in data and document_type is not None:
+            document_type = DocumentType(document_type)
+            if document_type == DocumentType.UNKNOWN:
+                raise ValueError("extracted data requires a known document type")
+            values = {**values, "data": {**data, "kind": document_type.value}}
+        return values
+
 
 # ============================================================================
 # Query Models
@@ -0,0 +1,24 @@
+"""Shared OpenAI client."""
+
+from functools import lru_cache
+
+from openai import AsyncOpenAI
+
+from propertyrag.core.config import get_settings
+
+
+@lru_cache
+def get_openai_client() -> AsyncOpenAI:
+    """Get the process-wide OpenAI client (one HTTP connection pool for all services)."""
+    settings = get_settings()
+    return AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        max_retries=settings.openai_max_retries,
+    )
+
+
+async def close_openai_client() -> None:
+    """Close the shared client's connection pool, if it was ever created."""
+    if get_openai_client.cache_info().currsize:
+        await get_openai_client().close()
+        get_openai_client.cache_clear()
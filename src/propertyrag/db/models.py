@@ -1,24 +1,32 @@
 """SQLAlchemy database models."""
 
+import uuid
 from datetime import datetime
-from uuid import uuid4
 
-from pgvector.sqlalchemy import Vector
 from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 from propertyrag.core.config import get_settings
 from propertyrag.core.models import DocumentType, ProcessingStatus
+from propertyrag.db.ids import uuid7
+from propertyrag.db.types import HalfVec
+from propertyrag.db.vector_index import configure_hnsw_params
+
+# Schemas created from the models start empty; migrations size the HNSW
+# index for the chunks present when they run
+EMPTY_INDEX_HNSW = configure_hnsw_params(0)
 
 
 class Base(DeclarativeBase):
@@ -32,8 +40,8 @@ class ProjectModel(Base):
 
     __tablename__ = "projects"
 
-    id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid4
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -55,8 +63,8 @@ class DocumentModel(Base):
 
     __tablename__ = "documents"
 
-    id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid4
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     filename: Mapped[str] = mapped_column(String(500), nullable=False)
     document_type: Mapped[DocumentType] = mapped_column(
@@ -66,7 +74,11 @@ class DocumentModel(Base):
         Enum(ProcessingStatus), default=ProcessingStatus.PENDING
     )
     page_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
-    project_id: Mapped[UUID | None] = mapped_column(
+    # Parsed text, kept for re-extraction; deferred so listings don't load it
+    full_text: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
+    # SHA-256 of the PDF bytes, to skip re-ingesting identical uploads
+    content_hash: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    project_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("projects.id", ondelete="SET NULL"), nullable=True
     )
     created_at: Mapped[datetime] = mapped_column(
@@ -86,9 +98,18 @@ class DocumentModel(Base):
     )
 
     __table_args__ = (
-        Index("ix_documents_project_id", "project_id"),
+        # Serve the newest-first keyset listing (optionally per project) from
+        # the index without a sort; the first also covers project_id lookups
+        Index(
+            "ix_documents_project_created",
+            "project_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index("ix_documents_created", text("created_at DESC"), text("id DESC")),
         Index("ix_documents_document_type", "document_type"),
         Index("ix_documents_status", "status"),
+        Index("ix_documents_project_content_hash", "project_id", "content_hash"),
     )
 
 
@@ -97,18 +118,22 @@ class ChunkModel(Base):
 
     __tablename__ = "chunks"
 
-    id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid4
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
-    document_id: Mapped[UUID] = mapped_column(
+    document_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
     )
+    # Copy of documents.project_id so project-scoped searches need no join
+    project_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("projects.id", ondelete="SET NULL"), nullable=True
+    )
     content: Mapped[str] = mapped_column(Text, nullable=False)
     page_number: Mapped[int | None] = mapped_column(Integer, nullable=True)
     chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
     token_count: Mapped[int] = mapped_column(Integer, nullable=False)
     embedding: Mapped[list[float]] = mapped_column(
-        Vector(get_settings().embedding_dimensions), nullable=False
+        HalfVec(get_settings().embedding_dimensions), nullable=False
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
@@ -118,14 +143,20 @@ class ChunkModel(Base):
     document: Mapped[DocumentModel] = relationship(back_populates="chunks")
 
     __table_args__ = (
-        Index("ix_chunks_document_id", "document_id"),
+        Index("ix_chunks_document_chunk", "document_id", "chunk_index"),
+        Index("ix_chunks_project_id", "project_id"),
         Index(
             "ix_chunks_embedding",
             "embedding",
-            postgresql_using="ivfflat",
-            postgresql_with={"lists": 100},
-            postgresql_ops={"embedding": "vector_cosine_ops"},
+            postgresql_using="hnsw",
+            postgresql_with={
+                "m": EMPTY_INDEX_HNSW.m,
+                "ef_construction": EMPTY_INDEX_HNSW.ef_construction,
+            },
+            postgresql_ops={"embedding": "halfvec_cosine_ops"},
         ),
+        # ix_chunks_embedding_bq (HNSW over binary_quantize(embedding)) is an
+        # expression index managed only by migration 004
     )
 
 
@@ -134,10 +165,10 @@ class ExtractedDataModel(Base):
 
     __tablename__ = "extracted_data"
 
-    id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid4
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
-    document_id: Mapped[UUID] = mapped_column(
+    document_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("documents.id", ondelete="CASCADE"),
         nullable=False,
@@ -155,7 +186,36 @@ class ExtractedDataModel(Base):
     # Relationships
     document: Mapped[DocumentModel] = relationship(back_populates="extracted_data")
 
+    # Load extracted_at via RETURNING on insert so new rows serialize without a refresh
+    __mapper_args__ = {"eager_defaults": True}
+
     __table_args__ = (
         Index("ix_extracted_data_document_type", "document_type"),
-        Index("ix_extracted_data_data", "data", postgresql_using="gin"),
+        Index(
+            "ix_extracted_data_data",
+            "data",
+            postgresql_using="gin",
+            postgresql_ops={"data": "jsonb_path_ops"},
+        ),
     )
+
+
+class EmbeddingCacheModel(Base):
+    """Embedding of a chunk text, keyed by embedding model and content hash."""
+
+    __tablename__ = "embedding_cache"
+
+    model: Mapped[str] = mapped_column(String(100), primary_key=True)
+    content_hash: Mapped[bytes] = mapped_column(LargeBinary, primary_key=True)
+    embedding: Mapped[list[float]] = mapped_column(
+        HalfVec(get_settings().embedding_dimensions), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    # Bumped on cache hits; the least recently used entries are evicted first
+    last_used_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (Index("ix_embedding_cache_last_used", "last_used_at"),)
@@ -1,18 +1,59 @@
 """Repository pattern for database operations."""
 
+import time
+from datetime import datetime
+from typing import Any
+from typing import cast as typing_cast
 from uuid import UUID
 
-from sqlalchemy import func, select, text
+import numpy as np
+from pgvector.sqlalchemy import BIT
+from sqlalchemy import (
+    ColumnElement,
+    CursorResult,
+    Row,
+    bindparam,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    true,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
+from propertyrag.core.config import get_settings
 from propertyrag.core.models import DocumentType, ProcessingStatus
+from propertyrag.db.ids import uuid7
 from propertyrag.db.models import (
     ChunkModel,
     DocumentModel,
+    EmbeddingCacheModel,
     ExtractedDataModel,
     ProjectModel,
 )
+from propertyrag.db.types import HalfVec
+from propertyrag.db.vector_index import tune_ann
+
+# Short-lived per-process cache of document counts for polled project endpoints
+PROJECT_COUNT_TTL_SECONDS = 5.0
+PROJECT_COUNT_CACHE_SIZE = 10_000
+_project_count_cache: dict[UUID, tuple[float, int]] = {}
+
+# Chunk batches at least this large are loaded with COPY on asyncpg
+CHUNK_COPY_MIN_ROWS = 100
+
+
+def invalidate_project_count(project_id: UUID | None) -> None:
+    """Drop the cached document count of a project."""
+    if project_id is not None:
+        _project_count_cache.pop(project_id, None)
 
 
 class ProjectRepository:
@@ -39,11 +80,22 @@ class ProjectRepository:
         )
         return list(result.scalars().all())
 
+    async def list_with_counts(self) -> list[tuple[ProjectModel, int]]:
+        """Get all projects with their document counts in a single query."""
+        result = await self.session.execute(
+            select(ProjectModel, func.count(DocumentModel.id))
+            .outerjoin(DocumentModel, DocumentModel.project_id == ProjectModel.id)
+            .group_by(ProjectModel.id)
+            .order_by(ProjectModel.created_at.desc())
+        )
+        return [(project, count) for project, count in result.all()]
+
     async def delete(self, project_id: UUID) -> bool:
         """Delete a project by ID."""
         project = await self.get_by_id(project_id)
         if project:
             await self.session.delete(project)
+            invalidate_project_count(project_id)
             return True
         return False
 
@@ -59,15 +111,18 @@ class DocumentRepository:
         filename: str,
         document_type: DocumentType = DocumentType.UNKNOWN,
         project_id: UUID | None = None,
+        content_hash: bytes | None = None,
     ) -> DocumentModel:
         """Create a new document."""
         document = DocumentModel(
             filename=filename,
             document_type=document_type,
             project_id=project_id,
+            content_hash=content_hash,
         )
         self.session.add(document)
         await self.session.flush()
+        invalidate_project_count(project_id)
         return document
 
     async def get_by_id(
@@ -83,6 +138,26 @@ class DocumentRepository:
             return result.scalar_one_or_none()
         return await self.session.get(DocumentModel, document_id)
 
+    async def get_by_content_hash(
+        self, content_hash: bytes, project_id: UUID | None = None
+    ) -> DocumentModel | None:
+        """Get a completed document with the given PDF hash in the same project."""
+        project_filter = (
+            DocumentModel.project_id.is_(None)
+            if project_id is None
+            else DocumentModel.project_id == project_id
+        )
+        result = await self.session.execute(
+            select(DocumentModel)
+            .where(
+                project_filter,
+                DocumentModel.content_hash == content_hash,
+                DocumentModel.status == ProcessingStatus.COMPLETED,
+            )
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
     async def get_by_project(self, project_id: UUID) -> list[DocumentModel]:
         """Get all documents in a project."""
         result = await self.session.execute(
@@ -92,6 +167,69 @@ class DocumentRepository:
         )
         return list(result.scalars().all())
 
+    async def list_page(
+        self,
+        limit: int,
+        cursor: tuple[datetime, UUID] | None = None,
+        project_id: UUID | None = None,
+    ) -> tuple[list[DocumentModel], tuple[datetime, UUID] | None]:
+        """
+        Get one page of documents, newest first, using keyset pagination.
+
+        Args:
+            limit: Maximum number of documents to return.
+            cursor: (created_at, id) of the last document on the previous page.
+            project_id: Optional project to filter by.
+
+        Returns:
+            Tuple of (documents, cursor for the next page or None if this is the last).
+        """
+        query = select(DocumentModel).order_by(
+            DocumentModel.created_at.desc(), DocumentModel.id.desc()
+        )
+        if project_id is not None:
+            query = query.where(DocumentModel.project_id == project_id)
+        if cursor is not None:
+            query = query.where(
+                tuple_(DocumentModel.created_at, DocumentModel.id) < tuple_(*cursor)
+            )
+
+        # Fetch one extra row to know whether another page follows
+        result = await self.session.execute(query.limit(limit + 1))
+        documents = list(result.scalars().all())
+
+        if len(documents) <= limit:
+            return documents, None
+
+        documents = documents[:limit]
+        last = documents[-1]
+        next_cursor: tuple[datetime, UUID] = (last.created_at, last.id)
+        return documents, next_cursor
+
+    async def count_by_project(self, project_id: UUID) -> int:
+        """
+        Count the documents in a project.
+
+        Counts are cached per process for PROJECT_COUNT_TTL_SECONDS and
+        dropped when a document is added to or removed from the project.
+        """
+        now = time.monotonic()
+        cached = _project_count_cache.get(project_id)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        result = await self.session.execute(
+            select(func.count(DocumentModel.id)).where(
+                DocumentModel.project_id == project_id
+            )
+        )
+        count = result.scalar_one()
+
+        if len(_project_count_cache) >= PROJECT_COUNT_CACHE_SIZE:
+            _project_count_cache.clear()
+        _project_count_cache[project_id] = (now + PROJECT_COUNT_TTL_SECONDS, count)
+        return count
+
     async def get_all(self) -> list[DocumentModel]:
         """Get all documents."""
         result = await self.session.execute(
@@ -104,33 +242,73 @@ class DocumentRepository:
         document_id: UUID,
         status: ProcessingStatus,
         page_count: int | None = None,
+        full_text: str | None = None,
     ) -> DocumentModel | None:
-        """Update document processing status."""
-        document = await self.get_by_id(document_id)
-        if document:
-            document.status = status
-            if page_count is not None:
-                document.page_count = page_count
-            await self.session.flush()
-        return document
+        """Update document processing status, optionally storing its parsed text."""
+        values: dict = {"status": status}
+        if page_count is not None:
+            values["page_count"] = page_count
+        if full_text is not None:
+            values["full_text"] = full_text
+        return await self._update(document_id, values)
+
+    async def fail_stale(self, updated_before: datetime) -> int:
+        """
+        Mark unfinished documents last updated before a cutoff as FAILED.
+
+        Returns:
+            Number of documents marked.
+        """
+        result = await self.session.execute(
+            update(DocumentModel)
+            .where(
+                DocumentModel.status.in_([ProcessingStatus.PENDING, ProcessingStatus.PROCESSING]),
+                DocumentModel.updated_at < updated_before,
+            )
+            .values(status=ProcessingStatus.FAILED)
+        )
+        return typing_cast(CursorResult[Any], result).rowcount
+
+    async def get_text(self, document_id: UUID) -> str | None:
+        """Get a document's stored full text, or None if it was not stored."""
+        result = await self.session.execute(
+            select(DocumentModel.full_text).where(DocumentModel.id == document_id)
+        )
+        return result.scalar_one_or_none()
 
     async def update_type(
         self, document_id: UUID, document_type: DocumentType
     ) -> DocumentModel | None:
         """Update document type."""
-        document = await self.get_by_id(document_id)
-        if document:
-            document.document_type = document_type
-            await self.session.flush()
-        return document
+        return await self._update(document_id, {"document_type": document_type})
+
+    async def _update(self, document_id: UUID, values: dict) -> DocumentModel | None:
+        """Update a document in one UPDATE ... RETURNING round-trip."""
+        result = await self.session.execute(
+            update(DocumentModel)
+            .where(DocumentModel.id == document_id)
+            .values(**values)
+            .returning(DocumentModel)
+        )
+        return result.scalar_one_or_none()
 
     async def delete(self, document_id: UUID) -> bool:
-        """Delete a document by ID."""
-        document = await self.get_by_id(document_id)
-        if document:
-            await self.session.delete(document)
-            return True
-        return False
+        """
+        Delete a document by ID.
+
+        Chunks and extracted data are removed by the ON DELETE CASCADE
+        foreign keys.
+        """
+        result = await self.session.execute(
+            delete(DocumentModel)
+            .where(DocumentModel.id == document_id)
+            .returning(DocumentModel.project_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return False
+        invalidate_project_count(row.project_id)
+        return True
 
 
 class ChunkRepository:
@@ -143,22 +321,59 @@ class ChunkRepository:
         self,
         document_id: UUID,
         chunks: list[dict],
-    ) -> list[ChunkModel]:
-        """Create multiple chunks for a document."""
-        chunk_models = [
-            ChunkModel(
-                document_id=document_id,
-                content=chunk["content"],
-                page_number=chunk.get("page_number"),
-                chunk_index=chunk["chunk_index"],
-                token_count=chunk["token_count"],
-                embedding=chunk["embedding"],
-            )
+        project_id: UUID | None = None,
+    ) -> list[UUID]:
+        """
+        Create multiple chunks for a document.
+
+        Rows are sent as one executemany INSERT rather than flushed as
+        individual ORM objects, so no instances are added to the session.
+        On asyncpg, batches of ``CHUNK_COPY_MIN_ROWS`` or more are streamed
+        with binary COPY instead, inside the session's transaction.
+        ``project_id`` must match the document's project.
+
+        Returns:
+            IDs of the created chunks, in input order.
+        """
+        if not chunks:
+            return []
+
+        rows = [
+            {
+                "id": uuid7(),
+                "document_id": document_id,
+                "project_id": project_id,
+                "content": chunk["content"],
+                "page_number": chunk.get("page_number"),
+                "chunk_index": chunk["chunk_index"],
+                "token_count": chunk["token_count"],
+                "embedding": chunk["embedding"],
+            }
             for chunk in chunks
         ]
-        self.session.add_all(chunk_models)
-        await self.session.flush()
-        return chunk_models
+        if len(rows) >= CHUNK_COPY_MIN_ROWS and self.session.get_bind().dialect.driver == "asyncpg":
+            await self._copy_rows(rows)
+        else:
+            await self.session.execute(insert(ChunkModel), rows)
+        return [row["id"] for row in rows]
+
+    async def _copy_rows(self, rows: list[dict]) -> None:
+        """Load chunk rows with COPY on the session's asyncpg connection."""
+        columns = list(rows[0])
+        connection = await self.session.connection()
+        raw = await connection.get_raw_connection()
+        driver_connection = raw.driver_connection
+        if driver_connection is None:
+            raise ValueError("COPY requires an open asyncpg connection")
+        # The adapter sends BEGIN lazily with the first statement; COPY on the
+        # driver connection bypasses it and would otherwise autocommit
+        if not driver_connection.is_in_transaction():
+            await connection.exec_driver_sql("SELECT 1")
+        await driver_connection.copy_records_to_table(
+            ChunkModel.__tablename__,
+            records=[tuple(row[column] for column in columns) for row in rows],
+            columns=columns,
+        )
 
     async def get_by_document(self, document_id: UUID) -> list[ChunkModel]:
         """Get all chunks for a document."""
@@ -169,38 +384,248 @@ class ChunkRepository:
         )
         return list(result.scalars().all())
 
+    async def get_neighbors(self, chunk_ids: list[UUID], context: int) -> list[Row]:
+        """
+        Get the chunks within ``context`` positions of each given chunk.
+
+        All windows are read in one statement by joining each chunk to its
+        document's chunks on ``chunk_index``; embeddings are not loaded.
+
+        Args:
+            chunk_ids: Chunks whose neighborhoods to fetch.
+            context: Number of chunks before and after each to include.
+
+        Returns:
+            Rows with ``center_id`` (the given chunk) and the neighbor's ``id``,
+            ``document_id``, ``content``, ``page_number`` and ``chunk_index``,
+            including the given chunks themselves.
+        """
+        if not chunk_ids:
+            return []
+
+        center = aliased(ChunkModel)
+        result = await self.session.execute(
+            select(
+                center.id.label("center_id"),
+                ChunkModel.id,
+                ChunkModel.document_id,
+                ChunkModel.content,
+                ChunkModel.page_number,
+                ChunkModel.chunk_index,
+            )
+            .join(
+                center,
+                (ChunkModel.document_id == center.document_id)
+                & ChunkModel.chunk_index.between(
+                    center.chunk_index - context, center.chunk_index + context
+                ),
+            )
+            .where(center.id.in_(chunk_ids))
+            .order_by(ChunkModel.chunk_index)
+        )
+        return list(result.all())
+
+    async def count_by_document(self, document_id: UUID) -> int:
+        """Count the chunks of a document."""
+        result = await self.session.execute(
+            select(func.count()).where(ChunkModel.document_id == document_id)
+        )
+        return result.scalar_one()
+
+    async def get_ordered_content(
+        self,
+        document_id: UUID,
+        near: list[float] | np.ndarray | None = None,
+        limit: int | None = None,
+    ) -> list[str]:
+        """
+        Get a document's chunk contents in reading order, without embeddings.
+
+        Args:
+            document_id: Document whose chunks to read.
+            near: Optional embedding; only the ``limit`` chunks closest to it
+                are returned, still in reading order.
+            limit: Number of chunks to keep when ``near`` is given.
+
+        Returns:
+            Chunk contents ordered by chunk index.
+        """
+        query = select(ChunkModel.content, ChunkModel.chunk_index).where(
+            ChunkModel.document_id == document_id
+        )
+        if near is not None:
+            # The function form of <=> cannot use the HNSW index, so the
+            # document's chunks are read via ix_chunks_document_chunk and ranked
+            # exactly; an ANN scan filtered to one document could return fewer
+            # than ``limit`` rows
+            distance = func.cosine_distance(
+                ChunkModel.embedding, self._query_vector("near_embedding", near)
+            )
+            query = query.order_by(distance).limit(limit)
+
+        chunks = query.subquery()
+        result = await self.session.execute(
+            select(chunks.c.content).order_by(chunks.c.chunk_index)
+        )
+        return list(result.scalars().all())
+
     async def search_similar(
         self,
-        embedding: list[float],
+        embedding: list[float] | np.ndarray,
         top_k: int = 5,
         project_id: UUID | None = None,
         document_ids: list[UUID] | None = None,
-    ) -> list[tuple[ChunkModel, float]]:
-        """Search for similar chunks using cosine similarity."""
-        # Build the base query with similarity score
-        embedding_str = f"[{','.join(str(x) for x in embedding)}]"
+        min_score: float = 0.0,
+    ) -> list[tuple[Row, float]]:
+        """
+        Search for similar chunks using cosine similarity.
 
-        query = (
-            select(
-                ChunkModel,
-                (1 - ChunkModel.embedding.cosine_distance(text(f"'{embedding_str}'::vector"))).label(
-                    "similarity"
-                ),
+        Chunks scoring below ``min_score`` are filtered on the raw distance in
+        the statement, so they are never sent back.
+
+        Only the columns callers need are selected (``id``, ``document_id``,
+        ``filename``, ``content``, ``page_number``); the stored embedding is
+        never sent back and no ORM instances are built.
+
+        With binary quantization enabled, candidates are first collected from
+        the bit-quantized HNSW index by Hamming distance (``top_k`` times the
+        rerank factor) and then reranked by exact cosine distance on the
+        stored halfvec embeddings.
+        """
+        settings = get_settings()
+
+        chunk_filter = self._chunk_filter(project_id, document_ids)
+        await tune_ann(self.session, top_k, filtered=chunk_filter is not None)
+
+        query_vector = self._query_vector("query_embedding", embedding)
+
+        distance = ChunkModel.embedding.cosine_distance(query_vector)
+        query = select(*self._result_columns(), distance.label("distance"))
+
+        if settings.binary_quantization:
+            bits = BIT(settings.embedding_dimensions)
+            hamming = cast(func.binary_quantize(ChunkModel.embedding), bits).hamming_distance(
+                cast(func.binary_quantize(query_vector), bits)
             )
-            .join(DocumentModel)
-        )
+            candidates = (
+                select(ChunkModel.id)
+                .order_by(hamming)
+                .limit(top_k * settings.binary_quantization_rerank_factor)
+            )
+            if chunk_filter is not None:
+                candidates = candidates.where(chunk_filter)
+            query = query.where(ChunkModel.id.in_(candidates.scalar_subquery()))
+        elif chunk_filter is not None:
+            query = query.where(chunk_filter)
 
-        # Apply filters
-        if document_ids:
-            query = query.where(ChunkModel.document_id.in_(document_ids))
-        elif project_id:
-            query = query.where(DocumentModel.project_id == project_id)
+        if min_score > 0:
+            query = query.where(distance <= 1 - min_score)
 
-        # Order by similarity and limit
-        query = query.order_by(text("similarity DESC")).limit(top_k)
+        # Order by ascending distance, the only direction the HNSW index can
+        # serve; ordering by similarity DESC falls back to a sequential scan
+        query = query.order_by(distance).limit(top_k)
 
         result = await self.session.execute(query)
-        return [(row[0], row[1]) for row in result.all()]
+        return [(row, 1 - row.distance) for row in result.all()]
+
+    async def search_similar_many(
+        self,
+        embeddings: list[list[float]] | np.ndarray,
+        top_k: int = 5,
+        project_id: UUID | None = None,
+        document_ids: list[UUID] | None = None,
+        min_score: float = 0.0,
+    ) -> list[list[tuple[Row, float]]]:
+        """
+        Search for similar chunks for several query embeddings at once.
+
+        All queries run in one statement: each query vector drives its own
+        ``LATERAL`` top-k scan of the HNSW index, so a batch costs a single
+        round-trip. Binary quantization is not applied here.
+
+        Returns:
+            One list of (row, similarity) per embedding, in input order, with
+            rows shaped as in ``search_similar``.
+        """
+        if len(embeddings) == 0:
+            return []
+
+        chunk_filter = self._chunk_filter(project_id, document_ids)
+        await tune_ann(self.session, top_k, filtered=chunk_filter is not None)
+
+        queries = union_all(
+            *(
+                select(
+                    literal(i).label("i"),
+                    self._query_vector(f"query_embedding_{i}", embedding).label("vec"),
+                )
+                for i, embedding in enumerate(embeddings)
+            )
+        ).subquery("q")
+
+        distance = ChunkModel.embedding.cosine_distance(queries.c.vec)
+        nearest = (
+            select(ChunkModel.id, distance.label("distance"))
+            .order_by(distance)
+            .limit(top_k)
+        )
+        if chunk_filter is not None:
+            nearest = nearest.where(chunk_filter)
+        if min_score > 0:
+            nearest = nearest.where(distance <= 1 - min_score)
+        nearest_per_query = nearest.correlate(queries).lateral("nearest")
+
+        query = (
+            select(queries.c.i, *self._result_columns(), nearest_per_query.c.distance)
+            .select_from(queries)
+            .join(nearest_per_query, true())
+            .join(ChunkModel, ChunkModel.id == nearest_per_query.c.id)
+            .order_by(queries.c.i, nearest_per_query.c.distance)
+        )
+
+        results: list[list[tuple[Row, float]]] = [[] for _ in embeddings]
+        for row in (await self.session.execute(query)).all():
+            results[row.i].append((row, 1 - row.distance))
+        return results
+
+    @staticmethod
+    def _query_vector(name: str, embedding: list[float] | np.ndarray) -> ColumnElement:
+        """
+        Bind a query embedding as a halfvec parameter.
+
+        Binding (rather than inlining) keeps the statement text constant so
+        asyncpg's prepared statement cache is reused across queries.
+        """
+        vector_type = HalfVec(get_settings().embedding_dimensions)
+        return cast(bindparam(name, embedding, type_=vector_type), vector_type)
+
+    @staticmethod
+    def _chunk_filter(
+        project_id: UUID | None, document_ids: list[UUID] | None
+    ) -> ColumnElement[bool] | None:
+        """Build the optional document or project restriction for a search."""
+        if document_ids:
+            return ChunkModel.document_id.in_(document_ids)
+        if project_id:
+            return ChunkModel.project_id == project_id
+        return None
+
+    @staticmethod
+    def _result_columns() -> tuple:
+        """Columns returned for search results."""
+        # Correlated lookup runs only for the rows that survive the LIMIT
+        filename = (
+            select(DocumentModel.filename)
+            .where(DocumentModel.id == ChunkModel.document_id)
+            .scalar_subquery()
+        )
+        return (
+            ChunkModel.id,
+            ChunkModel.document_id,
+            filename.label("filename"),
+            ChunkModel.content,
+            ChunkModel.page_number,
+        )
 
 
 class ExtractedDataRepository:
@@ -236,6 +661,29 @@ class ExtractedDataRepository:
         )
         return result.scalar_one_or_none()
 
+    async def find_by_data(
+        self,
+        criteria: dict,
+        document_type: DocumentType | None = None,
+        project_id: UUID | None = None,
+    ) -> list[ExtractedDataModel]:
+        """
+        Find extracted data whose fields contain the given values.
+
+        Filters are expressed as JSONB containment (``data @> criteria``), the
+        only form the ``jsonb_path_ops`` GIN index accelerates. Nested objects
+        match on the keys they list, e.g. ``{"mieter": {"name": "Max Muster"}}``.
+        """
+        query = select(ExtractedDataModel).where(ExtractedDataModel.data.contains(criteria))
+
+        if document_type is not None:
+            query = query.where(ExtractedDataModel.document_type == document_type)
+        if project_id is not None:
+            query = query.join(DocumentModel).where(DocumentModel.project_id == project_id)
+
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
     async def update(
         self,
         document_id: UUID,
@@ -243,10 +691,102 @@ class ExtractedDataRepository:
         confidence: float | None = None,
     ) -> ExtractedDataModel | None:
         """Update extracted data for a document."""
-        extracted = await self.get_by_document(document_id)
-        if extracted:
-            extracted.data = data
-            if confidence is not None:
-                extracted.extraction_confidence = confidence
-            await self.session.flush()
-        return extracted
+        values: dict = {"data": data}
+        if confidence is not None:
+            values["extraction_confidence"] = confidence
+        result = await self.session.execute(
+            update(ExtractedDataModel)
+            .where(ExtractedDataModel.document_id == document_id)
+            .values(**values)
+            .returning(ExtractedDataModel)
+        )
+        return result.scalar_one_or_none()
+
+
+class EmbeddingCacheRepository:
+    """Repository for cached text embeddings."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_many(
+        self, model: str, hashes: list[bytes]
+    ) -> dict[bytes, list[float] | np.ndarray]:
+        """Get cached embeddings for the given content hashes, keyed by hash."""
+        if not hashes:
+            return {}
+
+        result = await self.session.execute(
+            select(EmbeddingCacheModel.content_hash, EmbeddingCacheModel.embedding).where(
+                EmbeddingCacheModel.model == model,
+                EmbeddingCacheModel.content_hash.in_(hashes),
+            )
+        )
+        # halfvec columns load as numpy arrays on asyncpg and lists elsewhere
+        cached: dict[bytes, list[float] | np.ndarray] = {
+            content_hash: embedding for content_hash, embedding in result.all()
+        }
+
+        if cached:
+            # Best effort: rows locked by a concurrent ingestion keep their old
+            # timestamp rather than blocking this one until it commits
+            touchable = (
+                select(EmbeddingCacheModel.content_hash)
+                .where(
+                    EmbeddingCacheModel.model == model,
+                    EmbeddingCacheModel.content_hash.in_(list(cached)),
+                )
+                .with_for_update(skip_locked=True)
+            )
+            await self.session.execute(
+                update(EmbeddingCacheModel)
+                .where(
+                    EmbeddingCacheModel.model == model,
+                    EmbeddingCacheModel.content_hash.in_(touchable),
+                )
+                .values(last_used_at=func.now())
+            )
+
+        return cached
+
+    async def add_many(
+        self, model: str, embeddings: dict[bytes, list[float] | np.ndarray]
+    ) -> None:
+        """
+        Store embeddings by content hash.
+
+        Hashes that are already cached (e.g. written by a concurrent
+        ingestion) are left untouched.
+        """
+        if not embeddings:
+            return
+
+        rows = [
+            {"model": model, "content_hash": content_hash, "embedding": embedding}
+            for content_hash, embedding in embeddings.items()
+        ]
+        await self.session.execute(
+            pg_insert(EmbeddingCacheModel).on_conflict_do_nothing(), rows
+        )
+
+    async def evict(self, max_entries: int) -> int:
+        """
+        Delete the least recently used embeddings beyond ``max_entries``.
+
+        Returns:
+            Number of evicted entries.
+        """
+        # Walks ix_embedding_cache_last_used down to the first entry past the
+        # bound. Entries sharing its timestamp (e.g. one ingestion's batch) are
+        # kept, so the table can briefly exceed the bound.
+        cutoff = (
+            select(EmbeddingCacheModel.last_used_at)
+            .order_by(EmbeddingCacheModel.last_used_at.desc())
+            .offset(max_entries)
+            .limit(1)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            delete(EmbeddingCacheModel).where(EmbeddingCacheModel.last_used_at < cutoff)
+        )
+        return typing_cast(CursorResult[Any], result).rowcount
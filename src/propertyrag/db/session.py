@@ -2,7 +2,12 @@
 
 from collections.abc import AsyncGenerator
 
+import asyncpg
+from pgvector.asyncpg import register_vector
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import DBAPIConnection
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import ConnectionPoolEntry
 
 from propertyrag.core.config import get_settings
 
@@ -16,6 +21,38 @@ engine = create_async_engine(
     max_overflow=10,
 )
 
+
+@event.listens_for(engine.sync_engine, "connect")
+def _register_vector_codecs(
+    dbapi_connection: DBAPIConnection, connection_record: ConnectionPoolEntry
+) -> None:
+    """Exchange vector and halfvec values in pgvector's binary format."""
+    dbapi_connection.run_async(register_vector)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _apply_session_settings(
+    dbapi_connection: DBAPIConnection, connection_record: ConnectionPoolEntry
+) -> None:
+    """Set search and planner defaults once per connection instead of per query."""
+
+    values = {
+        "hnsw.ef_search": str(settings.hnsw_ef_search),
+        "work_mem": settings.db_work_mem,
+        "jit": "on" if settings.db_jit else "off",
+    }
+    if settings.db_effective_io_concurrency is not None:
+        values["effective_io_concurrency"] = str(settings.db_effective_io_concurrency)
+
+    async def apply(connection: asyncpg.Connection) -> None:
+        # Bound parameters keep configured values out of the SQL text
+        calls = [f"set_config(${2 * i + 1}, ${2 * i + 2}, false)" for i in range(len(values))]
+        params = [item for pair in values.items() for item in pair]
+        await connection.execute(f"SELECT {', '.join(calls)}", *params)
+
+    dbapi_connection.run_async(apply)
+
+
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -0,0 +1,34 @@
+"""Custom column types."""
+
+from typing import Any
+
+from pgvector.sqlalchemy import HALFVEC
+from sqlalchemy import Dialect
+
+
+class HalfVec(HALFVEC):
+    """
+    halfvec type that hands values to asyncpg's binary codec.
+
+    pgvector's HALFVEC always renders values as text. On asyncpg, the engine
+    registers pgvector's binary codecs on every connection (see db.session),
+    so lists and arrays are passed through untouched and sent as 2 bytes per
+    dimension instead of a decimal string, and results come back as numpy
+    arrays rather than lists of floats. Other drivers keep the text format.
+    """
+
+    cache_ok = True
+
+    def bind_processor(self, dialect: Dialect) -> Any:
+        if dialect.driver == "asyncpg":
+            return None
+        return super().bind_processor(dialect)
+
+    def result_processor(self, dialect: Dialect, coltype: Any) -> Any:
+        if dialect.driver == "asyncpg":
+
+            def process(value: Any) -> Any:
+                return None if value is None else value.to_numpy()
+
+            return process
+        return super().result_processor(dialect, coltype)
@@ -0,0 +1,98 @@
+"""HNSW index parameters for the chunk embeddings."""
+
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from propertyrag.core.config import get_settings
+
+# Upper bound pgvector accepts for hnsw.ef_search
+MAX_EF_SEARCH = 1000
+
+
+@dataclass(frozen=True)
+class HNSWParams:
+    """Build and search parameters for an HNSW index."""
+
+    m: int
+    ef_construction: int
+    ef_search: int
+
+
+def configure_hnsw_params(vector_count: int) -> HNSWParams:
+    """
+    Pick HNSW parameters sized to the number of indexed vectors.
+
+    Larger graphs need more links per node (m) and a wider candidate list
+    during construction to keep recall up. Values from the environment
+    (HNSW_M, HNSW_EF_CONSTRUCTION, HNSW_EF_SEARCH) take precedence.
+
+    Args:
+        vector_count: Number of vectors in (or expected in) the index.
+
+    Returns:
+        HNSW parameters for index build and query time.
+    """
+    settings = get_settings()
+
+    if vector_count < 100_000:
+        m, ef_construction = 16, 64
+    elif vector_count < 1_000_000:
+        m, ef_construction = 24, 100
+    else:
+        m, ef_construction = 32, 128
+
+    return HNSWParams(
+        m=settings.hnsw_m or m,
+        ef_construction=settings.hnsw_ef_construction or ef_construction,
+        ef_search=settings.hnsw_ef_search,
+    )
+
+
+async def tune_ann(session: AsyncSession, top_k: int, filtered: bool = False) -> int:
+    """
+    Size the HNSW candidate list for the current transaction.
+
+    ``hnsw.ef_search`` caps how many rows an HNSW scan can return, so it is
+    raised to ``4 * top_k`` (or the number of binary-quantized candidates)
+    when that exceeds the configured floor. Pooled connections already carry
+    the configured floor (see ``db.session``), so no statement is sent when
+    that is enough.
+
+    Filtered searches (by project or documents) also enable pgvector's
+    iterative index scan: without it the scan stops after ``ef_search``
+    candidates from the whole index and filters those, so a small project
+    can get fewer than ``top_k`` results. Values are set transaction-locally
+    in a single ``set_config`` round-trip.
+
+    Args:
+        session: Session whose transaction runs the similarity query.
+        top_k: Number of results the query will return.
+        filtered: Whether the query restricts the chunks searched.
+
+    Returns:
+        The ef_search value applied.
+    """
+    settings = get_settings()
+
+    candidates = top_k
+    if settings.binary_quantization:
+        candidates = top_k * settings.binary_quantization_rerank_factor
+
+    ef_search = min(max(settings.hnsw_ef_search, 4 * top_k, candidates), MAX_EF_SEARCH)
+
+    values: dict[str, str] = {}
+    if ef_search > settings.hnsw_ef_search:
+        values["hnsw.ef_search"] = str(ef_search)
+    if filtered and settings.hnsw_iterative_scan != "off":
+        values["hnsw.iterative_scan"] = settings.hnsw_iterative_scan
+
+    if values:
+        calls: list[str] = []
+        params: dict[str, str] = {}
+        for i, (name, value) in enumerate(values.items()):
+            calls.append(f"set_config(:name_{i}, :value_{i}, true)")
+            params |= {f"name_{i}": name, f"value_{i}": value}
+        await session.execute(text(f"SELECT {', '.join(calls)}"), params)
+    return ef_search
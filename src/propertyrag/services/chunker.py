@@ -1,6 +1,10 @@
 """Text chunking service with token-based splitting."""
 
+import re
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 
 import tiktoken
 
@@ -10,8 +14,21 @@ from propertyrag.services.pdf_parser import ParsedDocument, ParsedPage
 
 logger = get_logger(__name__)
 
+# Splits on . ! ? followed by space and capital letter or end of string
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[A-ZÄÖÜ])|(?<=[.!?])$")
+# One or more blank (or whitespace-only) lines, with the spaces around them
+PARAGRAPH_BREAK = re.compile(r"[^\S\n]*\n\s*\n[^\S\n]*")
+# Threads for chunking pages in parallel (tiktoken releases the GIL while encoding)
+MAX_CHUNKING_WORKERS = 8
 
-@dataclass
+
+@lru_cache
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the process-wide thread pool for page chunking."""
+    return ThreadPoolExecutor(max_workers=MAX_CHUNKING_WORKERS, thread_name_prefix="chunker")
+
+
+@dataclass(slots=True)
 class TextChunk:
     """A chunk of text with metadata."""
 
@@ -63,7 +80,7 @@ class Chunker:
         Split a parsed document into chunks.
 
         Uses a page-aware strategy that:
-        1. Processes each page separately to maintain page references
+        1. Processes each page separately (in parallel) to maintain page references
         2. Splits on paragraph boundaries when possible
         3. Falls back to sentence boundaries for large paragraphs
         4. Uses token-based splitting as last resort
@@ -76,13 +93,18 @@ class Chunker:
         """
         logger.info("chunking_document", filename=document.filename)
 
-        chunks: list[TextChunk] = []
-        chunk_index = 0
+        # Pages are independent, so chunk them concurrently and number afterwards
+        pages_chunks: Iterable[list[TextChunk]]
+        if len(document.pages) > 1:
+            pages_chunks = _get_executor().map(
+                lambda page: self._chunk_page(page, 0), document.pages
+            )
+        else:
+            pages_chunks = [self._chunk_page(page, 0) for page in document.pages]
 
-        for page in document.pages:
-            page_chunks = self._chunk_page(page, chunk_index)
-            chunks.extend(page_chunks)
-            chunk_index += len(page_chunks)
+        chunks = [chunk for page_chunks in pages_chunks for chunk in page_chunks]
+        for chunk_index, chunk in enumerate(chunks):
+            chunk.chunk_index = chunk_index
 
         logger.info(
             "document_chunked",
@@ -101,86 +123,18 @@ class Chunker:
         # Split into paragraphs first
         paragraphs = self._split_into_paragraphs(page.text)
 
-        chunks: list[TextChunk] = []
-        current_text = ""
-        current_tokens = 0
-        chunk_index = start_index
-
-        for paragraph in paragraphs:
-            para_tokens = self.count_tokens(paragraph)
-
-            # If paragraph alone exceeds chunk size, split it further
-            if para_tokens > self.chunk_size:
-                # First, save any accumulated text
-                if current_text.strip():
-                    chunks.append(
-                        TextChunk(
-                            content=current_text.strip(),
-                            page_number=page.page_number,
-                            chunk_index=chunk_index,
-                            token_count=current_tokens,
-                        )
-                    )
-                    chunk_index += 1
-                    current_text = ""
-                    current_tokens = 0
-
-                # Split the large paragraph
-                para_chunks = self._split_large_text(
-                    paragraph, page.page_number, chunk_index
-                )
-                chunks.extend(para_chunks)
-                chunk_index += len(para_chunks)
-
-            # If adding this paragraph exceeds limit, start new chunk
-            elif current_tokens + para_tokens > self.chunk_size:
-                if current_text.strip():
-                    chunks.append(
-                        TextChunk(
-                            content=current_text.strip(),
-                            page_number=page.page_number,
-                            chunk_index=chunk_index,
-                            token_count=current_tokens,
-                        )
-                    )
-                    chunk_index += 1
-
-                    # Add overlap from end of previous chunk
-                    overlap_text = self._get_overlap_text(current_text)
-                    current_text = overlap_text + "\n\n" + paragraph
-                    current_tokens = self.count_tokens(current_text)
-                else:
-                    current_text = paragraph
-                    current_tokens = para_tokens
-
-            # Otherwise, accumulate
-            else:
-                if current_text:
-                    current_text += "\n\n" + paragraph
-                else:
-                    current_text = paragraph
-                current_tokens = self.count_tokens(current_text)
-
-        # Don't forget the last chunk
-        if current_text.strip():
-            chunks.append(
-                TextChunk(
-                    content=current_text.strip(),
-                    page_number=page.page_number,
-                    chunk_index=chunk_index,
-                    token_count=self.count_tokens(current_text.strip()),
-                )
-            )
-
-        return chunks
+        return self._merge_segments(
+            segments=paragraphs,
+            separator="\n\n",
+            page_number=page.page_number,
+            start_index=start_index,
+            split_oversized=self._split_large_text,
+        )
 
     def _split_into_paragraphs(self, text: str) -> list[str]:
         """Split text into paragraphs."""
-        # Split on double newlines
-        paragraphs = text.split("\n\n")
-
-        # Clean up and filter empty paragraphs
-        return [p.strip() for p in paragraphs if p.strip()]
+        # The separator absorbs surrounding whitespace, so pieces come out trimmed
+        return [p for p in PARAGRAPH_BREAK.split(text.strip()) if p]
 
     def _split_large_text(
         self, text: str, page_number: int | None, start_index: int
@@ -190,85 +144,118 @@ class Chunker:
 
         First tries sentence boundaries, then falls back to token-based splitting.
         """
-        chunks: list[TextChunk] = []
-
         # Try to split on sentences first
         sentences = self._split_into_sentences(text)
 
-        current_text = ""
-        current_tokens = 0
+        return self._merge_segments(
+            segments=sentences,
+            separator=" ",
+            page_number=page_number,
+            start_index=start_index,
+            split_oversized=self._force_split_by_tokens,
+        )
+
+    def _merge_segments(
+        self,
+        segments: list[str],
+        separator: str,
+        page_number: int | None,
+        start_index: int,
+        split_oversized: Callable[[str, int | None, int], list[TextChunk]],
+    ) -> list[TextChunk]:
+        """
+        Greedily pack segments into chunks of at most ``chunk_size`` tokens.
+
+        Segments are tokenized up front with ``encode_batch`` and the size of
+        the chunk being built is tracked as a running sum, so the text is not
+        re-encoded as it grows. Each emitted chunk is encoded once to get
+        its exact token count and the overlap carried into the next chunk.
+
+        Args:
+            segments: Paragraphs or sentences, in order.
+            separator: String placed between joined segments.
+            page_number: Page the segments come from.
+            start_index: Chunk index of the first emitted chunk.
+            split_oversized: Splitter for a single segment larger than a chunk.
+
+        Returns:
+            List of text chunks.
+        """
+        if not segments:
+            return []
+
+        chunks: list[TextChunk] = []
         chunk_index = start_index
+        token_lists = self.encoding.encode_batch(segments)
+
+        # Tokens each segment adds when appended to the one before it. The
+        # previous segment's last token is encoded along with it, since a word
+        # after a space, or a blank line after punctuation, merges into one token.
+        joined = self.encoding.encode_batch(
+            [
+                self.encoding.decode(previous[-1:]) + separator + segment
+                for previous, segment in zip(token_lists, segments[1:])
+            ]
+        )
+        appended = [len(token_lists[0]), *(len(tokens) - 1 for tokens in joined)]
 
-        for sentence in sentences:
-            sentence_tokens = self.count_tokens(sentence)
-
-            # If single sentence exceeds chunk size, split by tokens
-            if sentence_tokens > self.chunk_size:
-                if current_text.strip():
-                    chunks.append(
-                        TextChunk(
-                            content=current_text.strip(),
-                            page_number=page_number,
-                            chunk_index=chunk_index,
-                            token_count=current_tokens,
-                        )
-                    )
-                    chunk_index += 1
-                    current_text = ""
-                    current_tokens = 0
+        current: list[str] = []
+        current_tokens = 0
 
-                # Force split by tokens
-                token_chunks = self._force_split_by_tokens(
-                    sentence, page_number, chunk_index
-                )
-                chunks.extend(token_chunks)
-                chunk_index += len(token_chunks)
-
-            elif current_tokens + sentence_tokens > self.chunk_size:
-                if current_text.strip():
-                    chunks.append(
-                        TextChunk(
-                            content=current_text.strip(),
-                            page_number=page_number,
-                            chunk_index=chunk_index,
-                            token_count=current_tokens,
-                        )
-                    )
-                    chunk_index += 1
-
-                    overlap_text = self._get_overlap_text(current_text)
-                    current_text = overlap_text + " " + sentence
-                    current_tokens = self.count_tokens(current_text)
-                else:
-                    current_text = sentence
-                    current_tokens = sentence_tokens
-            else:
-                if current_text:
-                    current_text += " " + sentence
-                else:
-                    current_text = sentence
-                current_tokens = self.count_tokens(current_text)
-
-        if current_text.strip():
+        def emit() -> list[int]:
+            """Append the current chunk and return its overlap tokens."""
+            nonlocal chunk_index
+            content = separator.join(current).strip()
+            tokens = self.encoding.encode(content)
             chunks.append(
                 TextChunk(
-                    content=current_text.strip(),
+                    content=content,
                     page_number=page_number,
                     chunk_index=chunk_index,
-                    token_count=self.count_tokens(current_text.strip()),
+                    token_count=len(tokens),
                 )
             )
+            chunk_index += 1
+            return tokens[-self.chunk_overlap :]
+
+        for segment, tokens, appended_tokens in zip(
+            segments, token_lists, appended, strict=True
+        ):
+            # If the segment alone exceeds chunk size, split it further
+            if len(tokens) > self.chunk_size:
+                # First, save any accumulated text
+                if current:
+                    emit()
+                    current = []
+                    current_tokens = 0
+
+                segment_chunks = split_oversized(segment, page_number, chunk_index)
+                chunks.extend(segment_chunks)
+                chunk_index += len(segment_chunks)
+                continue
+
+            # If adding this segment exceeds limit, start new chunk
+            if current and current_tokens + len(tokens) > self.chunk_size:
+                # Add overlap from end of previous chunk; it ends with the
+                # previous segment, so ``appended`` still applies
+                overlap = emit()
+                current = [self.encoding.decode(overlap)]
+                current_tokens = len(overlap)
+
+            # Accumulate
+            current_tokens += appended_tokens if current else len(tokens)
+            current.append(segment)
+
+        # Don't forget the last chunk
+        if current:
+            emit()
 
         return chunks
 
     def _split_into_sentences(self, text: str) -> list[str]:
         """Split text into sentences."""
-        import re
-
         # Simple sentence splitting - handles common cases
-        # Splits on . ! ? followed by space and capital letter or end of string
-        sentence_pattern = r"(?<=[.!?])\s+(?=[A-ZÄÖÜ])|(?<=[.!?])$"
-        sentences = re.split(sentence_pattern, text)
+        sentences = SENTENCE_BOUNDARY.split(text)
 
         return [s.strip() for s in sentences if s.strip()]
 
@@ -276,38 +263,25 @@ class Chunker:
         self, text: str, page_number: int | None, start_index: int
     ) -> list[TextChunk]:
         """Force split text by token count when no natural boundaries work."""
-        chunks: list[TextChunk] = []
         tokens = self.encoding.encode(text)
+        if not tokens:
+            return []
 
-        chunk_index = start_index
-        i = 0
-
-        while i < len(tokens):
-            # Take chunk_size tokens
-            end = min(i + self.chunk_size, len(tokens))
-            chunk_tokens = tokens[i:end]
-            chunk_text = self.encoding.decode(chunk_tokens)
-
-            chunks.append(
-                TextChunk(
-                    content=chunk_text,
-                    page_number=page_number,
-                    chunk_index=chunk_index,
-                    token_count=len(chunk_tokens),
-                )
+        # Windows of chunk_size tokens, each overlapping the previous one
+        windows = [tokens[: self.chunk_size]]
+        start = 0
+        while start + self.chunk_size < len(tokens):
+            start += self.chunk_size - self.chunk_overlap
+            windows.append(tokens[start : start + self.chunk_size])
+
+        return [
+            TextChunk(
+                content=content,
+                page_number=page_number,
+                chunk_index=start_index + offset,
+                token_count=len(window),
             )
-
-            # Move forward, accounting for overlap
-            i = end - self.chunk_overlap if end < len(tokens) else end
-            chunk_index += 1
-
-        return chunks
-
-    def _get_overlap_text(self, text: str) -> str:
-        """Get the last N tokens of text for overlap."""
-        tokens = self.encoding.encode(text)
-        if len(tokens) <= self.chunk_overlap:
-            return text
-
-        overlap_tokens = tokens[-self.chunk_overlap :]
-        return self.encoding.decode(overlap_tokens)
+            for offset, (window, content) in enumerate(
+                zip(windows, self.encoding.decode_batch(windows), strict=True)
+            )
+        ]
@@ -1,13 +1,73 @@
 """Document type classification service."""
 
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+
+import tiktoken
 from openai import AsyncOpenAI
 
 from propertyrag.core.config import get_settings
 from propertyrag.core.logging import get_logger
 from propertyrag.core.models import DocumentType
+from propertyrag.core.openai_client import get_openai_client
 
 logger = get_logger(__name__)
 
+# Leading tokens of a document sent for classification
+CLASSIFICATION_MAX_TOKENS = 1500
+# Characters tokenized to find them (German prose is well under 8 chars per token)
+CLASSIFICATION_MAX_CHARS = CLASSIFICATION_MAX_TOKENS * 8
+
+# Model answers mapped to document types
+DOCUMENT_TYPES_BY_NAME: dict[str, DocumentType] = {
+    document_type.value: document_type for document_type in DocumentType
+}
+
+# Distinctive terms per document type (matched lowercase against the
+# document start). A type wins without an LLM call if it has at least
+# KEYWORD_MIN_HITS distinct hits and KEYWORD_MARGIN more than any other type.
+KEYWORD_HINTS: dict[DocumentType, tuple[str, ...]] = {
+    DocumentType.MIETVERTRAG: (
+        "mietvertrag",
+        "vermieter",
+        "mietsache",
+        "mietbeginn",
+        "mietzeit",
+        "mietkaution",
+        "kaltmiete",
+    ),
+    DocumentType.GUTACHTEN: (
+        "gutachten",
+        "verkehrswert",
+        "sachverständig",
+        "wertermittlung",
+        "bewertungsstichtag",
+        "ertragswert",
+        "sachwert",
+    ),
+    DocumentType.GRUNDBUCHAUSZUG: (
+        "grundbuch",
+        "bestandsverzeichnis",
+        "erste abteilung",
+        "zweite abteilung",
+        "dritte abteilung",
+        "flurstück",
+        "gemarkung",
+    ),
+    DocumentType.NEBENKOSTENABRECHNUNG: (
+        "nebenkostenabrechnung",
+        "betriebskostenabrechnung",
+        "abrechnungszeitraum",
+        "umlageschlüssel",
+        "vorauszahlung",
+        "nachzahlung",
+        "heizkosten",
+    ),
+}
+KEYWORD_MIN_HITS = 3
+KEYWORD_MARGIN = 2
+
 CLASSIFICATION_PROMPT = """Analysiere den folgenden Dokumenttext und bestimme den Dokumenttyp.
 
 Mögliche Dokumenttypen:
@@ -20,7 +80,7 @@ Mögliche Dokumenttypen:
 Antworte NUR mit einem der folgenden Wörter (kleingeschrieben):
 mietvertrag, gutachten, grundbuchauszug, nebenkostenabrechnung, unknown
 
-Dokumenttext (erste 3000 Zeichen):
+Dokumenttext (Anfang):
 {text}
 
 Dokumenttyp:"""
@@ -40,11 +100,18 @@ class DocumentClassifier:
         Initialize the classifier.
 
         Args:
-            client: Optional AsyncOpenAI client. If not provided, creates one.
+            client: Optional AsyncOpenAI client. Uses the shared client if not provided.
         """
         settings = get_settings()
-        self.client = client or AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = client or get_openai_client()
         self.model = settings.openai_chat_model
+        # Budget tokens with cl100k_base (shared with the chunker); it splits
+        # German text at least as finely as the chat model's tokenizer
+        self.encoding = tiktoken.get_encoding("cl100k_base")
+        # Model answers keyed by a digest of the text they were given, so
+        # re-ingested documents skip the call
+        self.cache_size = settings.classification_cache_size
+        self._cache: OrderedDict[bytes, DocumentType] = OrderedDict()
 
         logger.info("classifier_initialized", model=self.model)
 
@@ -65,8 +132,25 @@ class DocumentClassifier:
             logger.warning("empty_text_for_classification")
             return DocumentType.UNKNOWN
 
-        # Use first 3000 characters for classification
-        sample_text = text[:3000]
+        # Nothing past this prefix affects the result
+        head = text[:CLASSIFICATION_MAX_CHARS]
+
+        # Most documents name their type in the first paragraphs
+        document_type = self._classify_by_keywords(head)
+        if document_type is not None:
+            logger.info("document_classified_by_keywords", document_type=document_type.value)
+            return document_type
+
+        key = hashlib.blake2b(head.encode(), digest_size=16).digest()
+        document_type = self._cache.get(key)
+        if document_type is not None:
+            self._cache.move_to_end(key)
+            logger.info("document_classified_from_cache", document_type=document_type.value)
+            return document_type
+
+        # Use the first tokens for classification, cut at a token boundary
+        tokens = self.encoding.encode_ordinary(head)
+        sample_text = self.encoding.decode(tokens[:CLASSIFICATION_MAX_TOKENS])
 
         logger.info("classifying_document", text_length=len(text))
 
@@ -86,15 +170,7 @@ class DocumentClassifier:
             result = response.choices[0].message.content.strip().lower()
 
             # Map result to DocumentType
-            type_mapping = {
-                "mietvertrag": DocumentType.MIETVERTRAG,
-                "gutachten": DocumentType.GUTACHTEN,
-                "grundbuchauszug": DocumentType.GRUNDBUCHAUSZUG,
-                "nebenkostenabrechnung": DocumentType.NEBENKOSTENABRECHNUNG,
-                "unknown": DocumentType.UNKNOWN,
-            }
-
-            document_type = type_mapping.get(result, DocumentType.UNKNOWN)
+            document_type = DOCUMENT_TYPES_BY_NAME.get(result, DocumentType.UNKNOWN)
 
             logger.info(
                 "document_classified",
@@ -102,8 +178,35 @@ class DocumentClassifier:
                 document_type=document_type.value,
             )
 
+            if self.cache_size > 0:
+                self._cache[key] = document_type
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
             return document_type
 
         except Exception as e:
-            logger.error("classification_error", error=str(e))
+            logger.error("classification_error", error=e)
             raise ClassificationError(f"Failed to classify document: {e}") from e
+
+    @staticmethod
+    def _classify_by_keywords(sample_text: str) -> DocumentType | None:
+        """Return the document type if its keywords clearly dominate, else None."""
+        sample_text = sample_text.lower()
+        scores = sorted(
+            (
+                (sum(hint in sample_text for hint in hints), document_type)
+                for document_type, hints in KEYWORD_HINTS.items()
+            ),
+            reverse=True,
+        )
+        (best, document_type), (runner_up, _) = scores[0], scores[1]
+        if best >= KEYWORD_MIN_HITS and best - runner_up >= KEYWORD_MARGIN:
+            return document_type
+        return None
+
+
+@lru_cache
+def get_classifier() -> DocumentClassifier:
+    """Get the process-wide document classifier."""
+    return DocumentClassifier()
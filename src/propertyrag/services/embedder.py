@@ -1,9 +1,19 @@
 """Embedding service using OpenAI API."""
 
+import asyncio
+import base64
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import tiktoken
 from openai import AsyncOpenAI
 
 from propertyrag.core.config import get_settings
 from propertyrag.core.logging import get_logger
+from propertyrag.core.openai_client import get_openai_client
+from propertyrag.db.repository import EmbeddingCacheRepository
 from propertyrag.services.chunker import TextChunk
 
 logger = get_logger(__name__)
@@ -12,6 +22,12 @@ logger = get_logger(__name__)
 MAX_TOKENS_PER_REQUEST = 8191
 # Maximum batch size for embeddings API
 MAX_BATCH_SIZE = 2048
+# Texts per request when embedding many texts concurrently
+EMBEDDING_BATCH_SIZE = 100
+# Token budget per request when embedding many texts (the API allows 300k)
+EMBEDDING_BATCH_TOKENS = 50_000
+# Embedding requests in flight at once per Embedder
+MAX_CONCURRENT_REQUESTS = 8
 
 
 class EmbeddingError(Exception):
@@ -20,20 +36,46 @@ class EmbeddingError(Exception):
     pass
 
 
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    """Get the tokenizer of an embedding model."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _to_array(embedding: str | list[float] | np.ndarray) -> np.ndarray:
+    """Convert an embedding (base64 float32 as sent by the API, or a sequence) to float32."""
+    if isinstance(embedding, str):
+        return np.frombuffer(base64.b64decode(embedding), dtype=np.float32)
+    return np.asarray(embedding, dtype=np.float32)
+
+
 class Embedder:
     """Service for generating embeddings using OpenAI."""
 
-    def __init__(self, client: AsyncOpenAI | None = None) -> None:
+    def __init__(
+        self,
+        client: AsyncOpenAI | None = None,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    ) -> None:
         """
         Initialize the embedder.
 
         Args:
-            client: Optional AsyncOpenAI client. If not provided, creates one.
+            client: Optional AsyncOpenAI client. Uses the shared client if not provided.
+            max_concurrency: Embedding requests in flight at once, across all
+                calls on this embedder.
         """
         settings = get_settings()
-        self.client = client or AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = client or get_openai_client()
         self.model = settings.openai_embedding_model
         self.dimensions = settings.embedding_dimensions
+        self.cache_max_entries = settings.embedding_cache_max_entries
+        self.query_cache_size = settings.query_embedding_cache_size
+        self._query_cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self.encoding = _get_encoding(self.model)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
 
         logger.info(
             "embedder_initialized",
@@ -41,7 +83,7 @@ class Embedder:
             dimensions=self.dimensions,
         )
 
-    async def embed_text(self, text: str) -> list[float]:
+    async def embed_text(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text.
 
@@ -49,7 +91,7 @@ class Embedder:
             text: Text to embed.
 
         Returns:
-            Embedding vector as list of floats.
+            Embedding vector as a float32 array.
 
         Raises:
             EmbeddingError: If embedding generation fails.
@@ -59,56 +101,115 @@ class Embedder:
                 model=self.model,
                 input=text,
                 dimensions=self.dimensions,
+                encoding_format="base64",
             )
-            return response.data[0].embedding
+            return _to_array(response.data[0].embedding)
 
         except Exception as e:
-            logger.error("embedding_error", error=str(e), text_length=len(text))
+            logger.error("embedding_error", error=e, text_length=len(text))
             raise EmbeddingError(f"Failed to generate embedding: {e}") from e
 
-    async def embed_texts(self, texts: list[str]) -> list[list[float]]:
+    async def embed_query(self, query: str) -> np.ndarray:
+        """
+        Generate the embedding of a search query, reusing recent ones.
+
+        Queries are keyed by their whitespace-normalized text, and the most
+        recently used ``query_cache_size`` embeddings are kept in memory.
+
+        Args:
+            query: Query text to embed.
+
+        Returns:
+            Read-only embedding vector as a float32 array.
+
+        Raises:
+            EmbeddingError: If embedding generation fails.
+        """
+        query = " ".join(query.split())
+        key = hashlib.blake2b(query.encode(), digest_size=16).digest()
+        embedding = self._query_cache.get(key)
+        if embedding is not None:
+            self._query_cache.move_to_end(key)
+            return embedding
+
+        embedding = await self.embed_text(query)
+        if self.query_cache_size > 0:
+            # Shared between callers, so guard against in-place changes
+            embedding.flags.writeable = False
+            self._query_cache[key] = embedding
+            if len(self._query_cache) > self.query_cache_size:
+                self._query_cache.popitem(last=False)
+        return embedding
+
+    async def embed_texts(self, texts: list[str]) -> np.ndarray:
         """
         Generate embeddings for multiple texts.
 
-        Handles batching automatically to stay within API limits.
+        Repeated texts (headers, boilerplate clauses) are embedded once and
+        their embedding is copied to every position. Texts are tokenized
+        once, sorted by token count and packed into
+        batches of at most EMBEDDING_BATCH_SIZE texts and EMBEDDING_BATCH_TOKENS
+        tokens, which are sent concurrently (bounded by ``max_concurrency``).
+        Texts longer than MAX_TOKENS_PER_REQUEST are truncated. Results are
+        returned in input order.
+
+        Embeddings are requested base64-encoded and decoded straight into
+        float32 arrays, so no Python float objects are created per value.
 
         Args:
             texts: List of texts to embed.
 
         Returns:
-            List of embedding vectors.
+            Embedding matrix of shape (len(texts), dimensions).
 
         Raises:
             EmbeddingError: If embedding generation fails.
         """
         if not texts:
-            return []
+            return np.empty((0, self.dimensions), dtype=np.float32)
+
+        unique = list(dict.fromkeys(texts))
+        if len(unique) < len(texts):
+            embeddings = await self.embed_texts(unique)
+            position = {text: i for i, text in enumerate(unique)}
+            return embeddings[[position[text] for text in texts]]
 
         logger.info("embedding_texts", count=len(texts))
 
-        try:
-            # Process in batches
-            all_embeddings: list[list[float]] = []
+        token_lists = self.encoding.encode_ordinary_batch(texts)
+        inputs = list(texts)
+        for i, tokens in enumerate(token_lists):
+            if len(tokens) > MAX_TOKENS_PER_REQUEST:
+                logger.warning("embedding_input_truncated", token_count=len(tokens))
+                inputs[i] = self.encoding.decode(tokens[:MAX_TOKENS_PER_REQUEST])
+        sizes = [min(len(tokens), MAX_TOKENS_PER_REQUEST) for tokens in token_lists]
 
-            for i in range(0, len(texts), MAX_BATCH_SIZE):
-                batch = texts[i : i + MAX_BATCH_SIZE]
+        # Group texts of similar length so batches are evenly sized
+        order = sorted(range(len(texts)), key=sizes.__getitem__)
+        batches = self._pack_batches(order, sizes)
 
+        async def embed_batch(indices: list[int]) -> np.ndarray:
+            async with self._semaphore:
                 response = await self.client.embeddings.create(
                     model=self.model,
-                    input=batch,
+                    input=[inputs[i] for i in indices],
                     dimensions=self.dimensions,
+                    encoding_format="base64",
                 )
 
-                # Sort by index to maintain order
-                sorted_data = sorted(response.data, key=lambda x: x.index)
-                batch_embeddings = [item.embedding for item in sorted_data]
-                all_embeddings.extend(batch_embeddings)
+            logger.debug("batch_embedded", batch_size=len(indices))
 
-                logger.debug(
-                    "batch_embedded",
-                    batch_start=i,
-                    batch_size=len(batch),
-                )
+            # Sort by index to maintain order within the batch
+            sorted_data = sorted(response.data, key=lambda x: x.index)
+            return np.stack([_to_array(item.embedding) for item in sorted_data])
+
+        try:
+            results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+
+            # Map embeddings back to their original positions
+            stacked = np.concatenate(results)
+            all_embeddings = np.empty_like(stacked)
+            all_embeddings[np.concatenate(batches)] = stacked
 
             logger.info(
                 "texts_embedded",
@@ -119,17 +220,89 @@ class Embedder:
             return all_embeddings
 
         except Exception as e:
-            logger.error("embedding_batch_error", error=str(e), text_count=len(texts))
+            logger.error("embedding_batch_error", error=e, text_count=len(texts))
             raise EmbeddingError(f"Failed to generate embeddings: {e}") from e
 
+    @staticmethod
+    def _pack_batches(order: list[int], sizes: list[int]) -> list[list[int]]:
+        """Greedily pack text indices into batches within the count and token limits."""
+        batches: list[list[int]] = []
+        batch: list[int] = []
+        batch_tokens = 0
+
+        for i in order:
+            if batch and (
+                len(batch) == EMBEDDING_BATCH_SIZE
+                or batch_tokens + sizes[i] > EMBEDDING_BATCH_TOKENS
+            ):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(i)
+            batch_tokens += sizes[i]
+
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def embed_texts_cached(
+        self, texts: list[str], cache: EmbeddingCacheRepository
+    ) -> np.ndarray:
+        """
+        Generate embeddings for multiple texts, reusing cached results.
+
+        Texts are looked up by SHA-256 of their content for the configured
+        model. Only misses are sent to the API (each distinct text once), and
+        their embeddings are written back to the cache.
+
+        Args:
+            texts: List of texts to embed.
+            cache: Repository of previously computed embeddings.
+
+        Returns:
+            Embedding matrix in input order.
+
+        Raises:
+            EmbeddingError: If embedding generation fails.
+        """
+        if not texts:
+            return np.empty((0, self.dimensions), dtype=np.float32)
+
+        hashes = [hashlib.sha256(text.encode("utf-8")).digest() for text in texts]
+        cached = await cache.get_many(self.model, list(set(hashes)))
+
+        # Embed each uncached text once, even if it repeats within the batch
+        missing = {h: text for h, text in zip(hashes, texts, strict=True) if h not in cached}
+        if missing:
+            embeddings = await self.embed_texts(list(missing.values()))
+            new = dict(zip(missing.keys(), embeddings, strict=True))
+            await cache.add_many(self.model, new)
+            cached.update(new)
+            if self.cache_max_entries:
+                evicted = await cache.evict(self.cache_max_entries)
+                if evicted:
+                    logger.info("embedding_cache_evicted", count=evicted)
+
+        logger.info(
+            "embedding_cache_lookup",
+            count=len(texts),
+            misses=len(missing),
+            hit_rate=round(1 - len(missing) / len(hashes), 3),
+        )
+
+        return np.stack([_to_array(cached[h]) for h in hashes])
+
     async def embed_chunks(
-        self, chunks: list[TextChunk]
-    ) -> list[tuple[TextChunk, list[float]]]:
+        self,
+        chunks: list[TextChunk],
+        cache: EmbeddingCacheRepository | None = None,
+    ) -> list[tuple[TextChunk, np.ndarray]]:
         """
         Generate embeddings for a list of chunks.
 
         Args:
             chunks: List of text chunks.
+            cache: Optional embedding cache to reuse and store results.
 
         Returns:
             List of tuples (chunk, embedding).
@@ -143,6 +316,15 @@ class Embedder:
         logger.info("embedding_chunks", count=len(chunks))
 
         texts = [chunk.content for chunk in chunks]
-        embeddings = await self.embed_texts(texts)
+        if cache is not None:
+            embeddings = await self.embed_texts_cached(texts, cache)
+        else:
+            embeddings = await self.embed_texts(texts)
 
         return list(zip(chunks, embeddings, strict=True))
+
+
+@lru_cache
+def get_embedder() -> Embedder:
+    """Get the process-wide embedder (its concurrency limit is shared by all callers)."""
+    return Embedder()
@@ -81,6 +81,13 @@ Zu extrahierende Felder:
 Dokumenttext:
 {text}"""
 
+# Prepended to the prompt when several documents share one request
+PACKED_EXTRACTION_NOTE = """Der Dokumenttext unten enthält mehrere unabhängige Dokumente,
+jeweils in <dokument index="..."> eingeschlossen. Extrahiere die Felder für jedes Dokument
+einzeln und gib sie unter "results" zurück, jeweils mit dem index des Dokuments.
+
+"""
+
 # Mapping of document types to prompts
 EXTRACTION_PROMPTS = {
     "mietvertrag": MIETVERTRAG_PROMPT,
@@ -88,3 +95,14 @@ EXTRACTION_PROMPTS = {
     "grundbuchauszug": GRUNDBUCHAUSZUG_PROMPT,
     "nebenkostenabrechnung": NEBENKOSTENABRECHNUNG_PROMPT,
 }
+
+
+def _field_list(prompt: str) -> str:
+    """Return the field list section of an extraction prompt."""
+    return prompt.split("Zu extrahierende Felder:")[1].split("Dokumenttext:")[0].strip()
+
+
+# Field names and descriptions per type, embedded to find the relevant chunks
+EXTRACTION_PROBES = {
+    document_type: _field_list(prompt) for document_type, prompt in EXTRACTION_PROMPTS.items()
+}
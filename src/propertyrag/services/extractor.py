@@ -1,8 +1,12 @@
 """Structured data extraction service using OpenAI."""
 
+import asyncio
 import json
-from typing import Any
+from functools import lru_cache
+from typing import Any, Final
 
+import numpy as np
+import tiktoken
 from openai import AsyncOpenAI
 from pydantic import ValidationError
 
@@ -16,7 +20,14 @@ from propertyrag.core.models import (
     MietvertragData,
     NebenkostenabrechnungData,
 )
-from propertyrag.services.extraction_prompts import EXTRACTION_PROMPTS
+from propertyrag.core.openai_client import get_openai_client
+from propertyrag.services.classifier import ClassificationError, DocumentClassifier
+from propertyrag.services.embedder import Embedder, EmbeddingError, get_embedder
+from propertyrag.services.extraction_prompts import (
+    EXTRACTION_PROBES,
+    EXTRACTION_PROMPTS,
+    PACKED_EXTRACTION_NOTE,
+)
 
 logger = get_logger(__name__)
 
@@ -29,6 +40,102 @@ EXTRACTION_MODELS: dict[DocumentType, type[ExtractedData]] = {
 }
 
 
+def _strict_schema(model_class: type[ExtractedData]) -> dict[str, Any]:
+    """
+    Turn a model's JSON schema into one accepted by strict structured outputs.
+
+    Strict mode requires every property to be listed as required (optional
+    fields stay nullable) and no additional properties. Defaults and titles
+    are dropped, amounts are requested as numbers only, and the ``kind``
+    union tag is left out since it is set from the document type.
+    """
+
+    def convert(node: Any) -> Any:
+        if isinstance(node, list):
+            return [convert(item) for item in node]
+        if not isinstance(node, dict):
+            return node
+
+        converted = {}
+        for key, value in node.items():
+            if key in ("properties", "$defs"):
+                # Keys of these maps are names, not schema keywords
+                converted[key] = {name: convert(item) for name, item in value.items()}
+            elif key not in ("default", "title"):
+                converted[key] = convert(value)
+        node = converted
+
+        variants = node.get("anyOf", [])
+        if {"type": "number"} in variants:
+            node["anyOf"] = [v for v in variants if v != {"type": "string"}]
+        if node.get("type") == "object":
+            node["additionalProperties"] = False
+            node["required"] = list(node.get("properties", {}))
+        return node
+
+    schema = model_class.model_json_schema()
+    schema["properties"].pop("kind", None)
+    return convert(schema)
+
+
+# Structured output schemas sent with each extraction request
+EXTRACTION_SCHEMAS: dict[DocumentType, dict[str, Any]] = {
+    document_type: _strict_schema(model_class)
+    for document_type, model_class in EXTRACTION_MODELS.items()
+}
+
+
+def _packed_schema(schema: dict[str, Any]) -> dict[str, Any]:
+    """
+    Wrap a strict extraction schema into one returning results for many documents.
+
+    Each result carries the index of its document. Shared definitions are
+    moved to the root, where the schema's ``#/$defs/...`` references point.
+    """
+    item = {key: value for key, value in schema.items() if key != "$defs"}
+    packed: dict[str, Any] = {
+        "type": "object",
+        "properties": {
+            "results": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"index": {"type": "integer"}, "data": item},
+                    "required": ["index", "data"],
+                    "additionalProperties": False,
+                },
+            }
+        },
+        "required": ["results"],
+        "additionalProperties": False,
+    }
+    if "$defs" in schema:
+        packed["$defs"] = schema["$defs"]
+    return packed
+
+
+# Schemas for requests extracting several short documents at once
+PACKED_EXTRACTION_SCHEMAS: dict[DocumentType, dict[str, Any]] = {
+    document_type: _packed_schema(schema)
+    for document_type, schema in EXTRACTION_SCHEMAS.items()
+}
+
+# Documents up to this many tokens are packed into shared requests by
+# extract_many; the limits per request keep prompt and output well inside
+# the model's context and output windows
+PACKED_DOCUMENT_MAX_TOKENS = 1500
+PACKED_MAX_DOCUMENTS = 8
+PACKED_MAX_TOKENS = 8000
+
+# Batch API endpoint used for bulk extraction
+BATCH_ENDPOINT: Final = "/v1/chat/completions"
+BATCH_POLL_INTERVAL_SECONDS = 30
+BATCH_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+# Documents classified and extracted at once by classify_and_extract_many
+MAX_CONCURRENT_EXTRACTIONS = 8
+
+
 class ExtractionError(Exception):
     """Error during data extraction."""
 
@@ -38,28 +145,46 @@ class ExtractionError(Exception):
 class DataExtractor:
     """Service for extracting structured data from documents."""
 
-    def __init__(self, client: AsyncOpenAI | None = None) -> None:
+    def __init__(
+        self, client: AsyncOpenAI | None = None, embedder: Embedder | None = None
+    ) -> None:
         """
         Initialize the extractor.
 
         Args:
-            client: Optional AsyncOpenAI client. If not provided, creates one.
+            client: Optional AsyncOpenAI client. Uses the shared client if not provided.
+            embedder: Optional embedder for the field probes. Created on first use
+                if not provided.
         """
         settings = get_settings()
-        self.client = client or AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = client or get_openai_client()
         self.model = settings.openai_chat_model
+        self.top_k = settings.extraction_top_k
+        self.encoding = tiktoken.get_encoding("cl100k_base")
+        self.embedder = embedder
+        self._probe_embeddings: dict[DocumentType, np.ndarray] = {}
 
         logger.info("extractor_initialized", model=self.model)
 
     async def extract(
-        self, text: str, document_type: DocumentType
+        self,
+        text: str,
+        document_type: DocumentType,
+        chunks: list[str] | None = None,
+        chunk_embeddings: np.ndarray | None = None,
     ) -> tuple[ExtractedData, float]:
         """
         Extract structured data from document text.
 
+        When the document's chunks and their embeddings are given, only the
+        chunks closest to the document type's field probe are sent, in
+        document order, instead of the full text.
+
         Args:
             text: Full document text.
             document_type: Type of document to extract.
+            chunks: Optional chunk texts in document order.
+            chunk_embeddings: Optional (N, D) embeddings of ``chunks``.
 
         Returns:
             Tuple of (extracted data model, confidence score).
@@ -67,15 +192,11 @@ class DataExtractor:
         Raises:
             ExtractionError: If extraction fails or document type not supported.
         """
-        if document_type == DocumentType.UNKNOWN:
-            raise ExtractionError("Cannot extract data from unknown document type")
-
-        if document_type not in EXTRACTION_MODELS:
-            raise ExtractionError(f"Unsupported document type: {document_type}")
-
-        prompt_template = EXTRACTION_PROMPTS.get(document_type.value)
-        if not prompt_template:
-            raise ExtractionError(f"No extraction prompt for: {document_type}")
+        # Built first so unsupported types fail before any probe is embedded
+        body = self._request_body(text, document_type)
+        if chunks is not None and chunk_embeddings is not None:
+            text = await self._select_relevant(text, document_type, chunks, chunk_embeddings)
+            body = self._request_body(text, document_type)
 
         logger.info(
             "extracting_data",
@@ -84,51 +205,11 @@ class DataExtractor:
         )
 
         try:
-            # Use response_format for JSON output
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Du bist ein Experte für die Analyse von Immobiliendokumenten. "
-                        "Extrahiere die angeforderten Informationen präzise und vollständig. "
-                        "Antworte ausschließlich im JSON-Format.",
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt_template.format(text=text),
-                    },
-                ],
-                response_format={"type": "json_object"},
-                temperature=0,
+            response = await self.client.chat.completions.create(**body)
+            extracted_data, confidence = self._parse_response(
+                response.choices[0].message.content, document_type
             )
 
-            raw_json = response.choices[0].message.content
-
-            # Parse JSON response
-            try:
-                data_dict = json.loads(raw_json)
-            except json.JSONDecodeError as e:
-                logger.error("json_parse_error", error=str(e), raw=raw_json[:500])
-                raise ExtractionError(f"Failed to parse JSON response: {e}") from e
-
-            # Validate and convert to Pydantic model
-            model_class = EXTRACTION_MODELS[document_type]
-            try:
-                extracted_data = model_class.model_validate(data_dict)
-            except ValidationError as e:
-                logger.warning(
-                    "validation_error",
-                    error=str(e),
-                    data=data_dict,
-                )
-                # Try to salvage what we can by cleaning the data
-                cleaned_data = self._clean_data(data_dict, model_class)
-                extracted_data = model_class.model_validate(cleaned_data)
-
-            # Calculate confidence based on how many fields were extracted
-            confidence = self._calculate_confidence(extracted_data)
-
             logger.info(
                 "extraction_completed",
                 document_type=document_type.value,
@@ -140,58 +221,377 @@ class DataExtractor:
         except ExtractionError:
             raise
         except Exception as e:
-            logger.error("extraction_error", error=str(e))
+            logger.error("extraction_error", error=e)
             raise ExtractionError(f"Extraction failed: {e}") from e
 
-    def _clean_data(self, data: dict[str, Any], model_class: type) -> dict[str, Any]:
-        """Clean and normalize extracted data to match model expectations."""
-        cleaned = {}
+    async def extract_batch(
+        self, items: list[tuple[str, DocumentType]]
+    ) -> list[tuple[ExtractedData, float] | None]:
+        """
+        Extract structured data for many documents through the OpenAI Batch API.
+
+        All requests are uploaded as one JSONL file and run by OpenAI within
+        a 24 hour window at half the price of interactive calls. This waits
+        for the batch to finish, so it is meant for bulk re-extraction jobs,
+        not the upload path.
+
+        Args:
+            items: (text, document type) pairs.
+
+        Returns:
+            One (extracted data, confidence) tuple per item in input order, or
+            None for items whose request or validation failed.
+
+        Raises:
+            ExtractionError: If a document type is not supported or the batch fails.
+        """
+        if not items:
+            return []
+
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": self._request_body(text, document_type),
+                },
+                ensure_ascii=False,
+            )
+            for i, (text, document_type) in enumerate(items)
+        ]
+
+        try:
+            input_file = await self.client.files.create(
+                file=("extraction.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch",
+            )
+            batch = await self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint=BATCH_ENDPOINT,
+                completion_window="24h",
+            )
+            logger.info("extraction_batch_submitted", batch_id=batch.id, count=len(items))
+
+            while batch.status not in BATCH_FINAL_STATUSES:
+                await asyncio.sleep(BATCH_POLL_INTERVAL_SECONDS)
+                batch = await self.client.batches.retrieve(batch.id)
 
-        # Get model fields
-        model_fields = model_class.model_fields
+            if batch.status != "completed":
+                raise ExtractionError(f"Extraction batch {batch.id} ended as {batch.status}")
 
-        for field_name, field_info in model_fields.items():
-            if field_name not in data:
+            output = ""
+            if batch.output_file_id:
+                output = (await self.client.files.content(batch.output_file_id)).text
+
+        except ExtractionError:
+            raise
+        except Exception as e:
+            logger.error("extraction_batch_error", error=e, count=len(items))
+            raise ExtractionError(f"Batch extraction failed: {e}") from e
+
+        results: list[tuple[ExtractedData, float] | None] = [None] * len(items)
+        for line in output.splitlines():
+            try:
+                record = json.loads(line)
+                i = int(record["custom_id"])
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning("extraction_batch_line_invalid", error=e)
+                continue
+            if not 0 <= i < len(items):
+                logger.warning("extraction_batch_line_invalid", custom_id=i)
                 continue
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                logger.warning("extraction_batch_item_failed", index=i, error=record.get("error"))
+                continue
+            try:
+                results[i] = self._parse_response(
+                    response["body"]["choices"][0]["message"]["content"], items[i][1]
+                )
+            except (ExtractionError, KeyError, IndexError, TypeError) as e:
+                logger.warning("extraction_batch_item_failed", index=i, error=e)
+
+        logger.info(
+            "extraction_batch_completed",
+            batch_id=batch.id,
+            count=len(items),
+            failed=results.count(None),
+        )
+
+        return results
 
-            value = data[field_name]
+    async def extract_many(
+        self,
+        items: list[tuple[str, DocumentType]],
+        concurrency: int = MAX_CONCURRENT_EXTRACTIONS,
+    ) -> list[tuple[ExtractedData, float] | None]:
+        """
+        Extract structured data for many documents, packing short ones together.
+
+        Short documents of the same type share one chat completion that
+        returns a result per document, so per-request latency is paid once
+        per group instead of once per document. Long documents and groups
+        of one are extracted on their own. At most ``concurrency`` requests
+        are in flight.
+
+        Args:
+            items: (text, document type) pairs.
+            concurrency: Maximum number of requests run at once.
 
-            # Skip None values
-            if value is None:
-                cleaned[field_name] = None
+        Returns:
+            One (extracted data, confidence) tuple per item in input order, or
+            None for items whose request or validation failed.
+
+        Raises:
+            ExtractionError: If a document type is not supported.
+        """
+        # Fail on unsupported types before sending anything
+        for _, document_type in items:
+            self._request_body("", document_type)
+
+        sizes = [
+            len(tokens)
+            for tokens in self.encoding.encode_ordinary_batch([text for text, _ in items])
+        ]
+
+        # Greedily fill groups per document type under the packing limits
+        groups: list[list[int]] = []
+        open_groups: dict[DocumentType, tuple[list[int], int]] = {}
+        for i, (_, document_type) in enumerate(items):
+            if sizes[i] > PACKED_DOCUMENT_MAX_TOKENS:
+                groups.append([i])
                 continue
+            group, total = open_groups.get(document_type, ([], 0))
+            if len(group) == PACKED_MAX_DOCUMENTS or total + sizes[i] > PACKED_MAX_TOKENS:
+                group, total = [], 0
+            if not group:
+                groups.append(group)
+            group.append(i)
+            open_groups[document_type] = (group, total + sizes[i])
+
+        results: list[tuple[ExtractedData, float] | None] = [None] * len(items)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(group: list[int]) -> None:
+            async with semaphore:
+                if len(group) == 1:
+                    text, document_type = items[group[0]]
+                    try:
+                        results[group[0]] = await self.extract(text, document_type)
+                    except ExtractionError:
+                        pass
+                    return
+                for i, result in zip(group, await self._extract_packed(items, group)):
+                    results[i] = result
+
+        await asyncio.gather(*(run(group) for group in groups))
+
+        logger.info(
+            "extract_many_completed",
+            count=len(items),
+            requests=len(groups),
+            failed=results.count(None),
+        )
+
+        return results
+
+    async def classify_and_extract_many(
+        self,
+        texts: list[str],
+        classifier: DocumentClassifier,
+        concurrency: int = MAX_CONCURRENT_EXTRACTIONS,
+    ) -> list[tuple[DocumentType, tuple[ExtractedData, float] | None]]:
+        """
+        Classify and extract many documents concurrently.
+
+        Each document is classified and then extracted by its own task, so
+        one document's extraction overlaps with the next one's
+        classification. At most ``concurrency`` documents are in flight.
+
+        Args:
+            texts: Full document texts.
+            classifier: Classifier for detecting each document's type.
+            concurrency: Maximum number of documents processed at once.
+
+        Returns:
+            One (document type, extraction) pair per text in input order. The
+            extraction is None for unknown types and failed extractions; a
+            failed classification counts as unknown.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def process(
+            text: str,
+        ) -> tuple[DocumentType, tuple[ExtractedData, float] | None]:
+            async with semaphore:
+                try:
+                    document_type = await classifier.classify(text)
+                except ClassificationError:
+                    return DocumentType.UNKNOWN, None
+                if document_type == DocumentType.UNKNOWN:
+                    return document_type, None
+                try:
+                    return document_type, await self.extract(text, document_type)
+                except ExtractionError:
+                    return document_type, None
+
+        return list(await asyncio.gather(*(process(text) for text in texts)))
+
+    async def _select_relevant(
+        self,
+        text: str,
+        document_type: DocumentType,
+        chunks: list[str],
+        chunk_embeddings: np.ndarray,
+    ) -> str:
+        """Join the top-k chunks most similar to the type's probe, or return ``text``."""
+        if self.top_k <= 0 or len(chunks) <= self.top_k:
+            return text
+
+        probe = await self.probe_embedding(document_type)
+        if probe is None:
+            return text
+
+        # Embeddings are unit length, so the dot product is the cosine similarity
+        scores = np.asarray(chunk_embeddings, dtype=np.float32) @ probe
+        top = np.sort(np.argpartition(-scores, self.top_k - 1)[: self.top_k])
+
+        logger.debug(
+            "extraction_chunks_selected",
+            document_type=document_type.value,
+            selected=len(top),
+            total=len(chunks),
+        )
+
+        return "\n\n".join(chunks[i] for i in top)
+
+    async def probe_embedding(self, document_type: DocumentType) -> np.ndarray | None:
+        """
+        Get the embedding of a document type's field probe.
+
+        All probes are embedded together on first use and kept for the
+        extractor's lifetime.
+
+        Args:
+            document_type: Supported document type.
+
+        Returns:
+            The probe embedding, or None if it could not be embedded.
+        """
+        if document_type not in self._probe_embeddings:
+            if self.embedder is None:
+                self.embedder = Embedder(client=self.client)
 
-            # Handle numeric fields that might come as strings
-            field_type = field_info.annotation
-            if field_type in (int, float, "int | None", "float | None"):
-                if isinstance(value, str):
-                    # Try to extract number from string
-                    value = self._extract_number(value)
+            document_types = list(EXTRACTION_MODELS)
+            try:
+                embeddings = await self.embedder.embed_texts(
+                    [EXTRACTION_PROBES[dt.value] for dt in document_types]
+                )
+            except EmbeddingError as e:
+                logger.warning("extraction_probe_failed", error=e)
+                return None
+            self._probe_embeddings.update(zip(document_types, embeddings, strict=True))
+
+        return self._probe_embeddings[document_type]
+
+    async def _extract_packed(
+        self, items: list[tuple[str, DocumentType]], group: list[int]
+    ) -> list[tuple[ExtractedData, float] | None]:
+        """Extract several documents of one type with a single chat completion."""
+        document_type = items[group[0]][1]
+        documents = "\n\n".join(
+            f'<dokument index="{position}">\n{items[i][0]}\n</dokument>'
+            for position, i in enumerate(group)
+        )
+        body = self._request_body(documents, document_type)
+        body["messages"][1]["content"] = PACKED_EXTRACTION_NOTE + body["messages"][1]["content"]
+        body["response_format"]["json_schema"]["schema"] = PACKED_EXTRACTION_SCHEMAS[
+            document_type
+        ]
 
-            cleaned[field_name] = value
+        logger.info(
+            "extracting_data_packed",
+            document_type=document_type.value,
+            count=len(group),
+        )
 
-        return cleaned
+        results: list[tuple[ExtractedData, float] | None] = [None] * len(group)
+        try:
+            response = await self.client.chat.completions.create(**body)
+            packed = json.loads(response.choices[0].message.content)
+        except Exception as e:
+            logger.error("extraction_error", error=e, count=len(group))
+            return results
 
-    def _extract_number(self, value: str) -> float | int | None:
-        """Extract a number from a string."""
-        import re
+        model_class = EXTRACTION_MODELS[document_type]
+        for result in packed.get("results", []):
+            position = result.get("index")
+            if not isinstance(position, int) or not 0 <= position < len(group):
+                continue
+            try:
+                data = model_class.model_validate(result.get("data"))
+            except ValidationError as e:
+                logger.warning("extraction_packed_item_failed", index=position, error=e)
+                continue
+            results[position] = (data, self._calculate_confidence(data))
 
-        if not value:
-            return None
+        return results
 
-        # Remove common formatting
-        cleaned = value.replace(".", "").replace(",", ".").replace(" ", "")
-        cleaned = re.sub(r"[€$%]", "", cleaned)
+    def _request_body(self, text: str, document_type: DocumentType) -> dict[str, Any]:
+        """Build the chat completion request for extracting one document."""
+        if document_type == DocumentType.UNKNOWN:
+            raise ExtractionError("Cannot extract data from unknown document type")
+
+        if document_type not in EXTRACTION_MODELS:
+            raise ExtractionError(f"Unsupported document type: {document_type}")
+
+        prompt_template = EXTRACTION_PROMPTS.get(document_type.value)
+        if not prompt_template:
+            raise ExtractionError(f"No extraction prompt for: {document_type}")
 
-        # Try to find a number
-        match = re.search(r"-?\d+\.?\d*", cleaned)
-        if match:
-            num_str = match.group()
-            if "." in num_str:
-                return float(num_str)
-            return int(num_str)
+        return {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "Du bist ein Experte für die Analyse von Immobiliendokumenten. "
+                    "Extrahiere die angeforderten Informationen präzise und vollständig. "
+                    "Antworte ausschließlich im JSON-Format.",
+                },
+                {
+                    "role": "user",
+                    "content": prompt_template.format(text=text),
+                },
+            ],
+            # Structured outputs: the response is guaranteed to match the schema
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": document_type.value,
+                    "schema": EXTRACTION_SCHEMAS[document_type],
+                    "strict": True,
+                },
+            },
+            "temperature": 0,
+        }
+
+    def _parse_response(
+        self, raw_json: str, document_type: DocumentType
+    ) -> tuple[ExtractedData, float]:
+        """Validate a JSON completion into the document type's model and score it."""
+        # Parsed and validated in one pass by pydantic-core, without an
+        # intermediate dict. The schema is enforced by the API, so this
+        # mostly converts types.
+        model_class = EXTRACTION_MODELS[document_type]
+        try:
+            extracted_data = model_class.model_validate_json(raw_json)
+        except ValidationError as e:
+            logger.error("validation_error", error=e, raw=raw_json[:500])
+            raise ExtractionError(f"Failed to parse extracted data: {e}") from e
 
-        return None
+        # Calculate confidence based on how many fields were extracted
+        return extracted_data, self._calculate_confidence(extracted_data)
 
     def _calculate_confidence(self, data: ExtractedData) -> float:
         """
@@ -199,18 +599,16 @@ class DataExtractor:
 
         Returns a score between 0 and 1.
         """
-        fields = data.model_fields
-        total_fields = len(fields)
-        filled_fields = 0
-
-        for field_name in fields:
-            value = getattr(data, field_name, None)
-            if value is not None:
-                if isinstance(value, list) and len(value) == 0:
-                    continue
-                filled_fields += 1
+        # Iterating a model yields its stored (name, value) pairs directly;
+        # ``kind`` is the union tag, not extracted content
+        values = [value for name, value in data if name != "kind"]
+        filled_fields = sum(
+            1
+            for value in values
+            if value is not None and not (isinstance(value, tuple) and not value)
+        )
 
-        return filled_fields / total_fields if total_fields > 0 else 0.0
+        return filled_fields / len(values) if values else 0.0
 
     async def extract_raw(
         self, text: str, document_type: DocumentType
@@ -229,3 +627,9 @@ class DataExtractor:
         """
         data, _ = await self.extract(text, document_type)
         return data.model_dump()
+
+
+@lru_cache
+def get_extractor() -> DataExtractor:
+    """Get the process-wide extractor, which keeps its field probe embeddings."""
+    return DataExtractor(embedder=get_embedder())
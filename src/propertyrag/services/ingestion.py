@@ -1,26 +1,44 @@
 """Document ingestion pipeline."""
 
+import asyncio
+import hashlib
+from collections.abc import Callable
 from pathlib import Path
+from typing import BinaryIO
 from uuid import UUID
 
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from propertyrag.core.logging import get_logger
 from propertyrag.core.models import DocumentType, ProcessingStatus
+from propertyrag.db.models import ExtractedDataModel
 from propertyrag.db.repository import (
     ChunkRepository,
     DocumentRepository,
+    EmbeddingCacheRepository,
     ExtractedDataRepository,
 )
 from propertyrag.services.chunker import Chunker
-from propertyrag.services.classifier import DocumentClassifier
-from propertyrag.services.embedder import Embedder
-from propertyrag.services.extractor import DataExtractor, ExtractionError
-from propertyrag.services.pdf_parser import PDFParser, PDFParserError
+from propertyrag.services.classifier import DocumentClassifier, get_classifier
+from propertyrag.services.embedder import Embedder, get_embedder
+from propertyrag.services.extractor import DataExtractor, ExtractionError, get_extractor
+from propertyrag.services.pdf_parser import ParsedDocument, PDFParser, PDFParserError
+from propertyrag.services.qvcache import invalidate_on_commit
 
 logger = get_logger(__name__)
 
 
+def _sha256(fp: BinaryIO) -> bytes:
+    """Hash a seekable binary file from its start and rewind it."""
+    digest = hashlib.sha256()
+    fp.seek(0)
+    while block := fp.read(1 << 20):
+        digest.update(block)
+    fp.seek(0)
+    return digest.digest()
+
+
 class IngestionError(Exception):
     """Error during document ingestion."""
 
@@ -34,7 +52,7 @@ class IngestionPipeline:
     Flow:
     1. Create document record (PENDING)
     2. Parse PDF to extract text
-    3. Classify document type (if unknown)
+    3. Classify document type (if unknown), alongside steps 4 and 5
     4. Chunk text into smaller pieces
     5. Generate embeddings for chunks
     6. Store chunks with embeddings
@@ -65,13 +83,14 @@ class IngestionPipeline:
         self.session = session
         self.pdf_parser = pdf_parser or PDFParser()
         self.chunker = chunker or Chunker()
-        self.embedder = embedder or Embedder()
-        self.classifier = classifier or DocumentClassifier()
-        self.extractor = extractor or DataExtractor()
+        self.embedder = embedder or get_embedder()
+        self.classifier = classifier or get_classifier()
+        self.extractor = extractor or get_extractor()
 
         self.doc_repo = DocumentRepository(session)
         self.chunk_repo = ChunkRepository(session)
         self.extracted_repo = ExtractedDataRepository(session)
+        self.embedding_cache = EmbeddingCacheRepository(session)
 
     async def ingest_file(
         self,
@@ -79,6 +98,7 @@ class IngestionPipeline:
         document_type: DocumentType = DocumentType.UNKNOWN,
         project_id: UUID | None = None,
         auto_extract: bool = True,
+        overwrite: bool = False,
     ) -> UUID:
         """
         Ingest a PDF file into the system.
@@ -88,6 +108,7 @@ class IngestionPipeline:
             document_type: Type of document. Defaults to UNKNOWN (will be classified).
             project_id: Optional project ID to associate with.
             auto_extract: Whether to automatically extract structured data.
+            overwrite: Ingest again even if an identical PDF is already in the project.
 
         Returns:
             The document ID.
@@ -97,120 +118,131 @@ class IngestionPipeline:
         """
         logger.info(
             "ingestion_started",
-            file_path=str(file_path),
+            file_path=file_path,
             document_type=document_type.value,
         )
 
-        # Create document record
-        document = await self.doc_repo.create(
+        with file_path.open("rb") as fp:
+            content_hash = await asyncio.to_thread(_sha256, fp)
+
+        return await self._ingest(
             filename=file_path.name,
+            parse=lambda: self.pdf_parser.parse(file_path),
             document_type=document_type,
             project_id=project_id,
+            auto_extract=auto_extract,
+            content_hash=content_hash,
+            overwrite=overwrite,
         )
-        document_id = document.id
 
-        try:
-            # Update status to processing
-            await self.doc_repo.update_status(document_id, ProcessingStatus.PROCESSING)
-
-            # Parse PDF
-            parsed_doc = self.pdf_parser.parse(file_path)
-            full_text = parsed_doc.full_text
-
-            # Classify document if type is unknown
-            if document_type == DocumentType.UNKNOWN:
-                document_type = await self.classifier.classify(full_text)
-                await self.doc_repo.update_type(document_id, document_type)
-                logger.info(
-                    "document_classified",
-                    document_id=str(document_id),
-                    document_type=document_type.value,
-                )
+    async def ingest_bytes(
+        self,
+        content: bytes,
+        filename: str,
+        document_type: DocumentType = DocumentType.UNKNOWN,
+        project_id: UUID | None = None,
+        auto_extract: bool = True,
+        overwrite: bool = False,
+    ) -> UUID:
+        """
+        Ingest a PDF from bytes content.
 
-            # Chunk the document
-            chunks = self.chunker.chunk_document(parsed_doc)
+        Args:
+            content: PDF file content as bytes.
+            filename: Original filename.
+            document_type: Type of document. Defaults to UNKNOWN (will be classified).
+            project_id: Optional project ID to associate with.
+            auto_extract: Whether to automatically extract structured data.
+            overwrite: Ingest again even if an identical PDF is already in the project.
 
-            if not chunks:
-                logger.warning("no_chunks_created", document_id=str(document_id))
-                await self.doc_repo.update_status(
-                    document_id,
-                    ProcessingStatus.COMPLETED,
-                    page_count=parsed_doc.page_count,
-                )
-                return document_id
+        Returns:
+            The document ID.
 
-            # Generate embeddings
-            chunks_with_embeddings = await self.embedder.embed_chunks(chunks)
+        Raises:
+            IngestionError: If ingestion fails.
+        """
+        logger.info(
+            "ingestion_bytes_started",
+            filename=filename,
+            size=len(content),
+            document_type=document_type.value,
+        )
 
-            # Store chunks
-            chunk_data = [
-                {
-                    "content": chunk.content,
-                    "page_number": chunk.page_number,
-                    "chunk_index": chunk.chunk_index,
-                    "token_count": chunk.token_count,
-                    "embedding": embedding,
-                }
-                for chunk, embedding in chunks_with_embeddings
-            ]
+        return await self._ingest(
+            filename=filename,
+            parse=lambda: self.pdf_parser.parse_bytes(content, filename),
+            document_type=document_type,
+            project_id=project_id,
+            auto_extract=auto_extract,
+            content_hash=hashlib.sha256(content).digest(),
+            overwrite=overwrite,
+        )
 
-            await self.chunk_repo.create_many(document_id, chunk_data)
+    async def ingest_stream(
+        self,
+        fp: BinaryIO,
+        filename: str,
+        document_type: DocumentType = DocumentType.UNKNOWN,
+        project_id: UUID | None = None,
+        auto_extract: bool = True,
+        overwrite: bool = False,
+    ) -> UUID:
+        """
+        Ingest a PDF from a seekable binary file object.
 
-            # Extract structured data if enabled and document type is known
-            if auto_extract and document_type != DocumentType.UNKNOWN:
-                await self._extract_and_store(document_id, full_text, document_type)
+        The parser reads directly from the file handle, so uploads spooled
+        to disk are processed without holding the whole PDF in memory.
 
-            # Update status to completed
-            await self.doc_repo.update_status(
-                document_id,
-                ProcessingStatus.COMPLETED,
-                page_count=parsed_doc.page_count,
-            )
+        Args:
+            fp: Open binary file positioned at the start of the PDF.
+            filename: Original filename.
+            document_type: Type of document. Defaults to UNKNOWN (will be classified).
+            project_id: Optional project ID to associate with.
+            auto_extract: Whether to automatically extract structured data.
+            overwrite: Ingest again even if an identical PDF is already in the project.
 
-            logger.info(
-                "ingestion_completed",
-                document_id=str(document_id),
-                document_type=document_type.value,
-                chunk_count=len(chunks),
-                page_count=parsed_doc.page_count,
-            )
+        Returns:
+            The document ID.
 
-            return document_id
+        Raises:
+            IngestionError: If ingestion fails.
+        """
+        logger.info(
+            "ingestion_stream_started",
+            filename=filename,
+            document_type=document_type.value,
+        )
 
-        except PDFParserError as e:
-            logger.error(
-                "ingestion_parse_error",
-                document_id=str(document_id),
-                error=str(e),
-            )
-            await self.doc_repo.update_status(document_id, ProcessingStatus.FAILED)
-            raise IngestionError(f"Failed to parse PDF: {e}") from e
+        content_hash = await asyncio.to_thread(_sha256, fp)
 
-        except Exception as e:
-            logger.error(
-                "ingestion_error",
-                document_id=str(document_id),
-                error=str(e),
-            )
-            await self.doc_repo.update_status(document_id, ProcessingStatus.FAILED)
-            raise IngestionError(f"Ingestion failed: {e}") from e
+        return await self._ingest(
+            filename=filename,
+            parse=lambda: self.pdf_parser.parse_stream(fp, filename),
+            document_type=document_type,
+            project_id=project_id,
+            auto_extract=auto_extract,
+            content_hash=content_hash,
+            overwrite=overwrite,
+        )
 
-    async def ingest_bytes(
+    async def process_file(
         self,
-        content: bytes,
-        filename: str,
+        document_id: UUID,
+        file_path: Path,
         document_type: DocumentType = DocumentType.UNKNOWN,
         project_id: UUID | None = None,
         auto_extract: bool = True,
     ) -> UUID:
         """
-        Ingest a PDF from bytes content.
+        Ingest a PDF file into an already created (PENDING) document record.
+
+        Used by the background worker for uploads accepted before processing.
 
         Args:
-            content: PDF file content as bytes.
-            filename: Original filename.
+            document_id: ID of the pending document record.
+            file_path: Path to the PDF file.
             document_type: Type of document. Defaults to UNKNOWN (will be classified).
-            project_id: Optional project ID to associate with.
+            project_id: Project the document belongs to.
             auto_extract: Whether to automatically extract structured data.
 
         Returns:
@@ -220,53 +252,147 @@ class IngestionPipeline:
             IngestionError: If ingestion fails.
         """
         logger.info(
-            "ingestion_bytes_started",
-            filename=filename,
-            size=len(content),
+            "ingestion_pending_started",
+            document_id=document_id,
             document_type=document_type.value,
         )
 
+        return await self._process(
+            document_id=document_id,
+            parse=lambda: self.pdf_parser.parse(file_path),
+            document_type=document_type,
+            project_id=project_id,
+            auto_extract=auto_extract,
+        )
+
+    async def _ingest(
+        self,
+        filename: str,
+        parse: Callable[[], ParsedDocument],
+        document_type: DocumentType,
+        project_id: UUID | None,
+        auto_extract: bool,
+        content_hash: bytes,
+        overwrite: bool,
+    ) -> UUID:
+        """
+        Run the ingestion flow for a document from any source.
+
+        Args:
+            filename: Filename stored on the document record.
+            parse: Callable that parses the PDF source.
+            document_type: Type of document. UNKNOWN triggers classification.
+            project_id: Optional project ID to associate with.
+            auto_extract: Whether to automatically extract structured data.
+            content_hash: SHA-256 of the PDF bytes.
+            overwrite: Ingest even if an identical PDF is already in the project.
+
+        Returns:
+            The document ID, or the existing document's ID for a duplicate.
+
+        Raises:
+            IngestionError: If ingestion fails.
+        """
+        if not overwrite:
+            existing = await self.doc_repo.get_by_content_hash(content_hash, project_id)
+            if existing:
+                logger.info(
+                    "ingestion_skipped_duplicate",
+                    filename=filename,
+                    document_id=existing.id,
+                )
+                return existing.id
+
         # Create document record
         document = await self.doc_repo.create(
             filename=filename,
             document_type=document_type,
             project_id=project_id,
+            content_hash=content_hash,
+        )
+
+        return await self._process(
+            document_id=document.id,
+            parse=parse,
+            document_type=document_type,
+            project_id=project_id,
+            auto_extract=auto_extract,
         )
-        document_id = document.id
 
+    async def _process(
+        self,
+        document_id: UUID,
+        parse: Callable[[], ParsedDocument],
+        document_type: DocumentType,
+        project_id: UUID | None,
+        auto_extract: bool,
+    ) -> UUID:
+        """
+        Parse, chunk, embed and extract an existing document record.
+
+        Args:
+            document_id: ID of the document record to fill.
+            parse: Callable that parses the PDF source.
+            document_type: Type of document. UNKNOWN triggers classification.
+            project_id: Project the document belongs to.
+            auto_extract: Whether to automatically extract structured data.
+
+        Returns:
+            The document ID.
+
+        Raises:
+            IngestionError: If ingestion fails.
+        """
         try:
             # Update status to processing
             await self.doc_repo.update_status(document_id, ProcessingStatus.PROCESSING)
 
-            # Parse PDF from bytes
-            parsed_doc = self.pdf_parser.parse_bytes(content, filename)
+            # Parse PDF in a worker thread; pdfminer is CPU-bound and would
+            # otherwise stall every other request on the event loop
+            parsed_doc = await asyncio.to_thread(parse)
             full_text = parsed_doc.full_text
 
-            # Classify document if type is unknown
+            # Classify document if type is unknown. Only extraction needs the
+            # type, so the classification request runs while the document is
+            # chunked and embedded.
+            classification: asyncio.Task[DocumentType] | None = None
             if document_type == DocumentType.UNKNOWN:
-                document_type = await self.classifier.classify(full_text)
+                classification = asyncio.create_task(self.classifier.classify(full_text))
+                # Let the task send its request before chunking blocks the loop
+                await asyncio.sleep(0)
+
+            try:
+                # Chunk the document and generate embeddings
+                chunks = self.chunker.chunk_document(parsed_doc)
+                chunks_with_embeddings = await self.embedder.embed_chunks(
+                    chunks, cache=self.embedding_cache
+                )
+
+                if classification is not None:
+                    document_type = await classification
+            finally:
+                # No-op once done; stops the request if chunking or embedding failed
+                if classification is not None:
+                    classification.cancel()
+
+            if classification is not None:
                 await self.doc_repo.update_type(document_id, document_type)
                 logger.info(
                     "document_classified",
-                    document_id=str(document_id),
+                    document_id=document_id,
                     document_type=document_type.value,
                 )
 
-            # Chunk the document
-            chunks = self.chunker.chunk_document(parsed_doc)
-
             if not chunks:
-                logger.warning("no_chunks_created", document_id=str(document_id))
+                logger.warning("no_chunks_created", document_id=document_id)
                 await self.doc_repo.update_status(
                     document_id,
                     ProcessingStatus.COMPLETED,
                     page_count=parsed_doc.page_count,
+                    full_text=full_text,
                 )
                 return document_id
 
-            # Generate embeddings
-            chunks_with_embeddings = await self.embedder.embed_chunks(chunks)
-
             # Store chunks
             chunk_data = [
                 {
@@ -279,22 +405,34 @@ class IngestionPipeline:
                 for chunk, embedding in chunks_with_embeddings
             ]
 
-            await self.chunk_repo.create_many(document_id, chunk_data)
+            await self.chunk_repo.create_many(document_id, chunk_data, project_id=project_id)
+
+            # New chunks can change any cached answer, once they are visible
+            invalidate_on_commit(self.session)
 
             # Extract structured data if enabled and document type is known
             if auto_extract and document_type != DocumentType.UNKNOWN:
-                await self._extract_and_store(document_id, full_text, document_type)
+                await self._extract_and_store(
+                    document_id,
+                    full_text,
+                    document_type,
+                    chunks=[chunk.content for chunk, _ in chunks_with_embeddings],
+                    chunk_embeddings=np.stack(
+                        [embedding for _, embedding in chunks_with_embeddings]
+                    ),
+                )
 
             # Update status to completed
             await self.doc_repo.update_status(
                 document_id,
                 ProcessingStatus.COMPLETED,
                 page_count=parsed_doc.page_count,
+                full_text=full_text,
             )
 
             logger.info(
                 "ingestion_completed",
-                document_id=str(document_id),
+                document_id=document_id,
                 document_type=document_type.value,
                 chunk_count=len(chunks),
                 page_count=parsed_doc.page_count,
@@ -305,8 +443,8 @@ class IngestionPipeline:
         except PDFParserError as e:
             logger.error(
                 "ingestion_parse_error",
-                document_id=str(document_id),
-                error=str(e),
+                document_id=document_id,
+                error=e,
             )
             await self.doc_repo.update_status(document_id, ProcessingStatus.FAILED)
             raise IngestionError(f"Failed to parse PDF: {e}") from e
@@ -314,8 +452,8 @@ class IngestionPipeline:
         except Exception as e:
             logger.error(
                 "ingestion_error",
-                document_id=str(document_id),
-                error=str(e),
+                document_id=document_id,
+                error=e,
             )
             await self.doc_repo.update_status(document_id, ProcessingStatus.FAILED)
             raise IngestionError(f"Ingestion failed: {e}") from e
@@ -325,6 +463,8 @@ class IngestionPipeline:
         document_id: UUID,
         text: str,
         document_type: DocumentType,
+        chunks: list[str] | None = None,
+        chunk_embeddings: np.ndarray | None = None,
     ) -> None:
         """
         Extract structured data and store it.
@@ -333,7 +473,7 @@ class IngestionPipeline:
         """
         try:
             extracted_data, confidence = await self.extractor.extract(
-                text, document_type
+                text, document_type, chunks=chunks, chunk_embeddings=chunk_embeddings
             )
 
             await self.extracted_repo.create(
@@ -345,7 +485,7 @@ class IngestionPipeline:
 
             logger.info(
                 "extraction_stored",
-                document_id=str(document_id),
+                document_id=document_id,
                 document_type=document_type.value,
                 confidence=confidence,
             )
@@ -354,15 +494,15 @@ class IngestionPipeline:
             # Log but don't fail - extraction is optional
             logger.warning(
                 "extraction_failed",
-                document_id=str(document_id),
-                error=str(e),
+                document_id=document_id,
+                error=e,
             )
 
     async def extract_document(
         self,
         document_id: UUID,
         force: bool = False,
-    ) -> dict | None:
+    ) -> ExtractedDataModel | None:
         """
         Extract or re-extract structured data for an existing document.
 
@@ -371,33 +511,50 @@ class IngestionPipeline:
             force: If True, re-extract even if data already exists.
 
         Returns:
-            Extracted data as dictionary, or None if extraction failed.
+            The stored extracted data record, or None if extraction failed.
         """
         # Check if extraction already exists
         existing = await self.extracted_repo.get_by_document(document_id)
         if existing and not force:
             logger.info(
                 "extraction_exists",
-                document_id=str(document_id),
+                document_id=document_id,
             )
-            return existing.data
+            return existing
 
-        # Get document and its text
-        document = await self.doc_repo.get_by_id(document_id, include_chunks=True)
+        # Get document
+        document = await self.doc_repo.get_by_id(document_id)
         if not document:
-            logger.error("document_not_found", document_id=str(document_id))
+            logger.error("document_not_found", document_id=document_id)
             return None
 
         if document.document_type == DocumentType.UNKNOWN:
             logger.warning(
                 "cannot_extract_unknown_type",
-                document_id=str(document_id),
+                document_id=document_id,
             )
             return None
 
-        # Reconstruct text from chunks
-        chunks = sorted(document.chunks, key=lambda c: c.chunk_index)
-        text = "\n\n".join(chunk.content for chunk in chunks)
+        # Long documents send only the chunks nearest the type's field probe,
+        # ranked in the database so no embeddings are loaded. Otherwise the
+        # text stored at ingestion is used; documents ingested before it was
+        # stored fall back to joining their chunks.
+        top_k = self.extractor.top_k
+        probe = None
+        if 0 < top_k < await self.chunk_repo.count_by_document(document_id):
+            probe = await self.extractor.probe_embedding(document.document_type)
+
+        if probe is not None:
+            contents = await self.chunk_repo.get_ordered_content(
+                document_id, near=probe, limit=top_k
+            )
+            text = "\n\n".join(contents)
+        else:
+            stored_text = await self.doc_repo.get_text(document_id)
+            if stored_text is None:
+                text = "\n\n".join(await self.chunk_repo.get_ordered_content(document_id))
+            else:
+                text = stored_text
 
         try:
             extracted_data, confidence = await self.extractor.extract(
@@ -406,13 +563,13 @@ class IngestionPipeline:
             data_dict = extracted_data.model_dump(mode="json")
 
             if existing:
-                await self.extracted_repo.update(
+                extracted = await self.extracted_repo.update(
                     document_id=document_id,
                     data=data_dict,
                     confidence=confidence,
                 )
             else:
-                await self.extracted_repo.create(
+                extracted = await self.extracted_repo.create(
                     document_id=document_id,
                     document_type=document.document_type,
                     data=data_dict,
@@ -421,16 +578,16 @@ class IngestionPipeline:
 
             logger.info(
                 "document_extracted",
-                document_id=str(document_id),
+                document_id=document_id,
                 confidence=confidence,
             )
 
-            return data_dict
+            return extracted
 
         except ExtractionError as e:
             logger.error(
                 "document_extraction_failed",
-                document_id=str(document_id),
-                error=str(e),
+                document_id=document_id,
+                error=e,
             )
             return None
@@ -1,7 +1,15 @@
 """PDF parsing service using pdfplumber."""
 
+import io
+import multiprocessing
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import cache, cached_property
 from pathlib import Path
+from typing import BinaryIO, cast
 
 import pdfplumber
 
@@ -9,6 +17,49 @@ from propertyrag.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Runs of spaces/tabs and of three or more newlines in extracted text
+HORIZONTAL_WHITESPACE = re.compile(r"[ \t]+")
+EXCESS_NEWLINES = re.compile(r"\n{3,}")
+
+# Smallest page range handed to one worker; documents are only split
+# across workers when each gets at least this many pages
+MIN_PAGES_PER_WORKER = 4
+
+
+@cache
+def _get_executor(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Get the shared process pool for page extraction.
+
+    Workers are started from a fresh interpreter (forkserver, or spawn where
+    that is unavailable): the pool is created lazily inside a threaded
+    server, and forking a process with live threads can deadlock.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context(method)
+    )
+
+
+def _extract_page_range(source: Path, start: int, stop: int) -> list[str]:
+    """
+    Extract the text of pages ``start`` to ``stop`` (exclusive) in a worker.
+
+    Each worker opens the PDF itself, since pdfplumber objects share one
+    file handle and cannot be used across processes.
+    """
+    parser = PDFParser(max_workers=1)
+    with pdfplumber.open(source) as pdf:
+        return [parser._extract_page_text(page) for page in pdf.pages[start:stop]]
+
+
+def _center_in_bbox(obj: dict, bbox: tuple[float, float, float, float]) -> bool:
+    """Check whether a pdfplumber object's center lies inside a bounding box."""
+    x0, top, x1, bottom = bbox
+    x = (obj["x0"] + obj["x1"]) / 2
+    y = (obj["top"] + obj["bottom"]) / 2
+    return x0 <= x <= x1 and top <= y <= bottom
+
 
 @dataclass
 class ParsedPage:
@@ -26,9 +77,9 @@ class ParsedDocument:
     pages: list[ParsedPage]
     page_count: int
 
-    @property
+    @cached_property
     def full_text(self) -> str:
-        """Get the full text of the document."""
+        """Get the full text of the document, joined once on first access."""
         return "\n\n".join(page.text for page in self.pages)
 
 
@@ -41,6 +92,16 @@ class PDFParserError(Exception):
 class PDFParser:
     """Service for parsing PDF documents."""
 
+    def __init__(self, max_workers: int | None = None) -> None:
+        """
+        Initialize the parser.
+
+        Args:
+            max_workers: Processes used to extract pages. Defaults to the
+                number of CPUs; 1 parses in-process.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+
     def parse(self, file_path: Path) -> ParsedDocument:
         """
         Parse a PDF file and extract text from all pages.
@@ -54,7 +115,7 @@ class PDFParser:
         Raises:
             PDFParserError: If parsing fails.
         """
-        logger.info("parsing_pdf", file_path=str(file_path))
+        logger.info("parsing_pdf", file_path=file_path)
 
         if not file_path.exists():
             raise PDFParserError(f"File not found: {file_path}")
@@ -63,18 +124,14 @@ class PDFParser:
             raise PDFParserError(f"Not a PDF file: {file_path}")
 
         try:
-            pages: list[ParsedPage] = []
-
             with pdfplumber.open(file_path) as pdf:
-                for i, page in enumerate(pdf.pages, start=1):
-                    text = self._extract_page_text(page)
-                    pages.append(ParsedPage(page_number=i, text=text))
+                pages = self._extract_pages(pdf, file_path)
 
                 page_count = len(pdf.pages)
 
             logger.info(
                 "pdf_parsed",
-                file_path=str(file_path),
+                file_path=file_path,
                 page_count=page_count,
                 total_chars=sum(len(p.text) for p in pages),
             )
@@ -86,37 +143,88 @@ class PDFParser:
             )
 
         except pdfplumber.pdfminer.pdfparser.PDFSyntaxError as e:
-            logger.error("pdf_syntax_error", file_path=str(file_path), error=str(e))
+            logger.error("pdf_syntax_error", file_path=file_path, error=e)
             raise PDFParserError(f"Invalid PDF syntax: {e}") from e
         except Exception as e:
-            logger.error("pdf_parse_error", file_path=str(file_path), error=str(e))
+            logger.error("pdf_parse_error", file_path=file_path, error=e)
             raise PDFParserError(f"Failed to parse PDF: {e}") from e
 
+    def _extract_pages(
+        self, pdf: pdfplumber.pdf.PDF, source: Path | bytes | None
+    ) -> list[ParsedPage]:
+        """
+        Extract the text of every page, in worker processes for large documents.
+
+        Table and text extraction are pure-Python pdfminer work bound by the
+        GIL. Documents with enough pages for at least two workers are split
+        into one contiguous page range per worker; smaller ones are parsed
+        in-process, where the pool round-trip would cost more than it saves.
+        In-memory content is written to a temporary file once so workers
+        reopen it by path instead of each receiving a pickled copy.
+
+        Args:
+            pdf: Open PDF.
+            source: Path or content the workers reopen the PDF from, if any.
+
+        Returns:
+            Parsed pages in page order.
+        """
+        page_count = len(pdf.pages)
+        workers = max(1, min(self.max_workers, page_count // MIN_PAGES_PER_WORKER))
+
+        if source is None or workers < 2:
+            texts = [self._extract_page_text(page) for page in pdf.pages]
+        elif isinstance(source, bytes):
+            with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+                tmp.write(source)
+                tmp.flush()
+                texts = self._extract_in_workers(Path(tmp.name), page_count, workers)
+        else:
+            texts = self._extract_in_workers(source, page_count, workers)
+
+        return [ParsedPage(page_number=i, text=text) for i, text in enumerate(texts, start=1)]
+
+    def _extract_in_workers(self, source: Path, page_count: int, workers: int) -> list[str]:
+        """Extract page texts in the process pool, one contiguous range per worker."""
+        step = -(-page_count // workers)
+        starts = range(0, page_count, step)
+        ranges = _get_executor(self.max_workers).map(
+            _extract_page_range,
+            [source] * len(starts),
+            starts,
+            [start + step for start in starts],
+        )
+        return [text for texts_in_range in ranges for text in texts_in_range]
+
     def _extract_page_text(self, page: pdfplumber.page.Page) -> str:
         """
         Extract text from a single page.
 
-        Handles tables specially for better extraction.
+        Tables are extracted as ``|``-separated rows and appended after the
+        running text. Characters inside a table's bounding box are left out
+        of the running text, so table content appears only once.
         """
-        # Extract tables first
-        tables = page.extract_tables()
+        # Find tables first
+        tables = page.find_tables()
         table_texts = []
 
         for table in tables:
-            if table:
-                # Convert table to text representation
-                rows = []
-                for row in table:
-                    # Filter None values and join cells
-                    cells = [str(cell) if cell else "" for cell in row]
-                    rows.append(" | ".join(cells))
-                table_texts.append("\n".join(rows))
-
-        # Extract regular text
+            rows = table.extract()
+            if rows:
+                # Convert table to text representation, filtering None cells
+                table_texts.append(
+                    "\n".join(" | ".join(str(cell) if cell else "" for cell in row) for row in rows)
+                )
+
+        # Extract regular text outside the tables
+        if tables:
+            bboxes = [table.bbox for table in tables]
+            page = page.filter(
+                lambda obj: obj["object_type"] != "char"
+                or not any(_center_in_bbox(obj, bbox) for bbox in bboxes)
+            )
         text = page.extract_text() or ""
 
-        # If we found tables, append them (they might be duplicated in text,
-        # but that's better than missing them)
         if table_texts:
             text = text + "\n\n" + "\n\n".join(table_texts)
 
@@ -128,12 +236,10 @@ class PDFParser:
     def _clean_text(self, text: str) -> str:
         """Clean extracted text."""
         # Replace multiple whitespaces with single space
-        import re
-
-        text = re.sub(r"[ \t]+", " ", text)
+        text = HORIZONTAL_WHITESPACE.sub(" ", text)
 
         # Replace multiple newlines with double newline
-        text = re.sub(r"\n{3,}", "\n\n", text)
+        text = EXCESS_NEWLINES.sub("\n\n", text)
 
         # Strip leading/trailing whitespace
         text = text.strip()
@@ -151,17 +257,39 @@ class PDFParser:
         Returns:
             ParsedDocument with extracted text per page.
         """
-        import io
+        return self.parse_stream(io.BytesIO(content), filename, source=content)
 
-        logger.info("parsing_pdf_bytes", filename=filename, size=len(content))
+    def parse_stream(
+        self, fp: BinaryIO, filename: str, source: bytes | None = None
+    ) -> ParsedDocument:
+        """
+        Parse PDF from a seekable binary file object.
 
-        try:
-            pages: list[ParsedPage] = []
+        The file is read incrementally by pdfminer, so large uploads spooled
+        to disk are never loaded into memory as a whole. Pages are only
+        extracted in worker processes when the file lives on disk or its
+        bytes are passed as ``source``.
 
-            with pdfplumber.open(io.BytesIO(content)) as pdf:
-                for i, page in enumerate(pdf.pages, start=1):
-                    text = self._extract_page_text(page)
-                    pages.append(ParsedPage(page_number=i, text=text))
+        Args:
+            fp: Open binary file positioned at the start of the PDF.
+            filename: Original filename.
+            source: Optional content of ``fp`` for worker processes.
+
+        Returns:
+            ParsedDocument with extracted text per page.
+        """
+        logger.info("parsing_pdf_stream", filename=filename)
+
+        worker_source: Path | bytes | None = source
+        if worker_source is None:
+            name = getattr(fp, "name", None)
+            if isinstance(name, str) and os.path.isfile(name):
+                worker_source = Path(name)
+
+        try:
+            # pdfplumber reads any seekable binary file, though it only declares two
+            with pdfplumber.open(cast(io.BufferedReader, fp)) as pdf:
+                pages = self._extract_pages(pdf, worker_source)
 
                 page_count = len(pdf.pages)
 
@@ -179,5 +307,5 @@ class PDFParser:
             )
 
         except Exception as e:
-            logger.error("pdf_parse_error", filename=filename, error=str(e))
+            logger.error("pdf_parse_error", filename=filename, error=e)
             raise PDFParserError(f"Failed to parse PDF: {e}") from e
@@ -0,0 +1,171 @@
+"""Similarity cache for RAG query results keyed by query embedding."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import count
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from propertyrag.core.config import get_settings
+from propertyrag.core.logging import get_logger
+from propertyrag.core.models import QueryResponse
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    """A cached query vector with its answer."""
+
+    vector: np.ndarray
+    scope: Hashable
+    generation: int
+    result: QueryResponse
+    created_at: float
+
+
+class QVCache:
+    """
+    In-process cache that answers near-duplicate questions from memory.
+
+    Query embeddings are compared by cosine similarity against previously
+    answered questions with the same filter scope. A hit at or above the
+    threshold ``tau`` returns the earlier result without running retrieval
+    or generation again. Entries carry the generation they were written in;
+    calling ``invalidate`` bumps the generation so stale answers are never
+    served after documents change. Entries also expire after ``ttl`` seconds
+    as a backstop for changes made by other processes.
+    """
+
+    def __init__(self, capacity: int = 1024, tau: float = 0.95, ttl: float = 0) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            capacity: Maximum number of cached queries (least recently used evicted).
+            tau: Minimum cosine similarity for a cache hit (0-1).
+            ttl: Seconds a result stays servable (0 = until invalidated or evicted).
+        """
+        self.capacity = capacity
+        self.tau = tau
+        self.ttl = ttl
+        self.generation = 0
+        self._entries: OrderedDict[int, _CacheEntry] = OrderedDict()
+        self._ids = count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(
+        self, query_vec: list[float] | np.ndarray, scope: Hashable = None
+    ) -> QueryResponse | None:
+        """
+        Find a cached result for a similar query.
+
+        Args:
+            query_vec: Embedding of the incoming question.
+            scope: Filter key the result must have been computed under.
+
+        Returns:
+            The cached result of the most similar query, or None on a miss.
+        """
+        oldest = time.monotonic() - self.ttl if self.ttl > 0 else float("-inf")
+        candidates = [
+            (entry_id, entry)
+            for entry_id, entry in self._entries.items()
+            if entry.scope == scope
+            and entry.generation == self.generation
+            and entry.created_at >= oldest
+        ]
+        if not candidates:
+            return None
+
+        matrix = np.stack([entry.vector for _, entry in candidates])
+        scores = matrix @ self._normalize(query_vec)
+        best = int(np.argmax(scores))
+        if scores[best] < self.tau:
+            return None
+
+        entry_id, entry = candidates[best]
+        self._entries.move_to_end(entry_id)
+        logger.debug("qvcache_hit", similarity=float(scores[best]))
+        return entry.result
+
+    def insert(
+        self,
+        query_vec: list[float] | np.ndarray,
+        result: QueryResponse,
+        scope: Hashable = None,
+        generation: int | None = None,
+    ) -> None:
+        """
+        Cache the result for a query.
+
+        Args:
+            query_vec: Embedding of the answered question.
+            result: Result to serve for similar questions.
+            scope: Filter key the result was computed under.
+            generation: Generation read before the result was computed. Results
+                from before an invalidation are dropped.
+        """
+        if generation is None:
+            generation = self.generation
+        if self.capacity <= 0 or generation != self.generation:
+            return
+
+        self._entries[next(self._ids)] = _CacheEntry(
+            vector=self._normalize(query_vec),
+            scope=scope,
+            generation=generation,
+            result=result,
+            created_at=time.monotonic(),
+        )
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Mark all cached results as stale after the document set changed."""
+        self.generation += 1
+        self._entries.clear()
+        logger.debug("qvcache_invalidated", generation=self.generation)
+
+    @staticmethod
+    def _normalize(vec: list[float] | np.ndarray) -> np.ndarray:
+        """Convert to a unit-length float32 array."""
+        arr = np.asarray(vec, dtype=np.float32)
+        norm = np.linalg.norm(arr)
+        return arr / norm if norm else arr
+
+
+@lru_cache
+def get_qvcache() -> QVCache:
+    """Get the process-wide query cache."""
+    settings = get_settings()
+    return QVCache(
+        capacity=settings.qvcache_capacity,
+        tau=settings.qvcache_tau,
+        ttl=settings.qvcache_ttl,
+    )
+
+
+def invalidate_on_commit(session: AsyncSession) -> None:
+    """
+    Invalidate the process-wide query cache once the session commits.
+
+    Invalidating before the commit would let a query that still reads the
+    old rows cache its answer under the new generation.
+
+    Args:
+        session: Session whose transaction changes the document set.
+    """
+    event.listen(
+        session.sync_session,
+        "after_commit",
+        lambda _session: get_qvcache().invalidate(),
+        once=True,
+    )
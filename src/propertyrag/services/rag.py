@@ -4,11 +4,14 @@ from dataclasses import dataclass
 from uuid import UUID
 
 from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletionSystemMessageParam
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from propertyrag.core.config import get_settings
 from propertyrag.core.logging import get_logger
 from propertyrag.core.models import QueryRequest, QueryResponse, Source
+from propertyrag.core.openai_client import get_openai_client
+from propertyrag.services.qvcache import QVCache, get_qvcache
 from propertyrag.services.retriever import RetrievedChunk, Retriever
 
 logger = get_logger(__name__)
@@ -24,13 +27,22 @@ Regeln:
 5. Sei präzise und konkret, vermeide Spekulationen
 6. Bei Zahlen und Daten: gib sie exakt wie in den Quellen an"""
 
-RAG_USER_PROMPT = """Beantworte die folgende Frage basierend auf den Dokumentausschnitten:
+# Sent unchanged with every request, so it is built once
+RAG_SYSTEM_MESSAGE: ChatCompletionSystemMessageParam = {
+    "role": "system",
+    "content": RAG_SYSTEM_PROMPT,
+}
 
-FRAGE: {question}
+# Sources come before the question: OpenAI caches repeated prompt prefixes
+# automatically, and follow-up questions over the same sources then share
+# everything up to the question
+RAG_USER_PROMPT = """Beantworte die Frage am Ende basierend auf den Dokumentausschnitten:
 
 DOKUMENTAUSSCHNITTE:
 {context}
 
+FRAGE: {question}
+
 Antworte präzise und zitiere die relevanten Quellen."""
 
 
@@ -66,6 +78,7 @@ class RAGService:
         retriever: Retriever | None = None,
         client: AsyncOpenAI | None = None,
         config: RAGConfig | None = None,
+        cache: QVCache | None = None,
     ) -> None:
         """
         Initialize the RAG service.
@@ -73,16 +86,20 @@ class RAGService:
         Args:
             session: Database session.
             retriever: Optional retriever. Creates default if not provided.
-            client: Optional OpenAI client. Creates default if not provided.
+            client: Optional OpenAI client. Uses the shared client if not provided.
             config: Optional RAG configuration.
+            cache: Optional query result cache. Uses the shared cache if enabled in settings.
         """
         settings = get_settings()
 
         self.session = session
         self.retriever = retriever or Retriever(session)
-        self.client = client or AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = client or get_openai_client()
         self.model = settings.openai_chat_model
         self.config = config or RAGConfig()
+        if cache is None and settings.qvcache_enabled:
+            cache = get_qvcache()
+        self.cache = cache
 
         logger.info(
             "rag_service_initialized",
@@ -106,10 +123,22 @@ class RAGService:
         logger.info(
             "rag_query_started",
             question_length=len(request.question),
-            project_id=str(request.project_id) if request.project_id else None,
+            project_id=request.project_id,
         )
 
         try:
+            # Embed once: the vector keys the cache and drives retrieval
+            query_embedding = await self.retriever.embedder.embed_query(request.question)
+
+            scope = self._cache_scope(request)
+            # QVCache defines __len__, so an empty cache is falsy
+            generation = self.cache.generation if self.cache is not None else None
+            if self.cache is not None:
+                cached = self.cache.lookup(query_embedding, scope)
+                if cached is not None:
+                    logger.info("rag_query_cache_hit")
+                    return cached.model_copy(update={"query": request.question})
+
             # Retrieve relevant chunks
             if self.config.include_context:
                 chunks = await self.retriever.retrieve_with_context(
@@ -118,6 +147,7 @@ class RAGService:
                     project_id=request.project_id,
                     document_ids=request.document_ids,
                     context_chunks=self.config.context_chunks,
+                    query_embedding=query_embedding,
                 )
             else:
                 chunks = await self.retriever.retrieve(
@@ -126,6 +156,7 @@ class RAGService:
                     project_id=request.project_id,
                     document_ids=request.document_ids,
                     min_score=self.config.min_score,
+                    query_embedding=query_embedding,
                 )
 
             if not chunks:
@@ -152,16 +183,30 @@ class RAGService:
                 answer_length=len(answer),
             )
 
-            return QueryResponse(
+            response = QueryResponse.model_construct(
                 answer=answer,
                 sources=sources,
                 query=request.question,
             )
+            if self.cache is not None:
+                self.cache.insert(query_embedding, response, scope, generation)
+
+            return response
 
         except Exception as e:
-            logger.error("rag_query_error", error=str(e))
+            logger.error("rag_query_error", error=e)
             raise RAGError(f"Query failed: {e}") from e
 
+    def _cache_scope(self, request: QueryRequest) -> tuple:
+        """Build the cache key for everything besides the question that shapes the answer."""
+        document_ids = tuple(sorted(request.document_ids)) if request.document_ids else None
+        return (
+            request.project_id,
+            document_ids,
+            request.top_k or self.config.top_k,
+            self.config.include_context,
+        )
+
     def _build_context(self, chunks: list[RetrievedChunk]) -> str:
         """Build context string from retrieved chunks."""
         context_parts = []
@@ -183,7 +228,7 @@ class RAGService:
         response = await self.client.chat.completions.create(
             model=self.model,
             messages=[
-                {"role": "system", "content": RAG_SYSTEM_PROMPT},
+                RAG_SYSTEM_MESSAGE,
                 {"role": "user", "content": user_prompt},
             ],
             max_tokens=self.config.max_tokens,
@@ -194,30 +239,24 @@ class RAGService:
 
     def _build_sources(self, chunks: list[RetrievedChunk]) -> list[Source]:
         """Build deduplicated source list from chunks."""
-        # Deduplicate by document and page
-        seen: set[tuple[UUID, int | None]] = set()
-        sources: list[Source] = []
-
+        # Deduplicate by document and page, keeping the best-scoring chunk
+        best: dict[tuple[UUID, int | None], RetrievedChunk] = {}
         for chunk in chunks:
             key = (chunk.document_id, chunk.page_number)
-            if key in seen:
-                continue
-            seen.add(key)
-
-            sources.append(
-                Source(
-                    document_id=chunk.document_id,
-                    filename=chunk.filename,
-                    page_number=chunk.page_number,
-                    chunk_content=chunk.content[:500],  # Truncate for response
-                    score=chunk.score,
-                )
+            if key not in best or chunk.score > best[key].score:
+                best[key] = chunk
+
+        # Fields come from stored chunks, so skip re-validation
+        return [
+            Source.model_construct(
+                document_id=chunk.document_id,
+                filename=chunk.filename,
+                page_number=chunk.page_number,
+                chunk_content=chunk.content[:500],  # Truncate for response
+                score=chunk.score,
             )
-
-        # Sort by score descending
-        sources.sort(key=lambda s: s.score, reverse=True)
-
-        return sources
+            for chunk in sorted(best.values(), key=lambda c: c.score, reverse=True)
+        ]
 
     async def query_simple(
         self,
@@ -3,17 +3,19 @@
 from dataclasses import dataclass
 from uuid import UUID
 
+import numpy as np
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from propertyrag.core.config import get_settings
 from propertyrag.core.logging import get_logger
-from propertyrag.db.repository import ChunkRepository, DocumentRepository
-from propertyrag.services.embedder import Embedder
+from propertyrag.db.repository import ChunkRepository
+from propertyrag.services.embedder import Embedder, get_embedder
 
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RetrievedChunk:
     """A retrieved chunk with metadata."""
 
@@ -45,9 +47,8 @@ class Retriever:
             embedder: Optional embedder for query embedding. Creates default if not provided.
         """
         self.session = session
-        self.embedder = embedder or Embedder()
+        self.embedder = embedder or get_embedder()
         self.chunk_repo = ChunkRepository(session)
-        self.doc_repo = DocumentRepository(session)
 
         settings = get_settings()
         self.default_top_k = settings.retrieval_top_k
@@ -61,6 +62,7 @@ class Retriever:
         project_id: UUID | None = None,
         document_ids: list[UUID] | None = None,
         min_score: float = 0.0,
+        query_embedding: np.ndarray | None = None,
     ) -> list[RetrievedChunk]:
         """
         Retrieve relevant chunks for a query.
@@ -71,22 +73,31 @@ class Retriever:
             project_id: Optional project to filter by.
             document_ids: Optional list of document IDs to filter by.
             min_score: Minimum similarity score (0-1). Default 0.
+            query_embedding: Precomputed embedding of the query. Embedded if not provided.
 
         Returns:
             List of retrieved chunks sorted by relevance.
+
+        Raises:
+            ValueError: If min_score is outside 0-1.
         """
+        if not 0.0 <= min_score <= 1.0:
+            raise ValueError(f"min_score must be between 0 and 1, got {min_score}")
         top_k = top_k or self.default_top_k
+        if top_k <= 0:
+            return []
 
         logger.info(
             "retrieving_chunks",
             query_length=len(query),
             top_k=top_k,
-            project_id=str(project_id) if project_id else None,
+            project_id=project_id,
             document_count=len(document_ids) if document_ids else None,
         )
 
         # Generate query embedding
-        query_embedding = await self.embedder.embed_text(query)
+        if query_embedding is None:
+            query_embedding = await self.embedder.embed_query(query)
 
         # Search for similar chunks
         results = await self.chunk_repo.search_similar(
@@ -94,34 +105,10 @@ class Retriever:
             top_k=top_k,
             project_id=project_id,
             document_ids=document_ids,
+            min_score=min_score,
         )
 
-        # Convert to RetrievedChunk with document info
-        retrieved_chunks: list[RetrievedChunk] = []
-
-        # Cache document lookups
-        doc_cache: dict[UUID, str] = {}
-
-        for chunk, score in results:
-            # Filter by minimum score
-            if score < min_score:
-                continue
-
-            # Get document filename (cached)
-            if chunk.document_id not in doc_cache:
-                doc = await self.doc_repo.get_by_id(chunk.document_id)
-                doc_cache[chunk.document_id] = doc.filename if doc else "Unknown"
-
-            retrieved_chunks.append(
-                RetrievedChunk(
-                    chunk_id=chunk.id,
-                    document_id=chunk.document_id,
-                    filename=doc_cache[chunk.document_id],
-                    content=chunk.content,
-                    page_number=chunk.page_number,
-                    score=score,
-                )
-            )
+        retrieved_chunks = self._to_retrieved(results)
 
         logger.info(
             "chunks_retrieved",
@@ -131,6 +118,52 @@ class Retriever:
 
         return retrieved_chunks
 
+    async def retrieve_many(
+        self,
+        queries: list[str],
+        top_k: int | None = None,
+        project_id: UUID | None = None,
+        document_ids: list[UUID] | None = None,
+        min_score: float = 0.0,
+    ) -> list[list[RetrievedChunk]]:
+        """
+        Retrieve relevant chunks for several queries at once.
+
+        The queries are embedded in one batch and searched in a single
+        database round-trip.
+
+        Args:
+            queries: Natural language queries.
+            top_k: Number of chunks to retrieve per query. Defaults to settings value.
+            project_id: Optional project to filter by.
+            document_ids: Optional list of document IDs to filter by.
+            min_score: Minimum similarity score (0-1). Default 0.
+
+        Returns:
+            One list of retrieved chunks per query, sorted by relevance.
+
+        Raises:
+            ValueError: If min_score is outside 0-1.
+        """
+        if not 0.0 <= min_score <= 1.0:
+            raise ValueError(f"min_score must be between 0 and 1, got {min_score}")
+        top_k = top_k or self.default_top_k
+        if top_k <= 0 or not queries:
+            return [[] for _ in queries]
+
+        logger.info("retrieving_chunks_batch", query_count=len(queries), top_k=top_k)
+
+        embeddings = await self.embedder.embed_texts(queries)
+        results = await self.chunk_repo.search_similar_many(
+            embeddings=embeddings,
+            top_k=top_k,
+            project_id=project_id,
+            document_ids=document_ids,
+            min_score=min_score,
+        )
+
+        return [self._to_retrieved(query_results) for query_results in results]
+
     async def retrieve_with_context(
         self,
         query: str,
@@ -138,6 +171,7 @@ class Retriever:
         project_id: UUID | None = None,
         document_ids: list[UUID] | None = None,
         context_chunks: int = 1,
+        query_embedding: np.ndarray | None = None,
     ) -> list[RetrievedChunk]:
         """
         Retrieve chunks with surrounding context.
@@ -151,6 +185,7 @@ class Retriever:
             project_id: Optional project to filter by.
             document_ids: Optional list of document IDs to filter by.
             context_chunks: Number of chunks before/after to include.
+            query_embedding: Precomputed embedding of the query. Embedded if not provided.
 
         Returns:
             List of retrieved chunks with context, deduplicated.
@@ -161,42 +196,36 @@ class Retriever:
             top_k=top_k,
             project_id=project_id,
             document_ids=document_ids,
+            query_embedding=query_embedding,
         )
 
         if not primary_chunks or context_chunks == 0:
             return primary_chunks
 
         # Gather all chunks including context
-        all_chunks: dict[UUID, RetrievedChunk] = {}
-
-        for chunk in primary_chunks:
-            all_chunks[chunk.chunk_id] = chunk
-
-            # Get surrounding chunks from same document
-            doc_chunks = await self.chunk_repo.get_by_document(chunk.document_id)
-
-            # Find the index of our chunk
-            chunk_indices = {c.id: i for i, c in enumerate(doc_chunks)}
-            current_idx = chunk_indices.get(chunk.chunk_id)
-
-            if current_idx is not None:
-                # Get context chunks
-                start_idx = max(0, current_idx - context_chunks)
-                end_idx = min(len(doc_chunks), current_idx + context_chunks + 1)
-
-                for idx in range(start_idx, end_idx):
-                    ctx_chunk = doc_chunks[idx]
-                    if ctx_chunk.id not in all_chunks:
-                        # Context chunks get a slightly lower score
-                        context_score = chunk.score * 0.9
-                        all_chunks[ctx_chunk.id] = RetrievedChunk(
-                            chunk_id=ctx_chunk.id,
-                            document_id=ctx_chunk.document_id,
-                            filename=chunk.filename,
-                            content=ctx_chunk.content,
-                            page_number=ctx_chunk.page_number,
-                            score=context_score,
-                        )
+        all_chunks: dict[UUID, RetrievedChunk] = {
+            chunk.chunk_id: chunk for chunk in primary_chunks
+        }
+
+        # Surrounding chunks of every primary chunk, fetched in one query
+        neighbors = await self.chunk_repo.get_neighbors(
+            [chunk.chunk_id for chunk in primary_chunks], context_chunks
+        )
+        ranks = {chunk.chunk_id: rank for rank, chunk in enumerate(primary_chunks)}
+
+        # Neighbors of better-scoring primaries claim shared chunks first
+        for ctx_chunk in sorted(neighbors, key=lambda row: ranks[row.center_id]):
+            if ctx_chunk.id not in all_chunks:
+                chunk = primary_chunks[ranks[ctx_chunk.center_id]]
+                # Context chunks get a slightly lower score
+                all_chunks[ctx_chunk.id] = RetrievedChunk(
+                    chunk_id=ctx_chunk.id,
+                    document_id=ctx_chunk.document_id,
+                    filename=chunk.filename,
+                    content=ctx_chunk.content,
+                    page_number=ctx_chunk.page_number,
+                    score=chunk.score * 0.9,
+                )
 
         # Sort by document and chunk order for coherent reading
         result = sorted(
@@ -212,3 +241,18 @@ class Retriever:
         )
 
         return result
+
+    @staticmethod
+    def _to_retrieved(results: list[tuple[Row, float]]) -> list[RetrievedChunk]:
+        """Convert search result rows to RetrievedChunks."""
+        return [
+            RetrievedChunk(
+                chunk_id=chunk.id,
+                document_id=chunk.document_id,
+                filename=chunk.filename,
+                content=chunk.content,
+                page_number=chunk.page_number,
+                score=score,
+            )
+            for chunk, score in results
+        ]
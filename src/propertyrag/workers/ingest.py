@@ -0,0 +1,90 @@
+"""Background ingestion of uploaded documents."""
+
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from uuid import UUID
+
+from propertyrag.core.config import get_settings
+from propertyrag.core.logging import get_logger
+from propertyrag.core.models import DocumentType, ProcessingStatus
+from propertyrag.db.repository import DocumentRepository
+from propertyrag.db.session import async_session_maker
+from propertyrag.services.ingestion import IngestionPipeline
+
+logger = get_logger(__name__)
+
+
+async def ingest_document(
+    document_id: UUID,
+    file_path: Path,
+    document_type: DocumentType = DocumentType.UNKNOWN,
+    project_id: UUID | None = None,
+    auto_extract: bool = True,
+) -> None:
+    """
+    Process a pending document outside the upload request.
+
+    Runs in its own session so the request that accepted the upload has
+    already committed and released its connection. PROCESSING is committed
+    before the work starts so clients can see it. On any failure the work
+    is rolled back and FAILED is committed in a fresh transaction, since a
+    database error leaves the original one unusable. The temporary upload
+    file is removed afterwards.
+
+    Args:
+        document_id: ID of the PENDING document record.
+        file_path: Temporary file holding the uploaded PDF.
+        document_type: Type of document. UNKNOWN triggers classification.
+        project_id: Project the document belongs to.
+        auto_extract: Whether to extract structured data.
+    """
+    try:
+        async with async_session_maker() as session:
+            doc_repo = DocumentRepository(session)
+            await doc_repo.update_status(document_id, ProcessingStatus.PROCESSING)
+            await session.commit()
+
+            pipeline = IngestionPipeline(session)
+            try:
+                await pipeline.process_file(
+                    document_id,
+                    file_path,
+                    document_type=document_type,
+                    project_id=project_id,
+                    auto_extract=auto_extract,
+                )
+                await session.commit()
+            except Exception as e:
+                logger.error(
+                    "background_ingestion_failed",
+                    document_id=document_id,
+                    error=e,
+                )
+                await session.rollback()
+                await doc_repo.update_status(document_id, ProcessingStatus.FAILED)
+                await session.commit()
+    finally:
+        file_path.unlink(missing_ok=True)
+
+
+async def fail_stale_documents() -> int:
+    """
+    Mark uploads abandoned by an earlier process as FAILED.
+
+    Jobs run inside the API process, so a restart or crash loses any queued
+    or running ingestion together with its temporary upload file. Documents
+    still PENDING or PROCESSING after ``ingest_stale_after`` seconds can no
+    longer finish; marking them FAILED lets polling clients stop waiting and
+    upload again.
+
+    Returns:
+        Number of documents marked FAILED.
+    """
+    cutoff = datetime.now(UTC) - timedelta(seconds=get_settings().ingest_stale_after)
+    async with async_session_maker() as session:
+        count = await DocumentRepository(session).fail_stale(cutoff)
+        await session.commit()
+
+    if count:
+        logger.warning("stale_ingestions_failed", count=count)
+    return count
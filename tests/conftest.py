@@ -1,21 +1,33 @@
 """Pytest configuration and fixtures."""
 
 import asyncio
-from collections.abc import AsyncGenerator, Generator
+import os
+from collections.abc import AsyncGenerator, Generator, Iterator
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+# Services share one OpenAI client built from settings; it only needs a key to exist
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
 from propertyrag.api.app import create_app
-from propertyrag.api.dependencies import get_db
+from propertyrag.api.dependencies import get_db, get_db_ro
 from propertyrag.db.models import Base
+from propertyrag.db.session import _apply_session_settings, _register_vector_codecs
 
 
 # Use in-memory SQLite for tests (without vector extension)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
+# Vector search tests run against this Postgres (with pgvector) if set,
+# otherwise against a throwaway container when testcontainers and Docker are
+# available; without either they are skipped
+TEST_POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+PGVECTOR_IMAGE = "pgvector/pgvector:0.8.0-pg16"
+
 
 @pytest.fixture(scope="session")
 def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
@@ -57,6 +69,47 @@ async def test_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+@pytest.fixture(scope="session")
+def pg_url() -> Iterator[str]:
+    """Get the URL of a Postgres database with pgvector, shared by the session."""
+    if TEST_POSTGRES_URL:
+        yield TEST_POSTGRES_URL
+        return
+
+    postgres = pytest.importorskip("testcontainers.postgres")
+    try:
+        container = postgres.PostgresContainer(PGVECTOR_IMAGE, driver="asyncpg").start()
+    except Exception as e:
+        pytest.skip(f"Postgres container unavailable: {e}")
+    try:
+        yield container.get_connection_url()
+    finally:
+        container.stop()
+
+
+@pytest.fixture
+async def pg_session(pg_url: str) -> AsyncGenerator[AsyncSession, None]:
+    """Create a session on Postgres with the schema in place and empty tables."""
+    engine = create_async_engine(pg_url)
+    # Same binary vector codecs and session settings as the application
+    event.listen(engine.sync_engine, "connect", _register_vector_codecs)
+    event.listen(engine.sync_engine, "connect", _apply_session_settings)
+
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+
+    # Truncating is much faster than dropping and recreating the schema
+    async with engine.begin() as conn:
+        tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+        await conn.execute(text(f"TRUNCATE {tables} CASCADE"))
+
+    await engine.dispose()
+
+
 @pytest.fixture
 def mock_openai_client() -> AsyncMock:
     """Create a mock OpenAI client."""
@@ -86,6 +139,7 @@ async def client(test_session: AsyncSession) -> AsyncGenerator[AsyncClient, None
         yield test_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_db_ro] = override_get_db
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -1,7 +1,16 @@
 """Integration tests for the API."""
 
+import hashlib
+from datetime import datetime
+from unittest.mock import AsyncMock
+from uuid import UUID
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from propertyrag.core.models import ProcessingStatus
+from propertyrag.db.repository import DocumentRepository
 
 
 class TestHealthEndpoint:
@@ -27,6 +36,13 @@ class TestHealthEndpoint:
         assert data["name"] == "PropertyRAG"
         assert "version" in data
 
+    @pytest.mark.asyncio
+    async def test_docs_disabled_without_debug(self, client: AsyncClient) -> None:
+        """Test that docs and the OpenAPI schema are not served outside debug mode."""
+        assert (await client.get("/docs")).status_code == 404
+        assert (await client.get("/openapi.json")).status_code == 404
+        assert (await client.get("/")).json()["docs"] is None
+
 
 class TestProjectEndpoints:
     """Tests for project endpoints."""
@@ -80,6 +96,41 @@ class TestProjectEndpoints:
         data = response.json()
         assert isinstance(data, list)
 
+    @pytest.mark.asyncio
+    async def test_list_projects_document_counts(
+        self, client: AsyncClient, test_session: AsyncSession
+    ) -> None:
+        """Test that listed projects report their document counts."""
+        full = (await client.post("/api/v1/projects", json={"name": "Full"})).json()
+        empty = (await client.post("/api/v1/projects", json={"name": "Empty"})).json()
+
+        doc_repo = DocumentRepository(test_session)
+        for filename in ("a.pdf", "b.pdf"):
+            await doc_repo.create(filename=filename, project_id=UUID(full["id"]))
+
+        response = await client.get("/api/v1/projects")
+
+        counts = {p["id"]: p["document_count"] for p in response.json()}
+        assert counts[full["id"]] == 2
+        assert counts[empty["id"]] == 0
+
+    @pytest.mark.asyncio
+    async def test_get_project_count_refreshes_after_new_document(
+        self, client: AsyncClient, test_session: AsyncSession
+    ) -> None:
+        """Test that the cached document count is dropped when a document is added."""
+        project = (await client.post("/api/v1/projects", json={"name": "Polled"})).json()
+
+        response = await client.get(f"/api/v1/projects/{project['id']}")
+        assert response.json()["document_count"] == 0
+
+        await DocumentRepository(test_session).create(
+            filename="a.pdf", project_id=UUID(project["id"])
+        )
+
+        response = await client.get(f"/api/v1/projects/{project['id']}")
+        assert response.json()["document_count"] == 1
+
     @pytest.mark.asyncio
     async def test_get_project(self, client: AsyncClient) -> None:
         """Test getting a specific project."""
@@ -152,6 +203,57 @@ class TestDocumentEndpoints:
         assert data["documents"] == []
         assert data["total"] == 0
 
+    @pytest.mark.asyncio
+    async def test_list_documents(
+        self, client: AsyncClient, test_session: AsyncSession
+    ) -> None:
+        """Test listing documents."""
+        document = await DocumentRepository(test_session).create(filename="a.pdf")
+
+        response = await client.get("/api/v1/documents")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["documents"][0]["id"] == str(document.id)
+        assert data["documents"][0]["filename"] == "a.pdf"
+        assert data["documents"][0]["status"] == "pending"
+
+    @pytest.mark.asyncio
+    async def test_list_documents_pagination(
+        self, client: AsyncClient, test_session: AsyncSession
+    ) -> None:
+        """Test paging through documents with a cursor."""
+        doc_repo = DocumentRepository(test_session)
+        for i in range(3):
+            document = await doc_repo.create(filename=f"{i}.pdf")
+            # Explicit timestamps; SQLite's CURRENT_TIMESTAMP is stored in another format
+            document.created_at = datetime(2024, 1, 1, 12, 0, i)
+        await test_session.flush()
+
+        first = (await client.get("/api/v1/documents", params={"limit": 2})).json()
+        assert len(first["documents"]) == 2
+        assert first["next_cursor"] is not None
+
+        second = (
+            await client.get(
+                "/api/v1/documents",
+                params={"limit": 2, "cursor": first["next_cursor"]},
+            )
+        ).json()
+        assert len(second["documents"]) == 1
+        assert second["next_cursor"] is None
+
+        ids = {d["id"] for d in first["documents"] + second["documents"]}
+        assert len(ids) == 3
+
+    @pytest.mark.asyncio
+    async def test_list_documents_invalid_cursor(self, client: AsyncClient) -> None:
+        """Test that a malformed cursor is rejected."""
+        response = await client.get("/api/v1/documents", params={"cursor": "garbage"})
+
+        assert response.status_code == 400
+
     @pytest.mark.asyncio
     async def test_get_document_not_found(self, client: AsyncClient) -> None:
         """Test getting a non-existent document."""
@@ -160,6 +262,22 @@ class TestDocumentEndpoints:
 
         assert response.status_code == 404
 
+    @pytest.mark.asyncio
+    async def test_delete_document(
+        self, client: AsyncClient, test_session: AsyncSession
+    ) -> None:
+        """Test deleting a document."""
+        document = await DocumentRepository(test_session).create(filename="a.pdf")
+
+        response = await client.delete(f"/api/v1/documents/{document.id}")
+        assert response.status_code == 204
+
+        response = await client.get(f"/api/v1/documents/{document.id}")
+        assert response.status_code == 404
+
+        response = await client.delete(f"/api/v1/documents/{document.id}")
+        assert response.status_code == 404
+
     @pytest.mark.asyncio
     async def test_upload_non_pdf(self, client: AsyncClient) -> None:
         """Test uploading a non-PDF file."""
@@ -171,6 +289,82 @@ class TestDocumentEndpoints:
         assert response.status_code == 400
         assert "PDF" in response.json()["detail"]
 
+    @pytest.mark.asyncio
+    async def test_upload_empty_pdf(self, client: AsyncClient) -> None:
+        """Test uploading an empty PDF file."""
+        response = await client.post(
+            "/api/v1/documents/upload",
+            files={"file": ("empty.pdf", b"", "application/pdf")},
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Empty file"
+
+    @pytest.mark.asyncio
+    async def test_upload_accepted_for_background_processing(
+        self,
+        client: AsyncClient,
+        sample_pdf_content: bytes,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that an upload is recorded as pending and handed to the worker."""
+        worker = AsyncMock()
+        monkeypatch.setattr("propertyrag.api.routes.documents.ingest_document", worker)
+
+        response = await client.post(
+            "/api/v1/documents/upload",
+            files={"file": ("vertrag.pdf", sample_pdf_content, "application/pdf")},
+        )
+
+        assert response.status_code == 202
+        data = response.json()
+        assert data["status"] == "pending"
+
+        worker.assert_awaited_once()
+        document_id, file_path = worker.await_args.args
+        assert str(document_id) == data["id"]
+        assert file_path.read_bytes() == sample_pdf_content
+        file_path.unlink()
+
+        response = await client.get(f"/api/v1/documents/{data['id']}")
+        assert response.json()["status"] == "pending"
+
+    @pytest.mark.asyncio
+    async def test_upload_duplicate_returns_existing(
+        self,
+        client: AsyncClient,
+        test_session: AsyncSession,
+        sample_pdf_content: bytes,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that an identical, already ingested PDF is not processed again."""
+        worker = AsyncMock()
+        monkeypatch.setattr("propertyrag.api.routes.documents.ingest_document", worker)
+        repo = DocumentRepository(test_session)
+        document = await repo.create(
+            filename="vertrag.pdf", content_hash=hashlib.sha256(sample_pdf_content).digest()
+        )
+        await repo.update_status(document.id, ProcessingStatus.COMPLETED)
+
+        response = await client.post(
+            "/api/v1/documents/upload",
+            files={"file": ("kopie.pdf", sample_pdf_content, "application/pdf")},
+        )
+
+        assert response.json()["id"] == str(document.id)
+        assert response.json()["status"] == "completed"
+        worker.assert_not_awaited()
+
+        response = await client.post(
+            "/api/v1/documents/upload",
+            files={"file": ("kopie.pdf", sample_pdf_content, "application/pdf")},
+            data={"overwrite": "true"},
+        )
+
+        assert response.json()["id"] != str(document.id)
+        worker.assert_awaited_once()
+        worker.await_args.args[1].unlink()
+
 
 class TestQueryEndpoints:
     """Tests for query endpoints."""
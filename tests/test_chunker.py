@@ -102,6 +102,14 @@ class TestChunker:
         assert "First paragraph" in full_content
         assert "Second paragraph" in full_content
 
+    def test_split_paragraphs_on_whitespace_lines(self, chunker: Chunker) -> None:
+        """Test that blank lines containing whitespace still separate paragraphs."""
+        text = "  Erster Absatz.  \n \t\n\n Zweiter Absatz.\nFortsetzung.\n\n"
+
+        paragraphs = chunker._split_into_paragraphs(text)
+
+        assert paragraphs == ["Erster Absatz.", "Zweiter Absatz.\nFortsetzung."]
+
     def test_token_count_accuracy(self, chunker: Chunker) -> None:
         """Test that token counts are accurate."""
         doc = ParsedDocument(
@@ -115,3 +123,19 @@ class TestChunker:
         for chunk in chunks:
             actual_tokens = chunker.count_tokens(chunk.content)
             assert chunk.token_count == actual_tokens
+
+    def test_token_counts_exact_across_many_paragraphs(self, chunker: Chunker) -> None:
+        """Test that running token counts give exact counts and bounded chunks."""
+        text = "\n\n".join(f"Absatz {i}. Die Miete beträgt {i} Euro." for i in range(40))
+        doc = ParsedDocument(
+            filename="test.pdf",
+            pages=[ParsedPage(page_number=1, text=text)],
+            page_count=1,
+        )
+
+        chunks = chunker.chunk_document(doc)
+
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert chunk.token_count == chunker.count_tokens(chunk.content)
+            assert chunk.token_count <= chunker.chunk_size
@@ -0,0 +1,70 @@
+"""Tests for the classifier service."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from propertyrag.core.models import DocumentType
+from propertyrag.services.classifier import DocumentClassifier
+
+
+class TestDocumentClassifier:
+    """Tests for the DocumentClassifier class."""
+
+    @pytest.fixture
+    def mock_client(self) -> AsyncMock:
+        """Create a mock OpenAI client answering 'gutachten'."""
+        client = AsyncMock()
+        response = MagicMock()
+        response.choices = [MagicMock(message=MagicMock(content="gutachten"))]
+        client.chat.completions.create = AsyncMock(return_value=response)
+        return client
+
+    @pytest.fixture
+    def classifier(self, mock_client: AsyncMock) -> DocumentClassifier:
+        """Create a classifier with mock client."""
+        return DocumentClassifier(client=mock_client)
+
+    @pytest.mark.asyncio
+    async def test_keywords_skip_llm(
+        self, classifier: DocumentClassifier, mock_client: AsyncMock
+    ) -> None:
+        """Test that a clearly worded document is classified without an API call."""
+        text = (
+            "Mietvertrag für Wohnraum\n\nZwischen dem Vermieter Max Muster und ... "
+            "§ 1 Mietsache ... § 2 Mietzeit: Das Mietverhältnis beginnt am 01.01.2024."
+        )
+
+        document_type = await classifier.classify(text)
+
+        assert document_type == DocumentType.MIETVERTRAG
+        mock_client.chat.completions.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_ambiguous_text_uses_llm(
+        self, classifier: DocumentClassifier, mock_client: AsyncMock
+    ) -> None:
+        """Test that text without a clear keyword winner falls back to the model."""
+        document_type = await classifier.classify("Objekt: Musterstraße 1, Berlin")
+
+        assert document_type == DocumentType.GUTACHTEN
+        mock_client.chat.completions.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_empty_text_is_unknown(
+        self, classifier: DocumentClassifier, mock_client: AsyncMock
+    ) -> None:
+        """Test that empty text is unknown without an API call."""
+        assert await classifier.classify("   ") == DocumentType.UNKNOWN
+        mock_client.chat.completions.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_repeated_text_uses_cache(
+        self, classifier: DocumentClassifier, mock_client: AsyncMock
+    ) -> None:
+        """Test that classifying the same text twice calls the model once."""
+        text = "Objekt: Musterstraße 1, Berlin"
+
+        assert await classifier.classify(text) == DocumentType.GUTACHTEN
+        assert await classifier.classify(text) == DocumentType.GUTACHTEN
+        mock_client.chat.completions.create.assert_awaited_once()
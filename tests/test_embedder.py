@@ -1,9 +1,18 @@
 """Tests for the embedder service."""
 
+import base64
+import hashlib
+
+import numpy as np
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 
-from propertyrag.services.embedder import Embedder, EmbeddingError
+from propertyrag.services.embedder import (
+    EMBEDDING_BATCH_TOKENS,
+    MAX_TOKENS_PER_REQUEST,
+    Embedder,
+    EmbeddingError,
+)
 from propertyrag.services.chunker import TextChunk
 
 
@@ -32,8 +41,35 @@ class TestEmbedder:
         """Test embedding a single text."""
         embedding = await embedder.embed_text("Hello world")
 
-        assert len(embedding) == 1536
-        assert all(isinstance(x, float) for x in embedding)
+        assert embedding.shape == (1536,)
+        assert embedding.dtype == np.float32
+
+    @pytest.mark.asyncio
+    async def test_embed_text_decodes_base64(
+        self, embedder: Embedder, mock_client: AsyncMock
+    ) -> None:
+        """Test that base64 embeddings are decoded without going through Python floats."""
+        vector = np.arange(1536, dtype=np.float32)
+        response = MagicMock()
+        response.data = [MagicMock(embedding=base64.b64encode(vector.tobytes()).decode(), index=0)]
+        mock_client.embeddings.create = AsyncMock(return_value=response)
+
+        embedding = await embedder.embed_text("Hello world")
+
+        np.testing.assert_array_equal(embedding, vector)
+        assert mock_client.embeddings.create.await_args.kwargs["encoding_format"] == "base64"
+
+    @pytest.mark.asyncio
+    async def test_embed_query_reuses_recent_embeddings(
+        self, embedder: Embedder, mock_client: AsyncMock
+    ) -> None:
+        """Test that repeated queries (up to whitespace) are embedded once."""
+        first = await embedder.embed_query("Wie hoch ist die Miete?")
+        second = await embedder.embed_query("  Wie hoch ist  die Miete? ")
+
+        assert second is first
+        assert not first.flags.writeable
+        mock_client.embeddings.create.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_embed_texts(self, embedder: Embedder, mock_client: AsyncMock) -> None:
@@ -52,12 +88,86 @@ class TestEmbedder:
         assert len(embeddings[0]) == 1536
         assert len(embeddings[1]) == 1536
 
+    @pytest.mark.asyncio
+    async def test_embed_texts_preserves_order_across_batches(
+        self, embedder: Embedder, mock_client: AsyncMock
+    ) -> None:
+        """Test that length-sorted concurrent batches map back to input order."""
+
+        async def create(
+            model: str, input: list[str], dimensions: int, encoding_format: str
+        ) -> MagicMock:
+            response = MagicMock()
+            response.data = [
+                MagicMock(embedding=[float(len(text))], index=i)
+                for i, text in enumerate(input)
+            ]
+            return response
+
+        mock_client.embeddings.create = AsyncMock(side_effect=create)
+        texts = ["x" * n for n in range(250, 0, -1)]
+
+        embeddings = await embedder.embed_texts(texts)
+
+        assert mock_client.embeddings.create.await_count == 3
+        assert [e[0] for e in embeddings] == [float(len(t)) for t in texts]
+
+    @pytest.mark.asyncio
+    async def test_embed_texts_packs_batches_by_tokens(
+        self, embedder: Embedder, mock_client: AsyncMock
+    ) -> None:
+        """Test that batches respect the token budget and long texts are truncated."""
+        inputs: list[list[str]] = []
+
+        async def create(
+            model: str, input: list[str], dimensions: int, encoding_format: str
+        ) -> MagicMock:
+            inputs.append(input)
+            response = MagicMock()
+            response.data = [MagicMock(embedding=[0.1], index=i) for i in range(len(input))]
+            return response
+
+        mock_client.embeddings.create = AsyncMock(side_effect=create)
+        texts = [" ".join(["Miete"] * 9000)] * 8
+
+        embeddings = await embedder.embed_texts(texts)
+
+        assert len(embeddings) == 8
+        for batch in inputs:
+            token_counts = [len(embedder.encoding.encode(text)) for text in batch]
+            assert max(token_counts) <= MAX_TOKENS_PER_REQUEST
+            assert sum(token_counts) <= EMBEDDING_BATCH_TOKENS
+
+    @pytest.mark.asyncio
+    async def test_embed_texts_deduplicates(
+        self, embedder: Embedder, mock_client: AsyncMock
+    ) -> None:
+        """Test that repeated texts are sent once and copied back to each position."""
+
+        async def create(
+            model: str, input: list[str], dimensions: int, encoding_format: str
+        ) -> MagicMock:
+            response = MagicMock()
+            response.data = [
+                MagicMock(embedding=[float(len(text))], index=i) for i, text in enumerate(input)
+            ]
+            return response
+
+        mock_client.embeddings.create = AsyncMock(side_effect=create)
+        texts = ["Seite 1 von 3", "Mietvertrag", "Seite 1 von 3"]
+
+        embeddings = await embedder.embed_texts(texts)
+
+        sent = mock_client.embeddings.create.await_args.kwargs["input"]
+        assert sorted(sent) == ["Mietvertrag", "Seite 1 von 3"]
+        assert [e[0] for e in embeddings] == [13.0, 11.0, 13.0]
+
     @pytest.mark.asyncio
     async def test_embed_empty_list(self, embedder: Embedder) -> None:
         """Test embedding an empty list."""
         embeddings = await embedder.embed_texts([])
 
-        assert embeddings == []
+        assert len(embeddings) == 0
 
     @pytest.mark.asyncio
     async def test_embed_chunks(self, embedder: Embedder, mock_client: AsyncMock) -> None:
@@ -88,3 +198,25 @@ class TestEmbedder:
 
         with pytest.raises(EmbeddingError):
             await embedder.embed_text("Test")
+
+    @pytest.mark.asyncio
+    async def test_embed_texts_cached_only_embeds_misses(
+        self, embedder: Embedder, mock_client: AsyncMock
+    ) -> None:
+        """Test that cached texts skip the API and new embeddings are stored."""
+        cached_hash = hashlib.sha256(b"Cached").digest()
+        cache = AsyncMock()
+        cache.get_many = AsyncMock(return_value={cached_hash: [0.9] * 1536})
+
+        response = MagicMock()
+        response.data = [MagicMock(embedding=[0.1] * 1536, index=0)]
+        mock_client.embeddings.create = AsyncMock(return_value=response)
+
+        embeddings = await embedder.embed_texts_cached(["New", "Cached", "New"], cache)
+
+        np.testing.assert_allclose(embeddings[:, 0], [0.1, 0.9, 0.1], rtol=1e-6)
+        mock_client.embeddings.create.assert_awaited_once()
+        assert mock_client.embeddings.create.await_args.kwargs["input"] == ["New"]
+        stored = cache.add_many.await_args.args[1]
+        assert list(stored) == [hashlib.sha256(b"New").digest()]
+        cache.evict.assert_awaited_once_with(embedder.cache_max_entries)
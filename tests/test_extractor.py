@@ -1,10 +1,20 @@
 """Tests for the extractor service."""
 
 import json
-import pytest
+from datetime import UTC, datetime
 from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
 
-from propertyrag.core.models import DocumentType, MietvertragData
+from propertyrag.core.models import (
+    DocumentType,
+    ExtractedDocument,
+    GrundbuchauszugData,
+    MietvertragData,
+)
 from propertyrag.services.extractor import DataExtractor, ExtractionError
 
 
@@ -50,6 +60,25 @@ class TestDataExtractor:
         assert data.nebenkosten_eur == 200
         assert confidence > 0
 
+    @pytest.mark.asyncio
+    async def test_extract_requests_strict_schema(
+        self, extractor: DataExtractor, mock_client: AsyncMock
+    ) -> None:
+        """Test that extraction asks for schema-conforming output."""
+        response = MagicMock()
+        response.choices = [MagicMock(message=MagicMock(content="{}"))]
+        mock_client.chat.completions.create = AsyncMock(return_value=response)
+
+        await extractor.extract("Grundbuch", DocumentType.GRUNDBUCHAUSZUG)
+
+        response_format = mock_client.chat.completions.create.await_args.kwargs["response_format"]
+        assert response_format["type"] == "json_schema"
+        assert response_format["json_schema"]["strict"] is True
+        schema = response_format["json_schema"]["schema"]
+        assert "kind" not in schema["properties"]
+        assert schema["required"] == list(schema["properties"])
+        assert schema["additionalProperties"] is False
+
     @pytest.mark.asyncio
     async def test_extract_unknown_type(self, extractor: DataExtractor) -> None:
         """Test that extracting from unknown type raises error."""
@@ -117,3 +146,156 @@ class TestDataExtractor:
 
         assert isinstance(result, dict)
         assert "nettomiete_eur" in result
+
+    @pytest.mark.asyncio
+    async def test_extract_batch(self, extractor: DataExtractor, mock_client: AsyncMock) -> None:
+        """Test that batch results are joined back by custom_id, with failures as None."""
+        # Malformed output lines are skipped rather than failing the batch
+        mock_client.files.create = AsyncMock(return_value=MagicMock(id="file-in"))
+        mock_client.batches.create = AsyncMock(
+            return_value=MagicMock(id="batch-1", status="completed", output_file_id="file-out")
+        )
+        output = "\n".join(
+            json.dumps(record)
+            for record in [
+                {"custom_id": "1", "response": {"status_code": 500}, "error": "boom"},
+                {
+                    "custom_id": "0",
+                    "response": {
+                        "status_code": 200,
+                        "body": {
+                            "choices": [
+                                {"message": {"content": json.dumps({"nettomiete_eur": 950})}}
+                            ]
+                        },
+                    },
+                },
+            ]
+        ) + '\n{"custom_id": "0", "respo\n{"response": {}}'
+        mock_client.files.content = AsyncMock(return_value=MagicMock(text=output))
+
+        results = await extractor.extract_batch(
+            [("Mietvertrag", DocumentType.MIETVERTRAG), ("Gutachten", DocumentType.GUTACHTEN)]
+        )
+
+        assert results[1] is None
+        data, confidence = results[0]
+        assert isinstance(data, MietvertragData)
+        assert data.nettomiete_eur == 950
+        assert 0 < confidence < 1
+        request = json.loads(mock_client.files.create.await_args.kwargs["file"][1].splitlines()[1])
+        assert request["custom_id"] == "1"
+        assert request["url"] == "/v1/chat/completions"
+
+    @pytest.mark.asyncio
+    async def test_classify_and_extract_many(
+        self, extractor: DataExtractor, mock_client: AsyncMock
+    ) -> None:
+        """Test that each document is classified, then extracted if its type is known."""
+        classifier = MagicMock()
+        classifier.classify = AsyncMock(
+            side_effect=lambda text: {
+                "Mietvertrag": DocumentType.MIETVERTRAG,
+                "Sonstiges": DocumentType.UNKNOWN,
+            }[text]
+        )
+        response = MagicMock()
+        response.choices = [MagicMock(message=MagicMock(content=json.dumps({"kaution_eur": 3000})))]
+        mock_client.chat.completions.create = AsyncMock(return_value=response)
+
+        results = await extractor.classify_and_extract_many(
+            ["Mietvertrag", "Sonstiges"], classifier
+        )
+
+        assert results[0][0] == DocumentType.MIETVERTRAG
+        assert results[0][1][0].kaution_eur == 3000
+        assert results[1] == (DocumentType.UNKNOWN, None)
+        mock_client.chat.completions.create.assert_awaited_once()
+
+    def test_extracted_document_dispatches_on_type(self) -> None:
+        """Test that stored data validates against its document type's model."""
+        document = ExtractedDocument(
+            document_id=uuid4(),
+            document_type=DocumentType.GRUNDBUCHAUSZUG,
+            data={"eigentuemer": ["Max Muster"]},
+            extracted_at=datetime.now(UTC),
+        )
+
+        assert isinstance(document.data, GrundbuchauszugData)
+        assert document.data.eigentuemer == ("Max Muster",)
+        assert "kind" not in document.model_dump()["data"]
+
+    def test_extracted_document_rejects_unknown_type(self) -> None:
+        """Test that data stored under an unknown type fails with a clear error."""
+        with pytest.raises(ValidationError, match="known document type"):
+            ExtractedDocument(
+                document_id=uuid4(),
+                document_type=DocumentType.UNKNOWN,
+                data={"eigentuemer": ["Max Muster"]},
+                extracted_at=datetime.now(UTC),
+            )
+
+    @pytest.mark.asyncio
+    async def test_extract_many_packs_short_documents(
+        self, extractor: DataExtractor, mock_client: AsyncMock
+    ) -> None:
+        """Test that short documents of one type share a request and map back by index."""
+        packed = {
+            "results": [
+                {"index": 1, "data": {"eigentuemer": ["Erika Muster"]}},
+                {"index": 0, "data": {"eigentuemer": ["Max Muster"]}},
+            ]
+        }
+        response = MagicMock()
+        response.choices = [MagicMock(message=MagicMock(content=json.dumps(packed)))]
+        mock_client.chat.completions.create = AsyncMock(return_value=response)
+
+        results = await extractor.extract_many(
+            [
+                ("Grundbuch A", DocumentType.GRUNDBUCHAUSZUG),
+                ("Grundbuch B", DocumentType.GRUNDBUCHAUSZUG),
+            ]
+        )
+
+        mock_client.chat.completions.create.assert_awaited_once()
+        assert results[0][0].eigentuemer == ("Max Muster",)
+        assert results[1][0].eigentuemer == ("Erika Muster",)
+        request = mock_client.chat.completions.create.await_args.kwargs
+        assert '<dokument index="1">' in request["messages"][1]["content"]
+        assert "results" in request["response_format"]["json_schema"]["schema"]["properties"]
+
+    @pytest.mark.asyncio
+    async def test_extract_sends_only_relevant_chunks(
+        self, extractor: DataExtractor, mock_client: AsyncMock
+    ) -> None:
+        """Test that chunks closest to the field probe are sent in document order."""
+        extractor.top_k = 2
+        extractor.embedder = MagicMock()
+        extractor.embedder.embed_texts = AsyncMock(return_value=np.eye(4, dtype=np.float32))
+        response = MagicMock()
+        response.choices = [MagicMock(message=MagicMock(content=json.dumps({"kaution_eur": 3000})))]
+        mock_client.chat.completions.create = AsyncMock(return_value=response)
+
+        # The Mietvertrag probe embeds to [1, 0, 0, 0]
+        chunks = ["Deckblatt", "§ 5 Kaution", "Unterschriften", "§ 3 Miete"]
+        chunk_embeddings = np.array(
+            [[0.1, 1, 0, 0], [0.9, 0, 0, 0], [0, 0, 1, 0], [0.8, 0, 0, 0]], dtype=np.float32
+        )
+
+        await extractor.extract(
+            "\n\n".join(chunks),
+            DocumentType.MIETVERTRAG,
+            chunks=chunks,
+            chunk_embeddings=chunk_embeddings,
+        )
+        await extractor.extract(
+            "\n\n".join(chunks),
+            DocumentType.MIETVERTRAG,
+            chunks=chunks,
+            chunk_embeddings=chunk_embeddings,
+        )
+
+        prompt = mock_client.chat.completions.create.await_args.kwargs["messages"][1]["content"]
+        assert prompt.endswith("§ 5 Kaution\n\n§ 3 Miete")
+        assert "Deckblatt" not in prompt
+        extractor.embedder.embed_texts.assert_awaited_once()
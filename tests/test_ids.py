@@ -0,0 +1,33 @@
+"""Tests for primary key generation."""
+
+import time
+
+from propertyrag.db.ids import uuid7
+
+
+class TestUUID7:
+    """Tests for the uuid7 function."""
+
+    def test_version_and_variant(self) -> None:
+        """Test that generated IDs are RFC 9562 version 7 UUIDs."""
+        value = uuid7()
+
+        assert value.version == 7
+        assert value.variant == "specified in RFC 4122"
+
+    def test_embeds_current_time(self) -> None:
+        """Test that the leading 48 bits hold the creation time in milliseconds."""
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+
+        assert before <= value.int >> 80 <= after
+
+    def test_time_ordered(self) -> None:
+        """Test that IDs sort by creation time and do not collide."""
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+
+        assert first < second
+        assert len({uuid7() for _ in range(1000)}) == 1000
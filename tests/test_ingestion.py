@@ -0,0 +1,240 @@
+"""Tests for the ingestion pipeline."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from propertyrag.api.schemas import ExtractedDataResponse
+from propertyrag.core.config import get_settings
+from propertyrag.core.models import DocumentType, MietvertragData, ProcessingStatus
+from propertyrag.db.repository import ChunkRepository, DocumentRepository
+from propertyrag.services.chunker import TextChunk
+from propertyrag.services.ingestion import IngestionPipeline
+from propertyrag.services.pdf_parser import ParsedDocument, ParsedPage
+from propertyrag.workers.ingest import fail_stale_documents, ingest_document
+
+
+class TestExtractDocument:
+    """Tests for IngestionPipeline.extract_document."""
+
+    @pytest.fixture
+    def extractor(self) -> MagicMock:
+        """Create a mock extractor."""
+        extractor = MagicMock()
+        extractor.top_k = 12
+        extractor.extract = AsyncMock(
+            return_value=(MietvertragData(objekt_adresse="Teststraße 1"), 0.9)
+        )
+        return extractor
+
+    @pytest.fixture
+    def pipeline(self, test_session: AsyncSession, extractor: MagicMock) -> IngestionPipeline:
+        """Create a pipeline with a mock extractor."""
+        return IngestionPipeline(
+            test_session,
+            embedder=MagicMock(),
+            classifier=MagicMock(),
+            extractor=extractor,
+        )
+
+    @pytest.mark.asyncio
+    async def test_returns_stored_record(
+        self,
+        pipeline: IngestionPipeline,
+        extractor: MagicMock,
+        test_session: AsyncSession,
+    ) -> None:
+        """Test that the new record is returned ready to serialize."""
+        document = await DocumentRepository(test_session).create(
+            filename="vertrag.pdf", document_type=DocumentType.MIETVERTRAG
+        )
+        await ChunkRepository(test_session).create_many(
+            document.id,
+            [
+                {
+                    "content": "Mietvertrag",
+                    "chunk_index": 0,
+                    "token_count": 2,
+                    "embedding": [0.1] * 1536,
+                }
+            ],
+        )
+
+        extracted = await pipeline.extract_document(document.id)
+
+        assert extracted is not None
+        assert extractor.extract.await_args.args[0] == "Mietvertrag"
+        response = ExtractedDataResponse.model_validate(extracted)
+        assert response.data["objekt_adresse"] == "Teststraße 1"
+        assert response.extracted_at is not None
+
+    @pytest.mark.asyncio
+    async def test_uses_stored_full_text(
+        self,
+        pipeline: IngestionPipeline,
+        extractor: MagicMock,
+        test_session: AsyncSession,
+    ) -> None:
+        """Test that the text stored at ingestion is used instead of joined chunks."""
+        repo = DocumentRepository(test_session)
+        document = await repo.create(
+            filename="vertrag.pdf", document_type=DocumentType.MIETVERTRAG
+        )
+        await repo.update_status(
+            document.id, ProcessingStatus.COMPLETED, full_text="Mietvertrag\n\nSeite 2"
+        )
+
+        await pipeline.extract_document(document.id)
+
+        assert extractor.extract.await_args.args[0] == "Mietvertrag\n\nSeite 2"
+
+    @pytest.mark.asyncio
+    async def test_unknown_type_returns_none(
+        self, pipeline: IngestionPipeline, test_session: AsyncSession
+    ) -> None:
+        """Test that documents of unknown type are not extracted."""
+        document = await DocumentRepository(test_session).create(filename="x.pdf")
+
+        assert await pipeline.extract_document(document.id) is None
+
+    @pytest.mark.asyncio
+    async def test_force_updates_existing_record(
+        self,
+        pipeline: IngestionPipeline,
+        extractor: MagicMock,
+        test_session: AsyncSession,
+    ) -> None:
+        """Test that re-extraction overwrites the stored data."""
+        document = await DocumentRepository(test_session).create(
+            filename="vertrag.pdf", document_type=DocumentType.MIETVERTRAG
+        )
+        await pipeline.extract_document(document.id)
+
+        extractor.extract.return_value = (MietvertragData(objekt_adresse="Neuweg 2"), 0.8)
+        extracted = await pipeline.extract_document(document.id, force=True)
+
+        assert extracted is not None
+        assert extracted.data["objekt_adresse"] == "Neuweg 2"
+        assert extracted.extraction_confidence == 0.8
+
+
+class TestIngest:
+    """Tests for the IngestionPipeline ingest flow."""
+
+    @pytest.mark.asyncio
+    async def test_classifies_while_embedding(self, test_session: AsyncSession) -> None:
+        """Test that classification overlaps embedding and the type is stored."""
+        events: list[str] = []
+
+        async def classify(text: str) -> DocumentType:
+            events.append("classify_started")
+            await asyncio.sleep(0.01)
+            events.append("classify_done")
+            return DocumentType.GUTACHTEN
+
+        async def embed_chunks(chunks: list[TextChunk], cache: object) -> list:
+            events.append("embed_started")
+            await asyncio.sleep(0.01)
+            return [(chunk, np.full(1536, 0.1, dtype=np.float32)) for chunk in chunks]
+
+        parser = MagicMock()
+        parser.parse_bytes.return_value = ParsedDocument(
+            filename="gutachten.pdf",
+            pages=[ParsedPage(page_number=1, text="Verkehrswert 500.000 EUR")],
+            page_count=1,
+        )
+        classifier = MagicMock()
+        classifier.classify = AsyncMock(side_effect=classify)
+        embedder = MagicMock()
+        embedder.embed_chunks = AsyncMock(side_effect=embed_chunks)
+        pipeline = IngestionPipeline(
+            test_session, pdf_parser=parser, embedder=embedder, classifier=classifier
+        )
+
+        document_id = await pipeline.ingest_bytes(b"%PDF", "gutachten.pdf", auto_extract=False)
+
+        assert events.index("embed_started") < events.index("classify_done")
+        document = await DocumentRepository(test_session).get_by_id(document_id)
+        assert document.document_type == DocumentType.GUTACHTEN
+        assert document.status == ProcessingStatus.COMPLETED
+
+
+class TestIngestWorker:
+    """Tests for the background ingestion worker."""
+
+    @pytest.mark.asyncio
+    async def test_failure_rolls_back_and_marks_failed(
+        self, test_engine, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that any error discards the work and still commits FAILED."""
+        session_maker = async_sessionmaker(test_engine, expire_on_commit=False)
+        async with session_maker() as session:
+            document = await DocumentRepository(session).create(filename="test.pdf")
+            await session.commit()
+
+        statuses: list[ProcessingStatus] = []
+
+        async def process_file(self, document_id, *args, **kwargs):
+            # PROCESSING must already be visible to other sessions
+            async with session_maker() as other:
+                statuses.append((await DocumentRepository(other).get_by_id(document_id)).status)
+            await DocumentRepository(self.session).update_type(
+                document_id, DocumentType.GUTACHTEN
+            )
+            raise RuntimeError("database error")
+
+        monkeypatch.setattr("propertyrag.workers.ingest.async_session_maker", session_maker)
+        monkeypatch.setattr(IngestionPipeline, "process_file", process_file)
+        file_path = tmp_path / "upload.pdf"
+        file_path.write_bytes(b"%PDF-1.4")
+
+        await ingest_document(document.id, file_path)
+
+        async with session_maker() as session:
+            stored = await DocumentRepository(session).get_by_id(document.id)
+        assert statuses == [ProcessingStatus.PROCESSING]
+        assert stored.status == ProcessingStatus.FAILED
+        assert stored.document_type == DocumentType.UNKNOWN
+        assert not file_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_fail_stale_documents(
+        self, test_engine, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that unfinished documents past the cutoff are marked FAILED."""
+        session_maker = async_sessionmaker(test_engine, expire_on_commit=False)
+        async with session_maker() as session:
+            repo = DocumentRepository(session)
+            documents = {
+                status: await repo.create(filename=f"{status.value}.pdf")
+                for status in (
+                    ProcessingStatus.PENDING,
+                    ProcessingStatus.PROCESSING,
+                    ProcessingStatus.COMPLETED,
+                )
+            }
+            for status, document in documents.items():
+                await repo.update_status(document.id, status)
+            await session.commit()
+
+        monkeypatch.setattr("propertyrag.workers.ingest.async_session_maker", session_maker)
+        # A cutoff in the future makes the documents created just now stale
+        monkeypatch.setattr(get_settings(), "ingest_stale_after", -3600)
+
+        assert await fail_stale_documents() == 2
+
+        async with session_maker() as session:
+            repo = DocumentRepository(session)
+            statuses = {
+                status: (await repo.get_by_id(document.id)).status
+                for status, document in documents.items()
+            }
+        assert statuses == {
+            ProcessingStatus.PENDING: ProcessingStatus.FAILED,
+            ProcessingStatus.PROCESSING: ProcessingStatus.FAILED,
+            ProcessingStatus.COMPLETED: ProcessingStatus.COMPLETED,
+        }
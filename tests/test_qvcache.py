@@ -0,0 +1,91 @@
+"""Tests for the query result cache."""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from propertyrag.core.models import QueryResponse
+from propertyrag.services.qvcache import QVCache, get_qvcache, invalidate_on_commit
+
+
+class TestQVCache:
+    """Tests for the QVCache class."""
+
+    @pytest.fixture
+    def cache(self) -> QVCache:
+        """Create a small cache."""
+        return QVCache(capacity=2, tau=0.95)
+
+    @staticmethod
+    def _response(answer: str) -> QueryResponse:
+        return QueryResponse(answer=answer, sources=[], query="q")
+
+    def test_hit_on_similar_vector(self, cache: QVCache) -> None:
+        """Test that a near-identical query hits."""
+        cache.insert([1.0, 0.0, 0.0], self._response("a"))
+
+        result = cache.lookup([0.99, 0.05, 0.0])
+
+        assert result is not None
+        assert result.answer == "a"
+
+    def test_miss_below_threshold(self, cache: QVCache) -> None:
+        """Test that a dissimilar query misses."""
+        cache.insert([1.0, 0.0, 0.0], self._response("a"))
+
+        assert cache.lookup([0.0, 1.0, 0.0]) is None
+
+    def test_scope_isolation(self, cache: QVCache) -> None:
+        """Test that results are not shared across filter scopes."""
+        cache.insert([1.0, 0.0, 0.0], self._response("a"), scope="project-1")
+
+        assert cache.lookup([1.0, 0.0, 0.0], scope="project-2") is None
+        assert cache.lookup([1.0, 0.0, 0.0], scope="project-1") is not None
+
+    def test_invalidate(self, cache: QVCache) -> None:
+        """Test that invalidation drops cached results."""
+        cache.insert([1.0, 0.0, 0.0], self._response("a"))
+        cache.invalidate()
+
+        assert cache.lookup([1.0, 0.0, 0.0]) is None
+
+    def test_stale_generation_not_inserted(self, cache: QVCache) -> None:
+        """Test that results computed before an invalidation are discarded."""
+        generation = cache.generation
+        cache.invalidate()
+        cache.insert([1.0, 0.0, 0.0], self._response("a"), generation=generation)
+
+        assert len(cache) == 0
+
+    def test_capacity_evicts_least_recent(self, cache: QVCache) -> None:
+        """Test LRU eviction once capacity is exceeded."""
+        cache.insert([1.0, 0.0, 0.0], self._response("a"))
+        cache.insert([0.0, 1.0, 0.0], self._response("b"))
+        cache.lookup([1.0, 0.0, 0.0])  # touch "a"
+        cache.insert([0.0, 0.0, 1.0], self._response("c"))
+
+        assert len(cache) == 2
+        assert cache.lookup([0.0, 1.0, 0.0]) is None
+        assert cache.lookup([1.0, 0.0, 0.0]) is not None
+
+    def test_expired_entries_miss(self) -> None:
+        """Test that results older than the TTL are not served."""
+        cache = QVCache(capacity=2, tau=0.95, ttl=60)
+        cache.insert([1.0, 0.0, 0.0], self._response("a"))
+        next(iter(cache._entries.values())).created_at -= 61
+
+        assert cache.lookup([1.0, 0.0, 0.0]) is None
+
+    @pytest.mark.asyncio
+    async def test_invalidate_on_commit(self, test_session: AsyncSession) -> None:
+        """Test that the shared cache is invalidated by the commit, not before."""
+        cache = get_qvcache()
+        generation = cache.generation
+
+        invalidate_on_commit(test_session)
+        assert cache.generation == generation
+
+        await test_session.commit()
+        assert cache.generation == generation + 1
+
+        await test_session.commit()
+        assert cache.generation == generation + 1
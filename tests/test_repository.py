@@ -0,0 +1,130 @@
+"""Tests for the vector search repository methods (require Postgres with pgvector)."""
+
+from uuid import UUID
+
+import numpy as np
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from propertyrag.core.config import get_settings
+from propertyrag.db.models import ChunkModel
+from propertyrag.db.repository import (
+    CHUNK_COPY_MIN_ROWS,
+    ChunkRepository,
+    DocumentRepository,
+    ProjectRepository,
+)
+
+
+def _unit(i: int) -> np.ndarray:
+    """Create a unit embedding along axis i."""
+    embedding = np.zeros(get_settings().embedding_dimensions, dtype=np.float32)
+    embedding[i] = 1.0
+    return embedding
+
+
+class TestChunkRepository:
+    """Tests for ChunkRepository search methods."""
+
+    @pytest.fixture
+    async def chunk_ids(self, pg_session: AsyncSession) -> list[UUID]:
+        """Create a document with ten chunks, chunk i embedded along axis i."""
+        document = await DocumentRepository(pg_session).create(filename="mietvertrag.pdf")
+        return await ChunkRepository(pg_session).create_many(
+            document.id,
+            [
+                {
+                    "content": f"Chunk {i}",
+                    "page_number": i // 3 + 1,
+                    "chunk_index": i,
+                    "token_count": 2,
+                    "embedding": _unit(i),
+                }
+                for i in range(10)
+            ],
+        )
+
+    @pytest.mark.asyncio
+    async def test_search_similar_orders_by_distance(
+        self, pg_session: AsyncSession, chunk_ids: list[UUID]
+    ) -> None:
+        """Test that the nearest chunk comes first with its filename and score."""
+        query = _unit(3) + 0.5 * _unit(4)
+
+        results = await ChunkRepository(pg_session).search_similar(query, top_k=3)
+
+        assert [row.id for row, _ in results][:2] == [chunk_ids[3], chunk_ids[4]]
+        assert results[0][0].filename == "mietvertrag.pdf"
+        assert results[0][1] > results[1][1] > results[2][1]
+
+    @pytest.mark.asyncio
+    async def test_search_similar_filters_by_min_score(
+        self, pg_session: AsyncSession, chunk_ids: list[UUID]
+    ) -> None:
+        """Test that chunks below the minimum score are not returned."""
+        results = await ChunkRepository(pg_session).search_similar(
+            _unit(3), top_k=5, min_score=0.5
+        )
+
+        assert [row.id for row, _ in results] == [chunk_ids[3]]
+
+    @pytest.mark.asyncio
+    async def test_search_similar_fills_top_k_within_small_project(
+        self, pg_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a project whose chunks are all far from the query still gets top_k."""
+        monkeypatch.setattr(get_settings(), "hnsw_iterative_scan", "strict_order")
+        projects = ProjectRepository(pg_session)
+        large, small = await projects.create(name="Groß"), await projects.create(name="Klein")
+        chunk_repo = ChunkRepository(pg_session)
+        for project, axes in ((large, [0] * 100), (small, [1, 2, 3])):
+            document = await DocumentRepository(pg_session).create(
+                filename=f"{project.name}.pdf", project_id=project.id
+            )
+            await chunk_repo.create_many(
+                document.id,
+                [
+                    {
+                        "content": f"Chunk {i}",
+                        "chunk_index": i,
+                        "token_count": 2,
+                        "embedding": _unit(axis) + 0.01 * i * _unit(4),
+                    }
+                    for i, axis in enumerate(axes)
+                ],
+                project_id=project.id,
+            )
+
+        results = await chunk_repo.search_similar(_unit(0), top_k=3, project_id=small.id)
+
+        assert len(results) == 3
+
+    @pytest.mark.asyncio
+    async def test_create_many_copy_rolls_back(self, pg_session: AsyncSession) -> None:
+        """Test that a COPY batch opening the transaction is undone by a rollback."""
+        document = await DocumentRepository(pg_session).create(filename="mietvertrag.pdf")
+        await pg_session.commit()
+
+        await ChunkRepository(pg_session).create_many(
+            document.id,
+            [
+                {"content": f"Chunk {i}", "chunk_index": i, "token_count": 2, "embedding": _unit(0)}
+                for i in range(CHUNK_COPY_MIN_ROWS)
+            ],
+        )
+        await pg_session.rollback()
+
+        assert await pg_session.scalar(select(func.count()).select_from(ChunkModel)) == 0
+
+    @pytest.mark.asyncio
+    async def test_get_neighbors(
+        self, pg_session: AsyncSession, chunk_ids: list[UUID]
+    ) -> None:
+        """Test that each chunk's window is returned, clipped at the document start."""
+        rows = await ChunkRepository(pg_session).get_neighbors(
+            [chunk_ids[0], chunk_ids[5]], context=1
+        )
+
+        windows = {(chunk_ids.index(row.center_id), row.chunk_index) for row in rows}
+        assert windows == {(0, 0), (0, 1), (5, 4), (5, 5), (5, 6)}